@@ -0,0 +1,31 @@
+"""observed resource sync key and content hash
+
+Revision ID: 0002_observed_resource_sync
+Revises: 0001_initial
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0002_observed_resource_sync"
+down_revision = "0001_initial"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "observed_resources",
+        sa.Column("content_hash", sa.String(64), nullable=False, server_default=""),
+    )
+    op.create_unique_constraint(
+        "uq_observed_resource_key",
+        "observed_resources",
+        ["cluster_id", "namespace", "resource_type", "resource_name"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint("uq_observed_resource_key", "observed_resources", type_="unique")
+    op.drop_column("observed_resources", "content_hash")
@@ -0,0 +1,34 @@
+"""api key prefix lookup and permission binding
+
+Revision ID: 0003_api_key_prefix
+Revises: 0002_observed_resource_sync
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0003_api_key_prefix"
+down_revision = "0002_observed_resource_sync"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("api_keys", sa.Column("prefix", sa.String(16), nullable=True))
+    op.add_column("api_keys", sa.Column("user_id", sa.Integer(), nullable=True))
+    op.add_column("api_keys", sa.Column("permissions", sa.JSON(), nullable=True))
+    op.create_index("ix_api_keys_prefix", "api_keys", ["prefix"], unique=True)
+    op.create_index("ix_api_keys_user_id", "api_keys", ["user_id"])
+    op.create_foreign_key(
+        "fk_api_keys_user_id", "api_keys", "users", ["user_id"], ["id"], ondelete="CASCADE"
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint("fk_api_keys_user_id", "api_keys", type_="foreignkey")
+    op.drop_index("ix_api_keys_user_id", table_name="api_keys")
+    op.drop_index("ix_api_keys_prefix", table_name="api_keys")
+    op.drop_column("api_keys", "permissions")
+    op.drop_column("api_keys", "user_id")
+    op.drop_column("api_keys", "prefix")
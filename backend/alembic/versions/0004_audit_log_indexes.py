@@ -0,0 +1,28 @@
+"""composite audit log indexes for keyset pagination and filters
+
+Revision ID: 0004_audit_log_indexes
+Revises: 0003_api_key_prefix
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+
+revision = "0004_audit_log_indexes"
+down_revision = "0003_api_key_prefix"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_audit_ts_action", "audit_log", ["ts", "action"])
+    op.create_index("ix_audit_actor_ts", "audit_log", ["actor_id", "ts"])
+    op.create_index("ix_audit_resource", "audit_log", ["resource_kind", "resource_id"])
+    # ix_audit_ts_action covers every lookup the single-column ts index served.
+    op.drop_index("ix_audit_time", table_name="audit_log")
+
+
+def downgrade() -> None:
+    op.create_index("ix_audit_time", "audit_log", ["ts"])
+    op.drop_index("ix_audit_resource", table_name="audit_log")
+    op.drop_index("ix_audit_actor_ts", table_name="audit_log")
+    op.drop_index("ix_audit_ts_action", table_name="audit_log")
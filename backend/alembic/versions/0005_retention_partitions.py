@@ -0,0 +1,103 @@
+"""retention indexes and optional monthly partitions for high-volume tables
+
+Revision ID: 0005_retention_partitions
+Revises: 0004_audit_log_indexes
+Create Date: 2026-10-18
+
+Partitioning only runs on MySQL with DB_PARTITION_HIGH_VOLUME_TABLES=true. MySQL cannot
+partition tables that have foreign keys, and every unique key must include the partition
+column. The foreign keys on these log tables are dropped and the primary key becomes (id, ts).
+The worker's retention task then drops expired months and adds upcoming ones.
+"""
+
+from datetime import date
+
+import sqlalchemy as sa
+
+from alembic import op
+from app.core.config import get_settings
+
+revision = "0005_retention_partitions"
+down_revision = "0004_audit_log_indexes"
+branch_labels = None
+depends_on = None
+
+# table -> (timestamp column, [(fk column, referenced table, ondelete)])
+PARTITIONED_TABLES = {
+    "audit_log": ("ts", [("actor_id", "users", "SET NULL")]),
+    "ai_requests": ("ts", [("user_id", "users", "SET NULL")]),
+    "alert_firings": ("fired_at", [("rule_id", "alert_rules", "CASCADE")]),
+}
+MONTHS_AHEAD = 2
+
+
+def _partitioning_enabled() -> bool:
+    return op.get_bind().dialect.name == "mysql" and get_settings().db_partition_high_volume_tables
+
+
+def _month_after(day: date) -> date:
+    return date(day.year + day.month // 12, day.month % 12 + 1, 1)
+
+
+def _partition_clause(first: date) -> str:
+    last = date.today().replace(day=1)
+    for _ in range(MONTHS_AHEAD):
+        last = _month_after(last)
+    month, parts = first.replace(day=1), []
+    while month <= last:
+        bound = _month_after(month)
+        parts.append(
+            f"PARTITION p{month:%Y%m} VALUES LESS THAN (TO_DAYS('{bound.isoformat()}'))"
+        )
+        month = bound
+    parts.append("PARTITION pmax VALUES LESS THAN MAXVALUE")
+    return ", ".join(parts)
+
+
+def _foreign_keys(table: str) -> list[str]:
+    return list(
+        op.get_bind()
+        .execute(
+            sa.text(
+                """
+                SELECT CONSTRAINT_NAME FROM information_schema.REFERENTIAL_CONSTRAINTS
+                WHERE CONSTRAINT_SCHEMA = DATABASE() AND TABLE_NAME = :table
+                """
+            ),
+            {"table": table},
+        )
+        .scalars()
+    )
+
+
+def upgrade() -> None:
+    op.create_index("ix_incidents_created_at", "incidents", ["created_at"])
+    op.create_index("ix_resource_runs_started_at", "resource_runs", ["started_at"])
+
+    if not _partitioning_enabled():
+        return
+    bind = op.get_bind()
+    for table, (ts_column, _) in PARTITIONED_TABLES.items():
+        for name in _foreign_keys(table):
+            op.drop_constraint(name, table, type_="foreignkey")
+        oldest = bind.execute(sa.text(f"SELECT MIN({ts_column}) FROM {table}")).scalar()
+        first = oldest.date() if oldest is not None else date.today()
+        op.execute(f"ALTER TABLE {table} DROP PRIMARY KEY, ADD PRIMARY KEY (id, {ts_column})")
+        op.execute(
+            f"ALTER TABLE {table} PARTITION BY RANGE (TO_DAYS({ts_column})) "
+            f"({_partition_clause(first)})"
+        )
+
+
+def downgrade() -> None:
+    if _partitioning_enabled():
+        for table, (_, foreign_keys) in PARTITIONED_TABLES.items():
+            op.execute(f"ALTER TABLE {table} REMOVE PARTITIONING")
+            op.execute(f"ALTER TABLE {table} DROP PRIMARY KEY, ADD PRIMARY KEY (id)")
+            for column, referenced, ondelete in foreign_keys:
+                op.create_foreign_key(
+                    f"fk_{table}_{column}", table, referenced, [column], ["id"], ondelete=ondelete
+                )
+
+    op.drop_index("ix_resource_runs_started_at", table_name="resource_runs")
+    op.drop_index("ix_incidents_created_at", table_name="incidents")
@@ -0,0 +1,25 @@
+"""indexes behind keyset pagination of intent and incident listings
+
+Revision ID: 0006_listing_indexes
+Revises: 0005_retention_partitions
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+
+revision = "0006_listing_indexes"
+down_revision = "0005_retention_partitions"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Spark and Kafka listings filter on resource_type and page by id; ix_intents_scope leads
+    # with cluster_id and cannot serve them.
+    op.create_index("ix_intents_type_id", "resource_intents", ["resource_type", "id"])
+    op.create_index("ix_incidents_state_created", "incidents", ["state", "created_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_incidents_state_created", table_name="incidents")
+    op.drop_index("ix_intents_type_id", table_name="resource_intents")
@@ -1,19 +1,32 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.core.deps import get_db
+from app.core.deps import get_async_db, get_db
 from app.core.rbac import require_perm
 from app.db.models import Permission, Role, User
-from app.db.schemas import PermissionOut, RoleOut, UserOut
+from app.db.pagination import decode_id_cursor, split_page
+from app.db.schemas import PermissionOut, RoleOut, UserOut, UserPage
 
 router = APIRouter(tags=["admin"])
 
 
-@router.get("/users", response_model=list[UserOut], dependencies=[Depends(require_perm("admin.users.write"))])
-def list_users(db: Session = Depends(get_db)) -> list[UserOut]:
-    rows = db.scalars(select(User).order_by(User.id.desc())).all()
-    return [UserOut.model_validate(row) for row in rows]
+@router.get("/users", response_model=UserPage, dependencies=[Depends(require_perm("admin.users.write"))])
+async def list_users(
+    limit: int = Query(default=100, ge=1, le=500),
+    cursor: str | None = None,
+    is_active: bool | None = None,
+    db: AsyncSession = Depends(get_async_db),
+) -> UserPage:
+    stmt = select(User)
+    if is_active is not None:
+        stmt = stmt.where(User.is_active == is_active)
+    if cursor:
+        stmt = stmt.where(User.id < decode_id_cursor(cursor))
+    rows = (await db.scalars(stmt.order_by(User.id.desc()).limit(limit + 1))).all()
+    page, next_cursor = split_page(rows, limit, lambda row: (row.id,))
+    return UserPage(items=[UserOut.model_validate(row) for row in page], next_cursor=next_cursor)
 
 
 @router.get("/roles", response_model=list[RoleOut], dependencies=[Depends(require_perm("admin.rbac.read"))])
@@ -3,7 +3,7 @@ from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 
 from app.core.audit import append_audit
-from app.core.deps import get_current_user, get_db
+from app.core.deps import get_current_user, get_db, get_read_db
 from app.core.rbac import require_perm
 from app.db.models import AIRequest, Incident, User
 from app.services.ai import AIServiceError, analyze_incident
@@ -44,7 +44,7 @@ def analyze(
 
 
 @router.get("/usage", dependencies=[Depends(require_perm("ai.use"))])
-def usage(db: Session = Depends(get_db)) -> dict:
+def usage(db: Session = Depends(get_read_db)) -> dict:
     rows = db.scalars(select(AIRequest).order_by(AIRequest.id.desc()).limit(200)).all()
     total_cost = round(sum(r.total_cost for r in rows), 8)
     return {
@@ -64,7 +64,7 @@ def usage(db: Session = Depends(get_db)) -> dict:
 
 
 @router.get("/cost-reports", dependencies=[Depends(require_perm("ai.use"))])
-def cost_reports(db: Session = Depends(get_db)) -> dict:
+def cost_reports(db: Session = Depends(get_read_db)) -> dict:
     rows = db.execute(
         select(
             AIRequest.model,
@@ -1,15 +1,34 @@
-from fastapi import APIRouter, Depends, Request
-from sqlalchemy import select
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, Query, Request
+from sqlalchemy import and_, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.core.audit import append_audit
-from app.core.deps import get_current_user, get_db
+from app.core.deps import get_async_read_db, get_current_user, get_db
 from app.core.rbac import require_perm
 from app.db.models import AlertRule, Incident, User
-from app.db.schemas import AlertRuleCreate, AlertRuleOut, IncidentOut
+from app.db.pagination import decode_id_cursor, decode_ts_id_cursor, naive_utc, split_page
+from app.db.schemas import (
+    AlertRuleCreate,
+    AlertRuleOut,
+    AlertRulePage,
+    IncidentPage,
+    IncidentSummary,
+)
 
 router = APIRouter(prefix="/alerts", tags=["alerts"])
 
+_INCIDENT_SUMMARY_COLUMNS = (
+    Incident.id,
+    Incident.rule_id,
+    Incident.severity,
+    Incident.state,
+    Incident.ai_summary_ref,
+    Incident.created_at,
+)
+
 
 @router.post("/rules", response_model=AlertRuleOut, dependencies=[Depends(require_perm("alerts.manage"))])
 def create_rule(
@@ -45,16 +64,68 @@ def create_rule(
     return AlertRuleOut.model_validate(rule)
 
 
-@router.get("/rules", response_model=list[AlertRuleOut], dependencies=[Depends(require_perm("alerts.manage"))])
-def list_rules(db: Session = Depends(get_db)) -> list[AlertRuleOut]:
-    rows = db.scalars(select(AlertRule).order_by(AlertRule.id.desc())).all()
-    return [AlertRuleOut.model_validate(r) for r in rows]
+@router.get("/rules", response_model=AlertRulePage, dependencies=[Depends(require_perm("alerts.manage"))])
+async def list_rules(
+    limit: int = Query(default=100, ge=1, le=500),
+    cursor: str | None = None,
+    enabled: bool | None = None,
+    severity: str | None = None,
+    db: AsyncSession = Depends(get_async_read_db),
+) -> AlertRulePage:
+    stmt = select(AlertRule)
+    if enabled is not None:
+        stmt = stmt.where(AlertRule.enabled == enabled)
+    if severity:
+        stmt = stmt.where(AlertRule.severity == severity)
+    if cursor:
+        stmt = stmt.where(AlertRule.id < decode_id_cursor(cursor))
+    rows = (await db.scalars(stmt.order_by(AlertRule.id.desc()).limit(limit + 1))).all()
+    page, next_cursor = split_page(rows, limit, lambda row: (row.id,))
+    return AlertRulePage(
+        items=[AlertRuleOut.model_validate(r) for r in page], next_cursor=next_cursor
+    )
 
 
-@router.get("/incidents", response_model=list[IncidentOut], dependencies=[Depends(require_perm("alerts.manage"))])
-def list_incidents(db: Session = Depends(get_db)) -> list[IncidentOut]:
-    rows = db.scalars(select(Incident).order_by(Incident.id.desc())).all()
-    return [IncidentOut.model_validate(i) for i in rows]
+@router.get("/incidents", response_model=IncidentPage, dependencies=[Depends(require_perm("alerts.manage"))])
+async def list_incidents(
+    limit: int = Query(default=100, ge=1, le=500),
+    cursor: str | None = None,
+    state: str | None = None,
+    severity: str | None = None,
+    rule_id: int | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    include_evidence: bool = False,
+    db: AsyncSession = Depends(get_async_read_db),
+) -> IncidentPage:
+    """Newest first on (created_at, id); served by (state, created_at) or (created_at)."""
+    columns = (
+        (*_INCIDENT_SUMMARY_COLUMNS, Incident.evidence_json)
+        if include_evidence
+        else _INCIDENT_SUMMARY_COLUMNS
+    )
+    stmt = select(*columns)
+    if state:
+        stmt = stmt.where(Incident.state == state)
+    if severity:
+        stmt = stmt.where(Incident.severity == severity)
+    if rule_id is not None:
+        stmt = stmt.where(Incident.rule_id == rule_id)
+    if since := naive_utc(since):
+        stmt = stmt.where(Incident.created_at >= since)
+    if until := naive_utc(until):
+        stmt = stmt.where(Incident.created_at < until)
+    if cursor:
+        ts, row_id = decode_ts_id_cursor(cursor)
+        stmt = stmt.where(
+            or_(Incident.created_at < ts, and_(Incident.created_at == ts, Incident.id < row_id))
+        )
+    stmt = stmt.order_by(Incident.created_at.desc(), Incident.id.desc()).limit(limit + 1)
+    rows = (await db.execute(stmt)).all()
+    page, next_cursor = split_page(rows, limit, lambda row: (row.created_at, row.id))
+    return IncidentPage(
+        items=[IncidentSummary.model_validate(row) for row in page], next_cursor=next_cursor
+    )
 
 
 @router.post(
@@ -84,3 +155,33 @@ def acknowledge_incident(
         request=request,
     )
     return {"status": "acknowledged"}
+
+
+@router.post(
+    "/incidents/{incident_id}/resolve",
+    dependencies=[Depends(require_perm("alerts.manage"))],
+)
+def resolve_incident(
+    incident_id: int,
+    request: Request,
+    db: Session = Depends(get_db),
+    user: User = Depends(get_current_user),
+) -> dict:
+    incident = db.scalar(select(Incident).where(Incident.id == incident_id))
+    if not incident:
+        return {"status": "not_found"}
+
+    # Resolved is the only terminal state; retention purges resolved incidents alone.
+    incident.state = "resolved"
+    db.commit()
+    append_audit(
+        db,
+        actor=user,
+        action="alerts.incident.resolve",
+        resource_kind="incident",
+        resource_id=str(incident_id),
+        diff_json={"state": "resolved"},
+        outcome="success",
+        request=request,
+    )
+    return {"status": "resolved"}
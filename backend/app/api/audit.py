@@ -1,28 +1,181 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy import select
-from sqlalchemy.orm import Session
+import json
+import logging
+from collections.abc import AsyncIterator
+from datetime import datetime
 
-from app.core.deps import get_db
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Engine, Select, and_, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.audit import append_audit, audit_writer
+from app.core.deps import (
+    get_async_db,
+    get_async_read_db,
+    get_current_user,
+    pick_read_replica,
+    release_db_sessions,
+)
 from app.core.rbac import require_perm
-from app.db.models import AuditLog
+from app.db.models import AuditLog, User
+from app.db.pagination import decode_ts_id_cursor, naive_utc, split_page
+from app.db.session import AsyncReadSessionLocal
 
+logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/audit", tags=["audit"])
 
+EXPORT_BATCH_ROWS = 1000
+_EXPORT_COLUMNS = (
+    AuditLog.id,
+    AuditLog.ts,
+    AuditLog.actor_id,
+    AuditLog.action,
+    AuditLog.resource_kind,
+    AuditLog.resource_id,
+    AuditLog.outcome,
+    AuditLog.ip,
+    AuditLog.diff_json,
+)
 
-@router.get("/logs", dependencies=[Depends(require_perm("admin.audit.read"))])
-def logs(limit: int = 200, db: Session = Depends(get_db)) -> dict:
-    rows = db.scalars(select(AuditLog).order_by(AuditLog.id.desc()).limit(limit)).all()
+
+class AuditFilters:
+    def __init__(
+        self,
+        actor_id: int | None = None,
+        action: str | None = None,
+        resource_kind: str | None = None,
+        resource_id: str | None = None,
+        since: datetime | None = None,
+        until: datetime | None = None,
+    ) -> None:
+        self.actor_id = actor_id
+        self.action = action
+        self.resource_kind = resource_kind
+        self.resource_id = resource_id
+        self.since = naive_utc(since)
+        self.until = naive_utc(until)
+
+    def apply(self, stmt: Select) -> Select:
+        # Each filter lines up with a composite index: (actor_id, ts), (ts, action) and
+        # (resource_kind, resource_id).
+        if self.actor_id is not None:
+            stmt = stmt.where(AuditLog.actor_id == self.actor_id)
+        if self.action:
+            stmt = stmt.where(AuditLog.action == self.action)
+        if self.resource_kind:
+            stmt = stmt.where(AuditLog.resource_kind == self.resource_kind)
+        if self.resource_id:
+            stmt = stmt.where(AuditLog.resource_id == self.resource_id)
+        if self.since is not None:
+            stmt = stmt.where(AuditLog.ts >= self.since)
+        if self.until is not None:
+            stmt = stmt.where(AuditLog.ts < self.until)
+        return stmt.order_by(AuditLog.ts.desc(), AuditLog.id.desc())
+
+    def as_dict(self) -> dict:
+        return {
+            key: value.isoformat() if isinstance(value, datetime) else value
+            for key, value in vars(self).items()
+            if value is not None
+        }
+
+
+def _older_than(stmt: Select, ts: datetime, row_id: int) -> Select:
+    return stmt.where(or_(AuditLog.ts < ts, and_(AuditLog.ts == ts, AuditLog.id < row_id)))
+
+
+def _after_cursor(stmt: Select, cursor: str) -> Select:
+    return _older_than(stmt, *decode_ts_id_cursor(cursor))
+
+
+def _row_out(row) -> dict:
     return {
-        "items": [
-            {
-                "id": r.id,
-                "actor_id": r.actor_id,
-                "action": r.action,
-                "resource_kind": r.resource_kind,
-                "resource_id": r.resource_id,
-                "outcome": r.outcome,
-                "ts": r.ts.isoformat(),
-            }
-            for r in rows
-        ]
+        "id": row.id,
+        "actor_id": row.actor_id,
+        "action": row.action,
+        "resource_kind": row.resource_kind,
+        "resource_id": row.resource_id,
+        "outcome": row.outcome,
+        "ts": row.ts.isoformat(),
     }
+
+
+@router.get("/logs", dependencies=[Depends(require_perm("admin.audit.read"))])
+async def logs(
+    limit: int = Query(default=200, ge=1, le=1000),
+    cursor: str | None = None,
+    filters: AuditFilters = Depends(),
+    db: AsyncSession = Depends(get_async_read_db),
+) -> dict:
+    stmt = filters.apply(select(AuditLog))
+    if cursor:
+        stmt = _after_cursor(stmt, cursor)
+    rows = (await db.scalars(stmt.limit(limit + 1))).all()
+    page, next_cursor = split_page(rows, limit, lambda row: (row.ts, row.id))
+    return {"items": [_row_out(r) for r in page], "next_cursor": next_cursor}
+
+
+async def _export_lines(stmt: Select, replica: Engine | None) -> AsyncIterator[bytes]:
+    # Keyset pages rather than one long cursor: every statement stays well inside
+    # DB_STATEMENT_TIMEOUT_MS however large the export, and no connection is held while a
+    # slow client drains a page.
+    page = stmt
+    try:
+        while True:
+            async with AsyncReadSessionLocal(info={"replica": replica}) as db:
+                rows = (await db.execute(page.limit(EXPORT_BATCH_ROWS))).all()
+            if rows:
+                yield b"".join(
+                    json.dumps(
+                        {**_row_out(row), "ip": row.ip, "diff_json": row.diff_json}
+                    ).encode()
+                    + b"\n"
+                    for row in rows
+                )
+            if len(rows) < EXPORT_BATCH_ROWS:
+                return
+            page = _older_than(stmt, rows[-1].ts, rows[-1].id)
+    except Exception:
+        logger.exception("Audit export failed")
+        # The status line is long gone; end with a record a consumer can tell from data.
+        yield json.dumps({"error": "export aborted"}).encode() + b"\n"
+
+
+@router.get(
+    "/logs/export",
+    dependencies=[
+        Depends(require_perm("admin.audit.read")),
+        Depends(release_db_sessions, scope="function"),
+    ],
+)
+async def export_logs(
+    request: Request,
+    filters: AuditFilters = Depends(),
+    db: AsyncSession = Depends(get_async_db),
+    user: User = Depends(get_current_user),
+) -> StreamingResponse:
+    """Every matching row as NDJSON, newest first, read in keyset pages while streaming."""
+    await db.run_sync(
+        lambda session: append_audit(
+            session,
+            actor=user,
+            action="audit.export",
+            resource_kind="audit_log",
+            resource_id="*",
+            diff_json=filters.as_dict(),
+            outcome="success",
+            request=request,
+        )
+    )
+    stmt = filters.apply(select(*_EXPORT_COLUMNS))
+    replica = pick_read_replica(request)
+    return StreamingResponse(
+        _export_lines(stmt, replica.async_bind if replica else None),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": 'attachment; filename="audit-log.ndjson"'},
+    )
+
+
+@router.get("/writer/stats", dependencies=[Depends(require_perm("admin.audit.read"))])
+def writer_stats() -> dict:
+    return audit_writer.stats()
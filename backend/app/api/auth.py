@@ -1,36 +1,88 @@
 from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
+from app.core.api_keys import api_keys, generate_api_key
 from app.core.audit import append_audit
-from app.core.deps import get_current_user, get_db
-from app.core.rbac import require_perm
+from app.core.deps import get_current_user, get_db, get_token_claims
+from app.core.rbac import (
+    access_token_claims,
+    has_any_permission,
+    principal_permissions,
+    require_perm,
+    user_permission_set,
+)
 from app.core.security import (
+    HashPoolBusy,
     TokenError,
     create_access_token,
     create_refresh_token,
     decode_token,
     get_password_hash,
-    verify_password,
+    hash_pool,
+    revoke_token,
+    verify_and_update_password,
+)
+from app.core.token_revocation import token_revocations
+from app.db.models import ApiKey, User
+from app.db.schemas import (
+    ApiKeyCreate,
+    ApiKeyCreated,
+    ApiKeyOut,
+    LoginRequest,
+    LogoutRequest,
+    RefreshRequest,
+    TokenPair,
+    UserCreate,
+    UserMe,
+    UserOut,
 )
-from app.db.models import Permission, RolePermission, User, UserRole
-from app.db.schemas import LoginRequest, RefreshRequest, TokenPair, UserCreate, UserMe, UserOut
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
 
-@router.post("/login", response_model=TokenPair)
-def login(payload: LoginRequest, db: Session = Depends(get_db)) -> TokenPair:
-    user = db.scalar(select(User).where(User.username == payload.username, User.is_active.is_(True)))
-    if user is None or not verify_password(payload.password, user.hashed_password):
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
+def _active_user_by_name(db: Session, username: str) -> User | None:
+    return db.scalar(select(User).where(User.username == username, User.is_active.is_(True)))
+
 
+def _token_pair(db: Session, user: User) -> TokenPair:
     return TokenPair(
-        access_token=create_access_token(str(user.id)),
+        access_token=create_access_token(str(user.id), access_token_claims(db, user)),
         refresh_token=create_refresh_token(str(user.id)),
     )
 
 
+def _login_tokens(db: Session, user: User, new_hash: str | None) -> TokenPair:
+    if new_hash:
+        # CryptContext parameters changed since this hash was stored; upgrade it transparently.
+        user.hashed_password = new_hash
+        db.commit()
+    return _token_pair(db, user)
+
+
+def _hashing_busy(exc: HashPoolBusy) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail="Too many concurrent password checks, retry shortly",
+        headers={"Retry-After": "1"},
+    )
+
+
+@router.post("/login", response_model=TokenPair)
+async def login(payload: LoginRequest, db: Session = Depends(get_db)) -> TokenPair:
+    user = await run_in_threadpool(_active_user_by_name, db, payload.username)
+    if user is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
+    try:
+        valid, new_hash = await verify_and_update_password(payload.password, user.hashed_password)
+    except HashPoolBusy as exc:
+        raise _hashing_busy(exc) from exc
+    if not valid:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
+    return await run_in_threadpool(_login_tokens, db, user, new_hash)
+
+
 @router.post("/refresh", response_model=TokenPair)
 def refresh(payload: RefreshRequest, db: Session = Depends(get_db)) -> TokenPair:
     try:
@@ -42,26 +94,35 @@ def refresh(payload: RefreshRequest, db: Session = Depends(get_db)) -> TokenPair
     if user is None:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
 
-    return TokenPair(
-        access_token=create_access_token(str(user.id)),
-        refresh_token=create_refresh_token(str(user.id)),
-    )
+    return _token_pair(db, user)
 
 
 @router.post("/logout")
-def logout() -> dict:
+def logout(
+    payload: LogoutRequest | None = None,
+    claims: dict = Depends(get_token_claims),
+) -> dict:
+    if "api_key_id" in claims:
+        raise HTTPException(status_code=400, detail="API keys are revoked via /auth/api-keys")
+    if payload is not None and payload.refresh_token:
+        try:
+            refresh_claims = decode_token(payload.refresh_token, expected_type="refresh")
+        except TokenError as exc:
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
+        if refresh_claims["sub"] != claims["sub"]:
+            raise HTTPException(status_code=400, detail="Refresh token belongs to another user")
+        revoke_token(refresh_claims)
+    revoke_token(claims)
     return {"status": "ok"}
 
 
 @router.get("/me", response_model=UserMe)
-def me(user: User = Depends(get_current_user), db: Session = Depends(get_db)) -> UserMe:
-    stmt = (
-        select(Permission.name)
-        .join(RolePermission, RolePermission.permission_id == Permission.id)
-        .join(UserRole, UserRole.role_id == RolePermission.role_id)
-        .where(UserRole.user_id == user.id)
-    )
-    perms = sorted({row[0] for row in db.execute(stmt).all()})
+def me(
+    user: User = Depends(get_current_user),
+    claims: dict = Depends(get_token_claims),
+    db: Session = Depends(get_db),
+) -> UserMe:
+    perms = sorted(principal_permissions(db, user, claims))
     return UserMe(id=user.id, email=user.email, username=user.username, is_active=user.is_active, permissions=perms)
 
 
@@ -82,11 +143,11 @@ def create_user(
     if existing:
         raise HTTPException(status_code=409, detail="User already exists")
 
-    user = User(
-        email=payload.email,
-        username=payload.username,
-        hashed_password=get_password_hash(payload.password),
-    )
+    try:
+        hashed_password = get_password_hash(payload.password)
+    except HashPoolBusy as exc:
+        raise _hashing_busy(exc) from exc
+    user = User(email=payload.email, username=payload.username, hashed_password=hashed_password)
     db.add(user)
     db.commit()
     db.refresh(user)
@@ -102,3 +163,126 @@ def create_user(
         request=request,
     )
     return UserOut.model_validate(user)
+
+
+@router.post(
+    "/users/{user_id}/revoke-tokens",
+    dependencies=[Depends(require_perm("admin.users.write"))],
+)
+def revoke_user_tokens(
+    user_id: int,
+    request: Request,
+    db: Session = Depends(get_db),
+    actor: User = Depends(get_current_user),
+) -> dict:
+    user = db.scalar(select(User).where(User.id == user_id))
+    if user is None:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    # Every access and refresh token issued to the user so far stops working.
+    token_revocations.revoke_user(user.id)
+    append_audit(
+        db,
+        actor=actor,
+        action="user.revoke_tokens",
+        resource_kind="user",
+        resource_id=str(user.id),
+        diff_json={"username": user.username},
+        outcome="success",
+        request=request,
+    )
+    return {"status": "revoked"}
+
+
+@router.post("/api-keys", response_model=ApiKeyCreated)
+def create_api_key(
+    payload: ApiKeyCreate,
+    request: Request,
+    db: Session = Depends(get_db),
+    claims: dict = Depends(get_token_claims),
+    user: User = Depends(get_current_user),
+) -> ApiKeyCreated:
+    if "api_key_id" in claims:
+        raise HTTPException(status_code=403, detail="API keys cannot create API keys")
+    requested = sorted(set(payload.permissions))
+    granted = user_permission_set(db, user.id)
+    missing = [perm for perm in requested if perm not in granted]
+    if missing and "admin.all" not in granted:
+        raise HTTPException(status_code=403, detail=f"Cannot grant: {', '.join(missing)}")
+
+    key, prefix, hashed_key = generate_api_key()
+    api_key = ApiKey(
+        name=payload.name,
+        prefix=prefix,
+        hashed_key=hashed_key,
+        user_id=user.id,
+        permissions=requested,
+    )
+    db.add(api_key)
+    db.commit()
+    db.refresh(api_key)
+
+    append_audit(
+        db,
+        actor=user,
+        action="api_key.create",
+        resource_kind="api_key",
+        resource_id=str(api_key.id),
+        diff_json={"name": api_key.name, "prefix": prefix, "permissions": requested},
+        outcome="success",
+        request=request,
+    )
+    return ApiKeyCreated(**ApiKeyOut.model_validate(api_key).model_dump(), key=key)
+
+
+@router.get("/api-keys", response_model=list[ApiKeyOut])
+def list_api_keys(
+    db: Session = Depends(get_db),
+    claims: dict = Depends(get_token_claims),
+    user: User = Depends(get_current_user),
+) -> list[ApiKeyOut]:
+    if "api_key_id" in claims:
+        raise HTTPException(status_code=403, detail="API keys cannot list API keys")
+    rows = db.scalars(select(ApiKey).where(ApiKey.user_id == user.id).order_by(ApiKey.id)).all()
+    return [ApiKeyOut.model_validate(row) for row in rows]
+
+
+@router.delete("/api-keys/{key_id}")
+def revoke_api_key(
+    key_id: int,
+    request: Request,
+    db: Session = Depends(get_db),
+    claims: dict = Depends(get_token_claims),
+    user: User = Depends(get_current_user),
+) -> dict:
+    # A key may revoke itself (e.g. after a leak) but not manage its owner's other keys.
+    if claims.get("api_key_id") not in (None, key_id):
+        raise HTTPException(status_code=403, detail="API keys can only revoke themselves")
+    api_key = db.scalar(select(ApiKey).where(ApiKey.id == key_id))
+    if api_key is None or (
+        api_key.user_id != user.id
+        and not has_any_permission(
+            principal_permissions(db, user, claims), ("admin.users.write",)
+        )
+    ):
+        raise HTTPException(status_code=404, detail="API key not found")
+
+    api_key.is_active = False
+    db.commit()
+    api_keys.invalidate(key_id, api_key.user_id)
+    append_audit(
+        db,
+        actor=user,
+        action="api_key.revoke",
+        resource_kind="api_key",
+        resource_id=str(key_id),
+        diff_json={"prefix": api_key.prefix},
+        outcome="success",
+        request=request,
+    )
+    return {"status": "revoked"}
+
+
+@router.get("/hash-pool/stats", dependencies=[Depends(require_perm("admin.all"))])
+def hash_pool_stats() -> dict:
+    return hash_pool.stats()
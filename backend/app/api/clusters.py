@@ -1,16 +1,16 @@
 from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.core.audit import append_audit
 from app.core.config import get_settings
 from app.core.crypto import SecretCrypto
-from app.core.deps import get_current_user, get_db
-from app.core.rbac import require_perm
+from app.core.deps import get_async_db, get_current_user, get_db
+from app.core.rbac import invalidate_permissions, require_perm
 from app.db.models import Cluster, User, UserNamespaceScope
 from app.db.schemas import ClusterCreate, ClusterOut, NamespacePolicyCreate, NamespacePolicyOut
-from app.k8s.client import api_client_from_kubeconfig, core_v1
-from app.k8s.utils import parse_kubeconfig
+from app.k8s.client import cluster_api_client, core_v1
 
 router = APIRouter(prefix="/clusters", tags=["clusters"])
 
@@ -27,8 +27,9 @@ def _cluster_out(cluster: Cluster) -> ClusterOut:
 
 
 @router.get("", response_model=list[ClusterOut], dependencies=[Depends(require_perm("k8s.read"))])
-def list_clusters(db: Session = Depends(get_db)) -> list[ClusterOut]:
-    return [_cluster_out(c) for c in db.scalars(select(Cluster).order_by(Cluster.name)).all()]
+async def list_clusters(db: AsyncSession = Depends(get_async_db)) -> list[ClusterOut]:
+    rows = (await db.scalars(select(Cluster).order_by(Cluster.name))).all()
+    return [_cluster_out(c) for c in rows]
 
 
 @router.post("", response_model=ClusterOut, dependencies=[Depends(require_perm("k8s.write"))])
@@ -72,11 +73,8 @@ def list_namespaces(cluster_id: int, db: Session = Depends(get_db)) -> dict:
     if not cluster:
         raise HTTPException(status_code=404, detail="Cluster not found")
 
-    crypto = SecretCrypto(get_settings().fernet_key)
-    kubeconfig = parse_kubeconfig(crypto.decrypt(cluster.kubeconfig_ref))
-
     try:
-        c = core_v1(api_client_from_kubeconfig(kubeconfig))
+        c = core_v1(cluster_api_client(cluster.id, cluster.kubeconfig_ref))
         rows = c.list_namespace().items
         return {"items": [r.metadata.name for r in rows]}
     except Exception:
@@ -88,15 +86,19 @@ def list_namespaces(cluster_id: int, db: Session = Depends(get_db)) -> dict:
     response_model=list[NamespacePolicyOut],
     dependencies=[Depends(require_perm("admin.rbac.read"))],
 )
-def list_namespace_policies(cluster_id: int, db: Session = Depends(get_db)) -> list[NamespacePolicyOut]:
-    cluster = db.scalar(select(Cluster).where(Cluster.id == cluster_id))
+async def list_namespace_policies(
+    cluster_id: int, db: AsyncSession = Depends(get_async_db)
+) -> list[NamespacePolicyOut]:
+    cluster = await db.scalar(select(Cluster).where(Cluster.id == cluster_id))
     if not cluster:
         raise HTTPException(status_code=404, detail="Cluster not found")
 
-    rows = db.scalars(
-        select(UserNamespaceScope)
-        .where(UserNamespaceScope.cluster_id == cluster_id)
-        .order_by(UserNamespaceScope.namespace.asc(), UserNamespaceScope.user_id.asc())
+    rows = (
+        await db.scalars(
+            select(UserNamespaceScope)
+            .where(UserNamespaceScope.cluster_id == cluster_id)
+            .order_by(UserNamespaceScope.namespace.asc(), UserNamespaceScope.user_id.asc())
+        )
     ).all()
     return [NamespacePolicyOut.model_validate(row) for row in rows]
 
@@ -141,6 +143,7 @@ def upsert_namespace_policy(
 
     db.commit()
     db.refresh(scope)
+    invalidate_permissions(payload.user_id)
     append_audit(
         db,
         actor=actor,
@@ -180,8 +183,10 @@ def delete_namespace_policy(
     if scope is None:
         raise HTTPException(status_code=404, detail="Namespace policy not found")
 
+    user_id = scope.user_id
     db.delete(scope)
     db.commit()
+    invalidate_permissions(user_id)
     append_audit(
         db,
         actor=actor,
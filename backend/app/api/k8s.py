@@ -1,16 +1,28 @@
+import asyncio
+import json
+from datetime import UTC, datetime
+
 from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from kubernetes.client import ApiClient
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
-from app.core.audit import append_audit
+from app.core.audit import append_audit, append_audit_batch
+from app.core.celery_client import celery_app
 from app.core.config import get_settings
-from app.core.crypto import SecretCrypto
-from app.core.deps import get_current_user, get_db
-from app.core.rbac import enforce_namespace_access, require_perm
-from app.db.models import Cluster, User
-from app.db.schemas import ScaleRequest
-from app.k8s.client import api_client_from_kubeconfig, apps_v1, core_v1
-from app.k8s.utils import parse_kubeconfig
+from app.core.deps import get_current_user, get_db, release_db_sessions
+from app.core.rbac import enforce_namespace_access, namespace_access_errors, require_perm
+from app.db.models import Cluster, ResourceIntent, ResourceRun, User
+from app.db.schemas import BulkMutationRequest, BulkOperation, ScaleRequest
+from app.k8s.async_client import async_clients, gather_with_timeout
+from app.k8s.bulk import BULK_ACTIONS, BulkItem, restart_patch, run_bulk
+from app.k8s.client import apps_v1, cluster_api_client, cluster_clients, core_v1
+from app.k8s.fanout import ClusterTarget, fan_out, matches_labels, parse_label_selector
+from app.k8s.informer import informers
+from app.k8s.utils import decode_cursor, encode_cursor, parse_fields, project_fields
+from app.k8s.watch import WatchSubscription
 
 router = APIRouter(prefix="/k8s", tags=["k8s"])
 
@@ -19,68 +31,511 @@ def _cluster_client(db: Session, cluster_id: int):
     cluster = db.scalar(select(Cluster).where(Cluster.id == cluster_id))
     if not cluster:
         raise HTTPException(status_code=404, detail="Cluster not found")
-    crypto = SecretCrypto(get_settings().fernet_key)
-    kubeconfig = parse_kubeconfig(crypto.decrypt(cluster.kubeconfig_ref))
-    return api_client_from_kubeconfig(kubeconfig)
+    return cluster_api_client(cluster.id, cluster.kubeconfig_ref)
+
+
+def _cluster_api_client(cluster_id: int, db: Session = Depends(get_db)) -> ApiClient:
+    # Sync dependency, so the cluster lookup runs in the threadpool and never on the event loop.
+    return _cluster_client(db, cluster_id)
+
+
+def _list_params(
+    limit: int | None = Query(None, ge=1, le=5000),
+    continue_token: str | None = Query(None, alias="continue"),
+    label_selector: str | None = Query(None),
+    field_selector: str | None = Query(None),
+) -> dict:
+    return {
+        "limit": limit,
+        "continue": continue_token,
+        "labelSelector": label_selector,
+        "fieldSelector": field_selector,
+    }
+
+
+async def _read_page(
+    api_client: ApiClient,
+    cluster_id: int,
+    namespace: str,
+    kind: str,
+    consistency: str,
+    params: dict | None = None,
+) -> tuple[list[dict], str | None]:
+    # Pagination and selectors are resolved by the API server, so they always read live.
+    if consistency == "live" or any(v is not None for v in (params or {}).values()):
+        kube = async_clients.get(cluster_id, api_client)
+        body = await kube.list_namespaced(kind, namespace, params)
+        return body.get("items", []), body.get("metadata", {}).get("continue") or None
+    informer = informers.peek(cluster_id, namespace, kind, api_client)
+    if informer is not None:
+        return informer.items(), None
+    # Cold informer: the initial list is blocking, so keep it off the event loop.
+    items = await run_in_threadpool(informers.items, cluster_id, namespace, kind, api_client)
+    return items, None
+
+
+def _names(objects: list[dict]) -> list[str]:
+    return [obj["metadata"]["name"] for obj in objects]
+
+
+def _items(objects: list[dict], fields: str | None) -> list:
+    paths = parse_fields(fields)
+    if not paths:
+        return _names(objects)
+    return [project_fields(obj, paths) for obj in objects]
+
+
+@router.get("/client-pool/stats", dependencies=[Depends(require_perm("admin.all"))])
+def client_pool_stats() -> dict:
+    return cluster_clients.stats()
+
+
+@router.get("/informer-cache/stats", dependencies=[Depends(require_perm("admin.all"))])
+def informer_cache_stats() -> dict:
+    return informers.stats()
+
+
+def _fanout_targets(
+    cluster_labels: str | None = Query(None, description="Comma-separated key=value filters"),
+    db: Session = Depends(get_db),
+) -> list[ClusterTarget]:
+    try:
+        selector = parse_label_selector(cluster_labels)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    targets = []
+    for cluster in db.scalars(select(Cluster).order_by(Cluster.name)).all():
+        if not matches_labels(cluster.labels or {}, selector):
+            continue
+        try:
+            client = cluster_api_client(cluster.id, cluster.kubeconfig_ref)
+        except Exception:
+            client = None
+        targets.append(ClusterTarget(cluster_id=cluster.id, name=cluster.name, client=client))
+    return targets
+
+
+@router.get("/search", dependencies=[Depends(require_perm("k8s.read"))])
+async def search_clusters(
+    kind: str = Query("pods", pattern="^(pods|deployments|statefulsets|daemonsets|events)$"),
+    namespace: str | None = Query(None),
+    name_contains: str | None = Query(None),
+    fields: str | None = Query(None),
+    deadline: float | None = Query(None, gt=0, le=60),
+    label_selector: str | None = Query(None),
+    field_selector: str | None = Query(None),
+    targets: list[ClusterTarget] = Depends(_fanout_targets),
+) -> dict:
+    settings = get_settings()
+    params = {"labelSelector": label_selector, "fieldSelector": field_selector}
+    paths = parse_fields(fields)
+
+    async def _search(target: ClusterTarget) -> list:
+        if target.client is None:
+            raise RuntimeError("Cluster credentials unavailable")
+        kube = async_clients.get(target.cluster_id, target.client)
+        if namespace:
+            body = await kube.list_namespaced(kind, namespace, params)
+        else:
+            body = await kube.list_all_namespaces(kind, params)
+        items = body.get("items", [])
+        if name_contains:
+            items = [i for i in items if name_contains in i.get("metadata", {}).get("name", "")]
+        if paths:
+            return [project_fields(i, paths) for i in items]
+        return [
+            {"namespace": i["metadata"].get("namespace"), "name": i["metadata"]["name"]}
+            for i in items
+        ]
+
+    results = await fan_out(
+        targets,
+        _search,
+        concurrency=settings.k8s_fanout_concurrency,
+        deadline=deadline or settings.k8s_fanout_deadline_seconds,
+    )
+    for result in results:
+        result["items"] = result.pop("data", [])
+    statuses = [r["status"] for r in results]
+    return {
+        "kind": kind,
+        "summary": {
+            "clusters": len(results),
+            "ok": statuses.count("ok"),
+            "timeout": statuses.count("timeout"),
+            "error": statuses.count("error"),
+            "matches": sum(len(r["items"]) for r in results),
+        },
+        "results": results,
+    }
 
 
 @router.get("/{cluster_id}/workloads", dependencies=[Depends(require_perm("k8s.read"))])
-def list_workloads(
+async def list_workloads(
     cluster_id: int,
     namespace: str = Query(...),
-    db: Session = Depends(get_db),
+    consistency: str = Query("cached", pattern="^(cached|live)$"),
+    fields: str | None = Query(None),
+    params: dict = Depends(_list_params),
+    api_client: ApiClient = Depends(_cluster_api_client),
 ) -> dict:
+    # One cursor carries a continue token per workload kind; kinds without a token are done.
     try:
-        c = apps_v1(_cluster_client(db, cluster_id))
-        deps = c.list_namespaced_deployment(namespace).items
-        sts = c.list_namespaced_stateful_set(namespace).items
-        dss = c.list_namespaced_daemon_set(namespace).items
-        return {
-            "deployments": [x.metadata.name for x in deps],
-            "statefulsets": [x.metadata.name for x in sts],
-            "daemonsets": [x.metadata.name for x in dss],
-        }
-    except Exception:
-        return {"deployments": [], "statefulsets": [], "daemonsets": []}
+        tokens = decode_cursor(params["continue"])
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    kinds = ("deployments", "statefulsets", "daemonsets")
+    if tokens:
+        kinds = tuple(kind for kind in kinds if kind in tokens)
+    results = await gather_with_timeout(
+        *(
+            _read_page(
+                api_client,
+                cluster_id,
+                namespace,
+                kind,
+                consistency,
+                {**params, "continue": tokens.get(kind)},
+            )
+            for kind in kinds
+        ),
+        timeout=async_clients.timeout,
+    )
+    body: dict = {"deployments": [], "statefulsets": [], "daemonsets": []}
+    next_tokens = {}
+    for kind, result in zip(kinds, results, strict=True):
+        if isinstance(result, BaseException):
+            continue
+        items, next_token = result
+        body[kind] = _items(items, fields)
+        if next_token:
+            next_tokens[kind] = next_token
+    if next_tokens:
+        body["continue"] = encode_cursor(next_tokens)
+    return body
 
 
 @router.get("/{cluster_id}/pods", dependencies=[Depends(require_perm("k8s.read"))])
-def list_pods(cluster_id: int, namespace: str = Query(...), db: Session = Depends(get_db)) -> dict:
+async def list_pods(
+    cluster_id: int,
+    namespace: str = Query(...),
+    consistency: str = Query("cached", pattern="^(cached|live)$"),
+    fields: str | None = Query(None),
+    params: dict = Depends(_list_params),
+    api_client: ApiClient = Depends(_cluster_api_client),
+) -> dict:
     try:
-        c = core_v1(_cluster_client(db, cluster_id))
-        pods = c.list_namespaced_pod(namespace).items
-        return {"items": [p.metadata.name for p in pods]}
+        pods, next_token = await asyncio.wait_for(
+            _read_page(api_client, cluster_id, namespace, "pods", consistency, params),
+            async_clients.timeout,
+        )
     except Exception:
         return {"items": []}
+    body: dict = {"items": _items(pods, fields)}
+    if next_token:
+        body["continue"] = next_token
+    return body
 
 
-@router.get("/{cluster_id}/pods/{namespace}/{name}/logs", dependencies=[Depends(require_perm("k8s.read"))])
-def get_pod_logs(cluster_id: int, namespace: str, name: str, db: Session = Depends(get_db)) -> dict:
+@router.get(
+    "/{cluster_id}/pods/{namespace}/{name}/logs",
+    dependencies=[Depends(require_perm("k8s.read"))],
+)
+async def get_pod_logs(
+    cluster_id: int,
+    namespace: str,
+    name: str,
+    api_client: ApiClient = Depends(_cluster_api_client),
+) -> dict:
     try:
-        c = core_v1(_cluster_client(db, cluster_id))
-        return {"logs": c.read_namespaced_pod_log(name=name, namespace=namespace, tail_lines=200)}
+        kube = async_clients.get(cluster_id, api_client)
+        return {"logs": await kube.read_pod_log(namespace, name, {"tailLines": 200})}
     except Exception:
         return {"logs": ""}
 
 
-@router.get("/{cluster_id}/events", dependencies=[Depends(require_perm("k8s.read"))])
-def list_events(cluster_id: int, namespace: str = Query(...), db: Session = Depends(get_db)) -> dict:
+@router.get(
+    "/{cluster_id}/pods/{namespace}/{name}/logs/stream",
+    dependencies=[
+        Depends(require_perm("k8s.read")),
+        Depends(release_db_sessions, scope="function"),
+    ],
+)
+async def stream_pod_logs(
+    cluster_id: int,
+    namespace: str,
+    name: str,
+    container: str | None = Query(None),
+    follow: bool = Query(False),
+    since_seconds: int | None = Query(None, ge=1),
+    tail_lines: int | None = Query(None, ge=0),
+    limit_bytes: int | None = Query(None, ge=1),
+    timestamps: bool = Query(False),
+    format: str = Query("text", pattern="^(text|sse)$"),
+    api_client: ApiClient = Depends(_cluster_api_client),
+) -> StreamingResponse:
+    kube = async_clients.get(cluster_id, api_client)
+    params = {
+        "container": container,
+        "follow": "true" if follow else None,
+        "sinceSeconds": since_seconds,
+        "tailLines": tail_lines,
+        "limitBytes": limit_bytes,
+        "timestamps": "true" if timestamps else None,
+    }
+    upstream = kube.stream_pod_log(namespace, name, params, lines=format == "sse")
     try:
-        c = core_v1(_cluster_client(db, cluster_id))
-        events = c.list_namespaced_event(namespace).items
+        # Wait for the upstream to accept the request (not for the first log line), so a
+        # missing pod or container is a clean 502 and a hung API server a bounded 504.
+        await asyncio.wait_for(anext(upstream), async_clients.timeout)
+    except TimeoutError as exc:
+        await upstream.aclose()
+        raise HTTPException(status_code=504, detail="Log stream timed out") from exc
+    except Exception as exc:
+        await upstream.aclose()
+        raise HTTPException(status_code=502, detail=f"Log stream failed: {exc}") from exc
+
+    async def body():
+        try:
+            async for chunk in upstream:
+                yield _log_frame(chunk, format)
+        finally:
+            # Runs on normal end and on client disconnect, closing the upstream connection.
+            await upstream.aclose()
+
+    media_type = "text/event-stream" if format == "sse" else "text/plain; charset=utf-8"
+    return StreamingResponse(body(), media_type=media_type, headers={"Cache-Control": "no-cache"})
+
+
+def _log_frame(chunk: bytes | str, format: str) -> bytes | str:
+    if format == "sse":
+        return f"data: {chunk}\n\n"
+    return chunk
+
+
+WATCH_KINDS = ("deployments", "statefulsets", "daemonsets", "pods", "events")
+
+
+def _watch_access(
+    cluster_id: int,
+    namespace: str = Query(...),
+    db: Session = Depends(get_db),
+    user: User = Depends(get_current_user),
+) -> str:
+    # A subscription outlives the request, so check the namespace scope once up front; the
+    # session is released before the stream starts (see release_db_sessions).
+    enforce_namespace_access(db, user, cluster_id, namespace, "k8s.read")
+    return namespace
+
+
+def _watch_object(obj: dict, paths: list[str]) -> dict:
+    return project_fields(obj, paths) if paths else obj
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+
+@router.get(
+    "/{cluster_id}/watch",
+    dependencies=[
+        Depends(require_perm("k8s.read")),
+        Depends(release_db_sessions, scope="function"),
+    ],
+)
+async def watch_resources(
+    cluster_id: int,
+    request: Request,
+    kinds: str = Query("pods,deployments"),
+    fields: str | None = Query(None),
+    namespace: str = Depends(_watch_access),
+    api_client: ApiClient = Depends(_cluster_api_client),
+) -> StreamingResponse:
+    requested = list(dict.fromkeys(k.strip() for k in kinds.split(",") if k.strip()))
+    unknown = [kind for kind in requested if kind not in WATCH_KINDS]
+    if not requested or unknown:
+        raise HTTPException(status_code=400, detail=f"Unsupported kinds: {','.join(unknown)}")
+    settings = get_settings()
+    paths = parse_fields(fields)
+    try:
+        watched = [
+            await run_in_threadpool(informers.get, cluster_id, namespace, kind, api_client)
+            for kind in requested
+        ]
+    except Exception as exc:
+        raise HTTPException(status_code=502, detail=f"Watch failed: {exc}") from exc
+
+    subscription = WatchSubscription(asyncio.get_running_loop(), settings.k8s_watch_max_pending)
+    for informer in watched:
+        informer.add_handler(subscription.push)
+
+    def snapshot() -> dict:
         return {
-            "items": [
-                {
-                    "type": e.type,
-                    "reason": e.reason,
-                    "message": e.message,
-                    "object": e.involved_object.name if e.involved_object else None,
-                }
-                for e in events
-            ]
+            "items": {
+                informer.kind: [_watch_object(obj, paths) for obj in informer.items()]
+                for informer in watched
+            }
         }
+
+    async def body():
+        try:
+            yield _sse("snapshot", snapshot())
+            while not await request.is_disconnected():
+                if not all(informer.running for informer in watched):
+                    # The informer was replaced (client rotated or evicted); the client reconnects.
+                    break
+                if not await subscription.wait(settings.k8s_watch_heartbeat_seconds):
+                    yield ": keepalive\n\n"
+                    continue
+                # Let a burst settle so it goes out as one frame.
+                await asyncio.sleep(settings.k8s_watch_batch_seconds)
+                events, overflowed = subscription.drain()
+                if overflowed:
+                    yield _sse("snapshot", snapshot())
+                elif events:
+                    deltas = [
+                        {
+                            "type": event.event_type,
+                            "kind": event.resource_type,
+                            "name": event.resource_name,
+                            "resource_version": event.resource_version,
+                            "object": _watch_object(event.payload, paths),
+                        }
+                        for event in events
+                    ]
+                    yield _sse("delta", {"events": deltas})
+        finally:
+            for informer in watched:
+                informer.remove_handler(subscription.push)
+
+    return StreamingResponse(
+        body(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"}
+    )
+
+
+@router.get("/{cluster_id}/events", dependencies=[Depends(require_perm("k8s.read"))])
+async def list_events(
+    cluster_id: int,
+    namespace: str = Query(...),
+    consistency: str = Query("cached", pattern="^(cached|live)$"),
+    fields: str | None = Query(None),
+    params: dict = Depends(_list_params),
+    api_client: ApiClient = Depends(_cluster_api_client),
+) -> dict:
+    try:
+        events, next_token = await asyncio.wait_for(
+            _read_page(api_client, cluster_id, namespace, "events", consistency, params),
+            async_clients.timeout,
+        )
     except Exception:
         return {"items": []}
+    paths = parse_fields(fields)
+    if paths:
+        items = [project_fields(e, paths) for e in events]
+    else:
+        items = [
+            {
+                "type": e.get("type"),
+                "reason": e.get("reason"),
+                "message": e.get("message"),
+                "object": (e.get("involvedObject") or {}).get("name"),
+            }
+            for e in events
+        ]
+    body: dict = {"items": items}
+    if next_token:
+        body["continue"] = next_token
+    return body
+
+
+def _bulk_diff(operation: BulkOperation) -> dict:
+    diff = {"cluster_id": operation.cluster_id, "bulk": True}
+    if operation.action == "scale":
+        diff["replicas"] = operation.replicas
+    return diff
+
+
+@router.post("/bulk", dependencies=[Depends(require_perm("k8s.write"))])
+def bulk_mutate(
+    payload: BulkMutationRequest,
+    request: Request,
+    db: Session = Depends(get_db),
+    user: User = Depends(get_current_user),
+) -> dict:
+    settings = get_settings()
+    operations = payload.operations
+    if len(operations) > settings.k8s_bulk_max_operations:
+        raise HTTPException(
+            status_code=422,
+            detail=f"At most {settings.k8s_bulk_max_operations} operations per request",
+        )
+
+    items = [BulkItem(index, operation) for index, operation in enumerate(operations)]
+    denials = namespace_access_errors(
+        db,
+        user,
+        [(op.cluster_id, op.namespace, BULK_ACTIONS[op.action][0]) for op in operations],
+    )
+    for item, denial in zip(items, denials, strict=True):
+        if denial:
+            item.status, item.error = "forbidden", denial
+
+    cluster_ids = {item.operation.cluster_id for item in items if item.status == "pending"}
+    clusters = {
+        cluster.id: cluster
+        for cluster in db.scalars(select(Cluster).where(Cluster.id.in_(cluster_ids))).all()
+    }
+    batches: dict[int, tuple[ApiClient, list[BulkItem]]] = {}
+    client_errors: dict[int, str] = {}
+    for item in items:
+        if item.status != "pending":
+            continue
+        cluster = clusters.get(item.operation.cluster_id)
+        if cluster is None:
+            item.status, item.error = "not_found", "Cluster not found"
+            continue
+        if cluster.id not in batches and cluster.id not in client_errors:
+            try:
+                batches[cluster.id] = (cluster_api_client(cluster.id, cluster.kubeconfig_ref), [])
+            except Exception as exc:
+                client_errors[cluster.id] = (str(exc) or type(exc).__name__)[:255]
+        if cluster.id in client_errors:
+            item.status, item.error = "failed", client_errors[cluster.id]
+            continue
+        batches[cluster.id][1].append(item)
+
+    run_bulk(list(batches.values()), settings.k8s_bulk_concurrency)
+
+    append_audit_batch(
+        db,
+        actor=user,
+        entries=[
+            {
+                "action": BULK_ACTIONS[item.operation.action][0],
+                "resource_kind": BULK_ACTIONS[item.operation.action][1],
+                "resource_id": f"{item.operation.namespace}/{item.operation.name}",
+                "diff_json": _bulk_diff(item.operation),
+                "outcome": item.status,
+            }
+            for item in items
+        ],
+        request=request,
+    )
+
+    results = [
+        {
+            "index": item.index,
+            "cluster_id": item.operation.cluster_id,
+            "action": item.operation.action,
+            "namespace": item.operation.namespace,
+            "name": item.operation.name,
+            "status": item.status,
+            "error": item.error,
+        }
+        for item in items
+    ]
+    succeeded = sum(1 for item in items if item.status == "success")
+    return {"succeeded": succeeded, "failed": len(items) - succeeded, "results": results}
 
 
 @router.post(
@@ -135,14 +590,7 @@ def rollout_restart(
     outcome = "success"
     try:
         c = apps_v1(_cluster_client(db, cluster_id))
-        body = {
-            "spec": {
-                "template": {
-                    "metadata": {"annotations": {"kubectl.kubernetes.io/restartedAt": "now"}}
-                }
-            }
-        }
-        c.patch_namespaced_deployment(name=name, namespace=namespace, body=body)
+        c.patch_namespaced_deployment(name=name, namespace=namespace, body=restart_patch())
     except Exception:
         outcome = "failed"
 
@@ -224,18 +672,74 @@ def drain_node(
     cluster_id: int,
     name: str,
     request: Request,
+    parallelism: int | None = Query(None, ge=1, le=100),
+    force: bool = Query(False),
     db: Session = Depends(get_db),
     user: User = Depends(get_current_user),
 ) -> dict:
-    # A full drain implementation should evict pods respecting PDBs. This is a guarded stub.
+    cluster = db.scalar(select(Cluster).where(Cluster.id == cluster_id))
+    if not cluster:
+        raise HTTPException(status_code=404, detail="Cluster not found")
+
+    intent = ResourceIntent(
+        resource_type="node",
+        mode="drain",
+        cluster_id=cluster_id,
+        namespace="",
+        spec_json={"node": name, "parallelism": parallelism, "force": force},
+        created_by=user.id,
+        status="queued",
+    )
+    db.add(intent)
+    db.flush()
+    run = ResourceRun(
+        intent_id=intent.id,
+        action="drain",
+        started_at=datetime.now(UTC),
+        result="queued",
+        retry_count=0,
+    )
+    db.add(run)
+    db.commit()
+    db.refresh(run)
+
+    enqueue_error = None
+    try:
+        celery_app.send_task(
+            "app.jobs.nodes.drain_node",
+            kwargs={
+                "cluster_id": cluster_id,
+                "node_name": name,
+                "intent_id": intent.id,
+                "run_id": run.id,
+                "parallelism": parallelism,
+                "force": force,
+            },
+        )
+    except Exception as exc:
+        # Nothing will ever pick the run up, so it must not stay queued.
+        enqueue_error = str(exc) or type(exc).__name__
+        run.result = "failed"
+        run.ended_at = datetime.now(UTC)
+        run.logs_ref = f"Could not queue the drain: {enqueue_error}"[:255]
+        intent.status = "failed"
+        db.commit()
+
     append_audit(
         db,
         actor=user,
         action="k8s.drain_node.requested",
         resource_kind="node",
         resource_id=name,
-        diff_json={"cluster_id": cluster_id},
-        outcome="queued",
+        diff_json={
+            "cluster_id": cluster_id,
+            "run_id": run.id,
+            "parallelism": parallelism,
+            "force": force,
+        },
+        outcome="queued" if enqueue_error is None else "failed",
         request=request,
     )
-    return {"status": "queued", "note": "drain orchestration should run in worker for full safety"}
+    if enqueue_error is not None:
+        raise HTTPException(status_code=503, detail=f"Could not queue the drain: {enqueue_error}")
+    return {"status": "queued", "intent_id": intent.id, "run_id": run.id}
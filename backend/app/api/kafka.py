@@ -1,12 +1,19 @@
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.core.audit import append_audit
-from app.core.deps import get_current_user, get_db
+from app.core.deps import get_async_db, get_async_read_db, get_current_user, get_db
 from app.core.rbac import enforce_namespace_access, require_perm
 from app.db.models import ObservedResource, ResourceIntent, User
-from app.db.schemas import KafkaIntentCreate, ResourceIntentOut
+from app.db.schemas import (
+    IntentStatusPage,
+    KafkaIntentCreate,
+    ResourceIntentOut,
+    ResourceIntentPage,
+)
+from app.services.intents import IntentFilters, intent_statuses, list_intents
 from app.services.kafka import KafkaValidationError, migration_precheck_report, validate_kafka_mode
 
 router = APIRouter(prefix="/services/kafka", tags=["kafka"])
@@ -78,12 +85,31 @@ def create_kafka_cluster(
     return ResourceIntentOut.model_validate(intent)
 
 
-@router.get("/clusters", response_model=list[ResourceIntentOut], dependencies=[Depends(require_perm("kafka.deploy"))])
-def list_kafka_clusters(db: Session = Depends(get_db)) -> list[ResourceIntentOut]:
-    rows = db.scalars(
-        select(ResourceIntent).where(ResourceIntent.resource_type == "kafka").order_by(ResourceIntent.id.desc())
-    ).all()
-    return [ResourceIntentOut.model_validate(r) for r in rows]
+@router.get("/clusters", response_model=ResourceIntentPage, dependencies=[Depends(require_perm("kafka.deploy"))])
+async def list_kafka_clusters(
+    limit: int = Query(default=100, ge=1, le=500),
+    cursor: str | None = None,
+    include_spec: bool = False,
+    filters: IntentFilters = Depends(),
+    db: AsyncSession = Depends(get_async_read_db),
+) -> ResourceIntentPage:
+    return await list_intents(
+        db, "kafka", filters, limit=limit, cursor=cursor, include_spec=include_spec
+    )
+
+
+@router.get("/clusters/status", response_model=IntentStatusPage, dependencies=[Depends(require_perm("kafka.deploy"))])
+async def kafka_statuses(
+    intent_id: list[int] | None = Query(default=None, max_length=500),
+    limit: int = Query(default=100, ge=1, le=500),
+    cursor: str | None = None,
+    filters: IntentFilters = Depends(),
+    db: AsyncSession = Depends(get_async_read_db),
+) -> IntentStatusPage:
+    """Status of the given intents, or of a page of intents matching the filters."""
+    return await intent_statuses(
+        db, "kafka", filters, intent_ids=intent_id, limit=limit, cursor=cursor
+    )
 
 
 @router.get("/migration-assistant", dependencies=[Depends(require_perm("kafka.deploy"))])
@@ -92,8 +118,14 @@ def migration_assistant(cluster_name: str, namespace: str) -> dict:
 
 
 @router.get("/clusters/{intent_id}", response_model=ResourceIntentOut, dependencies=[Depends(require_perm("kafka.deploy"))])
-def get_kafka_cluster(intent_id: int, db: Session = Depends(get_db)) -> ResourceIntentOut:
-    item = db.scalar(select(ResourceIntent).where(ResourceIntent.id == intent_id, ResourceIntent.resource_type == "kafka"))
+async def get_kafka_cluster(
+    intent_id: int, db: AsyncSession = Depends(get_async_db)
+) -> ResourceIntentOut:
+    item = await db.scalar(
+        select(ResourceIntent).where(
+            ResourceIntent.id == intent_id, ResourceIntent.resource_type == "kafka"
+        )
+    )
     if not item:
         raise HTTPException(status_code=404, detail="Kafka intent not found")
     return ResourceIntentOut.model_validate(item)
@@ -1,18 +1,20 @@
 from datetime import UTC, datetime
 
 from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.core.audit import append_audit
 from app.core.celery_client import celery_app
-from app.core.deps import get_current_user, get_db
+from app.core.deps import get_async_db, get_current_user, get_db, get_token_claims
 from app.core.rbac import (
     enforce_namespace_access,
     ensure_any_permission,
+    principal_permissions,
     require_any_perm,
     require_perm,
-    user_permission_set,
 )
 from app.db.models import ResourceIntent, ResourceRun, User
 from app.db.schemas import ResourceRunOut
@@ -30,13 +32,14 @@ def apply_intent(
     intent_id: int,
     request: Request,
     db: Session = Depends(get_db),
+    claims: dict = Depends(get_token_claims),
     user: User = Depends(get_current_user),
 ) -> ResourceRunOut:
     intent = db.scalar(select(ResourceIntent).where(ResourceIntent.id == intent_id))
     if intent is None:
         raise HTTPException(status_code=404, detail="Intent not found")
 
-    perms = user_permission_set(db, user.id)
+    perms = principal_permissions(db, user, claims)
     ensure_any_permission(perms, (required_permission(intent.resource_type),))
     enforce_namespace_access(
         db,
@@ -81,18 +84,26 @@ def apply_intent(
     response_model=list[ResourceRunOut],
     dependencies=[Depends(require_perm("k8s.read"))],
 )
-def list_runs(
+async def list_runs(
     intent_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
+    sync_db: Session = Depends(get_db),
     user: User = Depends(get_current_user),
 ) -> list[ResourceRunOut]:
-    intent = db.scalar(select(ResourceIntent).where(ResourceIntent.id == intent_id))
+    intent = await db.scalar(select(ResourceIntent).where(ResourceIntent.id == intent_id))
     if intent is None:
         raise HTTPException(status_code=404, detail="Intent not found")
-    enforce_namespace_access(db, user, intent.cluster_id, intent.namespace, "k8s.read")
+    # The policy check may block on the permission cache, so it stays off the event loop.
+    await run_in_threadpool(
+        enforce_namespace_access, sync_db, user, intent.cluster_id, intent.namespace, "k8s.read"
+    )
 
-    rows = db.scalars(
-        select(ResourceRun).where(ResourceRun.intent_id == intent_id).order_by(ResourceRun.id.desc())
+    rows = (
+        await db.scalars(
+            select(ResourceRun)
+            .where(ResourceRun.intent_id == intent_id)
+            .order_by(ResourceRun.id.desc())
+        )
     ).all()
     return [ResourceRunOut.model_validate(row) for row in rows]
 
@@ -102,17 +113,25 @@ def list_runs(
     response_model=ResourceRunOut,
     dependencies=[Depends(require_perm("k8s.read"))],
 )
-def get_run(
+async def get_run(
     run_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
+    sync_db: Session = Depends(get_db),
     user: User = Depends(get_current_user),
 ) -> ResourceRunOut:
-    run = db.scalar(select(ResourceRun).where(ResourceRun.id == run_id))
+    run = await db.scalar(select(ResourceRun).where(ResourceRun.id == run_id))
     if run is None:
         raise HTTPException(status_code=404, detail="Run not found")
 
-    intent = db.scalar(select(ResourceIntent).where(ResourceIntent.id == run.intent_id))
+    intent = await db.scalar(select(ResourceIntent).where(ResourceIntent.id == run.intent_id))
     if intent is not None:
-        enforce_namespace_access(db, user, intent.cluster_id, intent.namespace, "k8s.read")
+        await run_in_threadpool(
+            enforce_namespace_access,
+            sync_db,
+            user,
+            intent.cluster_id,
+            intent.namespace,
+            "k8s.read",
+        )
 
     return ResourceRunOut.model_validate(run)
@@ -1,19 +1,27 @@
 from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.core.audit import append_audit
-from app.core.deps import get_current_user, get_db
-from app.core.rbac import require_perm
+from app.core.deps import get_async_db, get_current_user, get_db
+from app.core.rbac import invalidate_permissions, namespace_access_errors, require_perm
 from app.db.models import Permission, Role, User, UserRole
-from app.db.schemas import PermissionOut, RoleOut
+from app.db.schemas import (
+    NamespaceAccessCheckRequest,
+    NamespaceAccessResult,
+    PermissionOut,
+    RoleOut,
+)
 
 router = APIRouter(prefix="/rbac", tags=["rbac"])
 
 
 @router.get("/roles", response_model=list[RoleOut], dependencies=[Depends(require_perm("admin.rbac.read"))])
-def list_roles(db: Session = Depends(get_db)) -> list[RoleOut]:
-    return [RoleOut.model_validate(r) for r in db.scalars(select(Role).order_by(Role.name)).all()]
+async def list_roles(db: AsyncSession = Depends(get_async_db)) -> list[RoleOut]:
+    rows = (await db.scalars(select(Role).order_by(Role.name))).all()
+    return [RoleOut.model_validate(r) for r in rows]
 
 
 @router.get(
@@ -21,8 +29,8 @@ def list_roles(db: Session = Depends(get_db)) -> list[RoleOut]:
     response_model=list[PermissionOut],
     dependencies=[Depends(require_perm("admin.rbac.read"))],
 )
-def list_permissions(db: Session = Depends(get_db)) -> list[PermissionOut]:
-    rows = db.scalars(select(Permission).order_by(Permission.name)).all()
+async def list_permissions(db: AsyncSession = Depends(get_async_db)) -> list[PermissionOut]:
+    rows = (await db.scalars(select(Permission).order_by(Permission.name))).all()
     return [PermissionOut.model_validate(p) for p in rows]
 
 
@@ -46,6 +54,7 @@ def bind_role(
     if exists is None:
         db.add(UserRole(user_id=user_id, role_id=role_id))
         db.commit()
+        invalidate_permissions(user_id)
 
     append_audit(
         db,
@@ -58,3 +67,18 @@ def bind_role(
         request=request,
     )
     return {"status": "ok"}
+
+
+@router.post("/namespace-access/check", response_model=list[NamespaceAccessResult])
+async def check_namespace_access(
+    payload: NamespaceAccessCheckRequest,
+    db: Session = Depends(get_db),
+    user: User = Depends(get_current_user),
+) -> list[NamespaceAccessResult]:
+    checks = [(c.cluster_id, c.namespace, c.action) for c in payload.checks]
+    # The policy check may block on the permission cache, so it stays off the event loop.
+    errors = await run_in_threadpool(namespace_access_errors, db, user, checks)
+    return [
+        NamespaceAccessResult(**check.model_dump(), allowed=error is None, reason=error)
+        for check, error in zip(payload.checks, errors, strict=True)
+    ]
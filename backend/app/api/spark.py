@@ -1,12 +1,19 @@
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.core.audit import append_audit
-from app.core.deps import get_current_user, get_db
+from app.core.deps import get_async_db, get_async_read_db, get_current_user, get_db
 from app.core.rbac import enforce_namespace_access, require_perm
 from app.db.models import ObservedResource, ResourceIntent, User
-from app.db.schemas import ResourceIntentCreate, ResourceIntentOut
+from app.db.schemas import (
+    IntentStatusPage,
+    ResourceIntentCreate,
+    ResourceIntentOut,
+    ResourceIntentPage,
+)
+from app.services.intents import IntentFilters, intent_statuses, list_intents
 from app.services.spark import build_spark_application_template
 
 router = APIRouter(prefix="/services/spark", tags=["spark"])
@@ -67,17 +74,42 @@ def create_spark_app(
     return ResourceIntentOut.model_validate(intent)
 
 
-@router.get("/applications", response_model=list[ResourceIntentOut], dependencies=[Depends(require_perm("spark.deploy"))])
-def list_spark_apps(db: Session = Depends(get_db)) -> list[ResourceIntentOut]:
-    rows = db.scalars(
-        select(ResourceIntent).where(ResourceIntent.resource_type == "sparkapplication").order_by(ResourceIntent.id.desc())
-    ).all()
-    return [ResourceIntentOut.model_validate(r) for r in rows]
+@router.get("/applications", response_model=ResourceIntentPage, dependencies=[Depends(require_perm("spark.deploy"))])
+async def list_spark_apps(
+    limit: int = Query(default=100, ge=1, le=500),
+    cursor: str | None = None,
+    include_spec: bool = False,
+    filters: IntentFilters = Depends(),
+    db: AsyncSession = Depends(get_async_read_db),
+) -> ResourceIntentPage:
+    return await list_intents(
+        db, "sparkapplication", filters, limit=limit, cursor=cursor, include_spec=include_spec
+    )
+
+
+@router.get("/applications/status", response_model=IntentStatusPage, dependencies=[Depends(require_perm("spark.deploy"))])
+async def spark_statuses(
+    intent_id: list[int] | None = Query(default=None, max_length=500),
+    limit: int = Query(default=100, ge=1, le=500),
+    cursor: str | None = None,
+    filters: IntentFilters = Depends(),
+    db: AsyncSession = Depends(get_async_read_db),
+) -> IntentStatusPage:
+    """Status of the given intents, or of a page of intents matching the filters."""
+    return await intent_statuses(
+        db, "sparkapplication", filters, intent_ids=intent_id, limit=limit, cursor=cursor
+    )
 
 
 @router.get("/applications/{intent_id}", response_model=ResourceIntentOut, dependencies=[Depends(require_perm("spark.deploy"))])
-def get_spark_app(intent_id: int, db: Session = Depends(get_db)) -> ResourceIntentOut:
-    item = db.scalar(select(ResourceIntent).where(ResourceIntent.id == intent_id, ResourceIntent.resource_type == "sparkapplication"))
+async def get_spark_app(
+    intent_id: int, db: AsyncSession = Depends(get_async_db)
+) -> ResourceIntentOut:
+    item = await db.scalar(
+        select(ResourceIntent).where(
+            ResourceIntent.id == intent_id, ResourceIntent.resource_type == "sparkapplication"
+        )
+    )
     if not item:
         raise HTTPException(status_code=404, detail="Spark intent not found")
     return ResourceIntentOut.model_validate(item)
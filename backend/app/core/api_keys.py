@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import hashlib
+import hmac
+import secrets
+import threading
+import time
+from dataclasses import dataclass
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.core.permission_cache import load_user_permissions, permission_cache
+from app.db.models import ApiKey, User
+
+API_KEY_SCHEME = "orch"
+PREFIX_LENGTH = 12
+
+
+def generate_api_key() -> tuple[str, str, str]:
+    """Return (full key, lookup prefix, stored hash). The full key is shown to the caller once."""
+    prefix = secrets.token_hex(PREFIX_LENGTH // 2)
+    key = f"{API_KEY_SCHEME}_{prefix}_{secrets.token_urlsafe(32)}"
+    return key, prefix, hash_api_key(key)
+
+
+def hash_api_key(key: str) -> str:
+    # Keys carry 256 bits of randomness, so a fast hash is enough; a slow KDF would only add
+    # latency to every call.
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+def is_api_key(credential: str) -> bool:
+    return credential.startswith(f"{API_KEY_SCHEME}_")
+
+
+def _prefix_of(key: str) -> str | None:
+    parts = key.split("_", 2)
+    if len(parts) != 3 or len(parts[1]) != PREFIX_LENGTH:
+        return None
+    return parts[1]
+
+
+@dataclass(frozen=True)
+class ApiKeyPrincipal:
+    key_id: int
+    user_id: int
+    permissions: frozenset[str]
+    version: int | None
+
+    def claims(self) -> dict:
+        """Access-token-shaped claims, so permission checks treat keys and JWTs alike."""
+        return {
+            "sub": str(self.user_id),
+            "type": "access",
+            "act": True,
+            "perms": sorted(self.permissions),
+            "pv": self.version,
+            "api_key_id": self.key_id,
+        }
+
+
+class ApiKeyResolver:
+    """Resolves presented keys to principals, caching verified keys for ``ttl`` seconds.
+
+    A key's permissions are the ones bound to it, limited to what its owner currently holds. The
+    cache entry is tied to the owner's permission version, so role changes take effect at once.
+    """
+
+    def __init__(self, ttl: float) -> None:
+        self.ttl = ttl
+        self._verified: dict[str, tuple[float, ApiKeyPrincipal]] = {}
+        self._lock = threading.Lock()
+
+    def resolve(self, db: Session, key: str) -> ApiKeyPrincipal | None:
+        digest = hash_api_key(key)
+        with self._lock:
+            cached = self._verified.get(digest)
+        if cached is not None:
+            expires_at, principal = cached
+            if expires_at > time.monotonic() and principal.version is not None:
+                if permission_cache.version(principal.user_id) == principal.version:
+                    return principal
+
+        principal = self._verify(db, key, digest)
+        with self._lock:
+            if principal is None:
+                self._verified.pop(digest, None)
+            else:
+                self._verified[digest] = (time.monotonic() + self.ttl, principal)
+        return principal
+
+    def _verify(self, db: Session, key: str, digest: str) -> ApiKeyPrincipal | None:
+        prefix = _prefix_of(key)
+        if prefix is None:
+            return None
+        row = db.execute(
+            select(ApiKey, User.is_active)
+            .join(User, User.id == ApiKey.user_id)
+            .where(ApiKey.prefix == prefix)
+        ).first()
+        if row is None:
+            return None
+        api_key, owner_active = row
+        if not api_key.is_active or not owner_active:
+            return None
+        if not hmac.compare_digest(api_key.hashed_key, digest):
+            return None
+        user_id = api_key.user_id
+        version, owner_permissions = permission_cache.get(
+            user_id, lambda: load_user_permissions(db, user_id)
+        )
+        bound = set(api_key.permissions or [])
+        granted = bound if "admin.all" in owner_permissions else bound & owner_permissions
+        return ApiKeyPrincipal(api_key.id, user_id, frozenset(granted), version)
+
+    def invalidate(self, key_id: int, user_id: int) -> None:
+        with self._lock:
+            for digest, (_, principal) in list(self._verified.items()):
+                if principal.key_id == key_id:
+                    del self._verified[digest]
+        # Other processes re-verify once the owner's permission version moves; with the Redis
+        # permission cache that is immediate, with the memory backend it only covers this one.
+        permission_cache.invalidate_user(user_id)
+
+
+api_keys = ApiKeyResolver(ttl=get_settings().api_key_cache_ttl_seconds)
@@ -1,7 +1,164 @@
+import logging
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
 from fastapi import Request
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 
+from app.core.config import get_settings
 from app.db.models import AuditLog, User
+from app.db.session import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+
+class AuditWriter:
+    """Bounded in-process queue of audit rows, bulk-inserted by a background flusher.
+
+    Rows are flushed when ``batch_size`` are waiting or ``flush_seconds`` after the oldest one
+    arrived, as one multi-row INSERT per batch. When the queue is full the caller writes its rows
+    itself rather than lose them; rows are only dropped after the flusher exhausts its retries.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_queue: int,
+        batch_size: int,
+        flush_seconds: float,
+        retries: int = 3,
+        session_factory=SessionLocal,
+    ) -> None:
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self.retries = retries
+        self._session_factory = session_factory
+        self._queue: deque[dict] = deque()
+        self._cond = threading.Condition()
+        self._thread: threading.Thread | None = None
+        self._stopping = False
+        self._urgent = 0
+        self._in_flight = 0
+        self.enqueued = 0
+        self.written = 0
+        self.flushes = 0
+        self.overflow_writes = 0
+        self.dropped = 0
+
+    def submit(self, rows: list[dict]) -> None:
+        with self._cond:
+            if not self._stopping and len(self._queue) + len(rows) <= self.max_queue:
+                self._queue.extend(rows)
+                self.enqueued += len(rows)
+                self._ensure_started()
+                if len(self._queue) == len(rows) or len(self._queue) >= self.batch_size:
+                    self._cond.notify_all()
+                return
+            self.overflow_writes += len(rows)
+        self._write(rows)
+
+    def _ensure_started(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._queue and not self._stopping:
+                    self._cond.wait()
+                if not self._queue:
+                    return
+                # Give the batch up to flush_seconds to fill unless someone is waiting on it.
+                deadline = time.monotonic() + self.flush_seconds
+                while len(self._queue) < self.batch_size and not (self._stopping or self._urgent):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                count = min(self.batch_size, len(self._queue))
+                batch = [self._queue.popleft() for _ in range(count)]
+                self._in_flight = count
+            try:
+                self._write_with_retries(batch)
+            finally:
+                with self._cond:
+                    self._in_flight = 0
+                    self._cond.notify_all()
+
+    def _write_with_retries(self, rows: list[dict]) -> None:
+        for attempt in range(1, self.retries + 1):
+            try:
+                self._write(rows)
+                return
+            except Exception:
+                if attempt == self.retries:
+                    logger.exception("Dropping %d audit rows after %d attempts", len(rows), attempt)
+                    with self._cond:
+                        self.dropped += len(rows)
+                    return
+                time.sleep(min(2.0, 0.1 * 2**attempt))
+
+    def _write(self, rows: list[dict]) -> None:
+        with self._session_factory() as db:
+            db.execute(insert(AuditLog), rows)
+            db.commit()
+        with self._cond:
+            self.written += len(rows)
+            self.flushes += 1
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Block until everything queued so far is written; False on timeout."""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            self._urgent += 1
+            self._cond.notify_all()
+            try:
+                while self._queue or self._in_flight:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0 or self._thread is None or not self._thread.is_alive():
+                        return False
+                    self._cond.wait(remaining)
+            finally:
+                self._urgent -= 1
+        return True
+
+    def close(self, timeout: float = 10.0) -> None:
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+        with self._cond:
+            leftover = list(self._queue)
+            self._queue.clear()
+        if leftover:
+            self._write_with_retries(leftover)
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "queue_depth": len(self._queue) + self._in_flight,
+                "max_queue": self.max_queue,
+                "enqueued": self.enqueued,
+                "written": self.written,
+                "flushes": self.flushes,
+                "overflow_writes": self.overflow_writes,
+                "dropped": self.dropped,
+            }
+
+
+_settings = get_settings()
+audit_writer = AuditWriter(
+    max_queue=_settings.audit_queue_max,
+    batch_size=_settings.audit_batch_size,
+    flush_seconds=_settings.audit_flush_seconds,
+)
 
 
 def append_audit(
@@ -15,15 +172,39 @@ def append_audit(
     outcome: str,
     request: Request | None = None,
 ) -> None:
-    ip = request.client.host if request and request.client else None
-    log = AuditLog(
-        actor_id=actor.id if actor else None,
-        action=action,
-        resource_kind=resource_kind,
-        resource_id=resource_id,
-        diff_json=diff_json,
-        outcome=outcome,
-        ip=ip,
+    append_audit_batch(
+        db,
+        actor=actor,
+        entries=[
+            {
+                "action": action,
+                "resource_kind": resource_kind,
+                "resource_id": resource_id,
+                "diff_json": diff_json,
+                "outcome": outcome,
+            }
+        ],
+        request=request,
     )
-    db.add(log)
-    db.commit()
+
+
+def append_audit_batch(
+    db: Session,
+    *,
+    actor: User | None,
+    entries: list[dict],
+    request: Request | None = None,
+) -> None:
+    """Record audit rows for one request.
+
+    In ``AUDIT_WRITE_MODE=sync`` they are committed on ``db`` before returning; otherwise they
+    are queued for the background writer and the request does not wait for the insert.
+    """
+    ip = request.client.host if request and request.client else None
+    actor_id = actor.id if actor else None
+    if _settings.audit_write_mode == "sync":
+        db.add_all(AuditLog(actor_id=actor_id, ip=ip, **entry) for entry in entries)
+        db.commit()
+        return
+    ts = datetime.utcnow()
+    audit_writer.submit([{"actor_id": actor_id, "ip": ip, "ts": ts, **entry} for entry in entries])
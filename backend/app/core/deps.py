@@ -1,13 +1,24 @@
-from typing import Generator
+from collections.abc import AsyncGenerator, Generator
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from app.core.api_keys import api_keys, is_api_key
 from app.core.security import TokenError, decode_token
 from app.db.models import User
-from app.db.session import SessionLocal
+from app.db.routing import ReplicaState
+from app.db.session import (
+    AsyncReadSessionLocal,
+    AsyncSessionLocal,
+    ReadSessionLocal,
+    SessionLocal,
+    recent_writers,
+    replicas,
+)
 
 bearer_scheme = HTTPBearer(auto_error=False)
 
@@ -20,18 +31,90 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
-def get_current_user(
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def release_db_sessions(
+    db: Session = Depends(get_db),
+    async_db: AsyncSession = Depends(get_async_db),
+) -> AsyncGenerator[None, None]:
+    """Give the request's pooled connections back as soon as the handler returns.
+
+    Declare with ``Depends(release_db_sessions, scope="function")`` on streaming routes; otherwise
+    the auth and lookup sessions stay checked out until the stream ends.
+    """
+    yield
+    await async_db.close()
+    await run_in_threadpool(db.close)
+
+
+def pick_read_replica(request: Request) -> ReplicaState | None:
+    # Callers that wrote within the read-your-writes window read from the primary.
+    if not replicas.configured or recent_writers.recent(request.headers.get("authorization")):
+        return None
+    return replicas.pick()
+
+
+def get_read_db(request: Request) -> Generator[Session, None, None]:
+    """Session for report and listing reads: SELECTs go to a healthy replica if there is one."""
+    replica = pick_read_replica(request)
+    db = ReadSessionLocal(info={"replica": replica.engine if replica else None})
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_read_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    replica = await run_in_threadpool(pick_read_replica, request)
+    async with AsyncReadSessionLocal(
+        info={"replica": replica.async_bind if replica else None}
+    ) as db:
+        yield db
+
+
+# Auth dependencies check revocations and permission versions in Redis, which blocks, so they run
+# on the threadpool with the request's sync session. A sync route shares that session, so auth
+# costs it no second connection; an async route takes a sync one only on a cache miss.
+
+
+async def get_token_claims(
     creds: HTTPAuthorizationCredentials | None = Depends(bearer_scheme),
     db: Session = Depends(get_db),
-) -> User:
+) -> dict:
     if creds is None:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated")
+    if is_api_key(creds.credentials):
+        principal = await run_in_threadpool(api_keys.resolve, db, creds.credentials)
+        if principal is None:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid API key")
+        return principal.claims()
     try:
-        payload = decode_token(creds.credentials, expected_type="access")
+        return await run_in_threadpool(decode_token, creds.credentials, expected_type="access")
     except TokenError as exc:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=str(exc)) from exc
 
-    user = db.scalar(select(User).where(User.id == int(payload["sub"]), User.is_active.is_(True)))
+
+def load_current_user(request: Request, claims: dict, db: Session) -> User:
+    # Permission checks may already have loaded the user for this request.
+    user = getattr(request.state, "current_user", None)
+    if user is not None:
+        return user
+    user = db.scalar(select(User).where(User.id == int(claims["sub"]), User.is_active.is_(True)))
     if user is None:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+    request.state.current_user = user
     return user
+
+
+async def get_current_user(
+    request: Request,
+    claims: dict = Depends(get_token_claims),
+    db: Session = Depends(get_db),
+) -> User:
+    user = getattr(request.state, "current_user", None)
+    if user is not None:
+        return user
+    return await run_in_threadpool(load_current_user, request, claims, db)
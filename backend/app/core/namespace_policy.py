@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.core.permission_cache import permission_cache
+from app.db.models import UserNamespaceScope
+
+ALL_ACTIONS = -1  # every bit set; used for the "*" action
+UNKNOWN_ACTION = 1  # never assigned to a name, so only "*" masks include it
+RESOLVED_MAX = 4096
+
+
+class ActionBits:
+    """Assigns each action name a bit so allow/deny lists become integer masks.
+
+    Only compiling stored scopes registers names; checks look actions up read-only, so
+    arbitrary action strings sent to the check API cannot grow the registry.
+    """
+
+    def __init__(self) -> None:
+        self._bits: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def bit(self, action: str) -> int:
+        bit = self._bits.get(action)
+        if bit is None:
+            with self._lock:
+                bit = self._bits.setdefault(action, 1 << (len(self._bits) + 1))
+        return bit
+
+    def lookup(self, action: str) -> int:
+        return self._bits.get(action, UNKNOWN_ACTION)
+
+    def mask(self, actions: Iterable[str]) -> int:
+        mask = 0
+        for action in actions:
+            if action == "*":
+                return ALL_ACTIONS
+            mask |= self.bit(action)
+        return mask
+
+
+action_bits = ActionBits()
+
+
+@dataclass
+class ClusterPolicy:
+    """One user's compiled scopes on one cluster.
+
+    A scope namespace is either exact (``spark-prod``), a prefix pattern (``team-*``) or ``*``.
+    Every scope whose pattern matches a namespace applies; deny wins over allow.
+    """
+
+    exact: dict[str, tuple[int, int]] = field(default_factory=dict)
+    prefixes: list[tuple[str, int, int]] = field(default_factory=list)
+    _resolved: dict[str, tuple[int, int] | None] = field(default_factory=dict)
+
+    def add(self, namespace: str, allow: int, deny: int) -> None:
+        if namespace.endswith("*"):
+            self.prefixes.append((namespace[:-1], allow, deny))
+        else:
+            self.exact[namespace] = (allow, deny)
+
+    def masks(self, namespace: str) -> tuple[int, int] | None:
+        """Combined (allow, deny) masks, or None when no scope covers the namespace."""
+        if namespace in self._resolved:
+            return self._resolved[namespace]
+        matched = False
+        allow = deny = 0
+        if namespace in self.exact:
+            matched = True
+            allow, deny = self.exact[namespace]
+        for prefix, prefix_allow, prefix_deny in self.prefixes:
+            if namespace.startswith(prefix):
+                matched = True
+                allow |= prefix_allow
+                deny |= prefix_deny
+        result = (allow, deny) if matched else None
+        if len(self._resolved) < RESOLVED_MAX:
+            self._resolved[namespace] = result
+        return result
+
+
+@dataclass
+class CompiledUserPolicy:
+    version: int | None
+    clusters: dict[int, ClusterPolicy]
+    compiled_at: float = 0.0
+
+
+def compile_scopes(scopes: Iterable[UserNamespaceScope]) -> dict[int, ClusterPolicy]:
+    clusters: dict[int, ClusterPolicy] = {}
+    for scope in scopes:
+        clusters.setdefault(scope.cluster_id, ClusterPolicy()).add(
+            scope.namespace,
+            action_bits.mask((scope.allowed_actions or {}).get("actions", [])),
+            action_bits.mask((scope.denied_actions or {}).get("actions", [])),
+        )
+    return clusters
+
+
+def evaluate(policy: ClusterPolicy | None, namespace: str, action: str) -> str | None:
+    masks = policy.masks(namespace) if policy is not None else None
+    if masks is None:
+        return None
+    allow, deny = masks
+    bit = action_bits.lookup(action)
+    if deny & bit:
+        return "Namespace action denied"
+    if allow & bit:
+        return None
+    return "Namespace action not allowed"
+
+
+class NamespacePolicyEngine:
+    """Per-process index of compiled namespace scopes, one entry per user.
+
+    An entry is reused while the user's permission version is unchanged; policy edits bump that
+    version (see ``rbac.invalidate_permissions``), so every API worker recompiles just that user.
+    Entries are also recompiled after ``max_age`` seconds, which bounds staleness when versions
+    are per process (the memory permission-cache backend).
+    """
+
+    def __init__(self, max_age: float) -> None:
+        self.max_age = max_age
+        self._users: dict[int, CompiledUserPolicy] = {}
+        self._lock = threading.Lock()
+
+    def _policy(self, db: Session, user_id: int) -> CompiledUserPolicy:
+        version = permission_cache.version(user_id)
+        now = time.monotonic()
+        with self._lock:
+            compiled = self._users.get(user_id)
+        if (
+            compiled is not None
+            and version is not None
+            and compiled.version == version
+            and now - compiled.compiled_at < self.max_age
+        ):
+            return compiled
+        scopes = db.scalars(
+            select(UserNamespaceScope).where(UserNamespaceScope.user_id == user_id)
+        ).all()
+        compiled = CompiledUserPolicy(
+            version=version, clusters=compile_scopes(scopes), compiled_at=now
+        )
+        with self._lock:
+            self._users[user_id] = compiled
+        return compiled
+
+    def check(
+        self, db: Session, user_id: int, checks: list[tuple[int, str, str]]
+    ) -> list[str | None]:
+        """Evaluate (cluster_id, namespace, action) checks: None when allowed, else the reason."""
+        if not checks:
+            return []
+        clusters = self._policy(db, user_id).clusters
+        return [
+            evaluate(clusters.get(cluster_id), namespace, action)
+            for cluster_id, namespace, action in checks
+        ]
+
+    def invalidate(self, user_id: int | None = None) -> None:
+        with self._lock:
+            if user_id is None:
+                self._users.clear()
+            else:
+                self._users.pop(user_id, None)
+
+
+namespace_policies = NamespacePolicyEngine(max_age=get_settings().permission_cache_ttl_seconds)
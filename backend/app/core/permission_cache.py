@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import json
+import logging
+import threading
+import time
+from collections.abc import Callable
+
+import redis
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.db.models import Permission, RolePermission, UserRole
+
+logger = logging.getLogger(__name__)
+
+# A user's permission version is the sum of a global counter (role or permission edits that may
+# touch many users) and the user's own counter (role bindings, deactivation). Both only grow, so
+# the sum changes whenever either does.
+
+
+def load_user_permissions(db: Session, user_id: int) -> set[str]:
+    stmt = (
+        select(Permission.name)
+        .join(RolePermission, RolePermission.permission_id == Permission.id)
+        .join(UserRole, UserRole.role_id == RolePermission.role_id)
+        .where(UserRole.user_id == user_id)
+    )
+    return {row[0] for row in db.execute(stmt).all()}
+
+
+class LocalPermissionBackend:
+    """Per-process cache; correct for a single worker only."""
+
+    def __init__(self) -> None:
+        self._global_version = 0
+        self._user_versions: dict[int, int] = {}
+        self._entries: dict[int, tuple[int, float, frozenset[str]]] = {}
+        self._lock = threading.Lock()
+
+    def lookup(self, user_id: int) -> tuple[int, frozenset[str] | None]:
+        with self._lock:
+            version = self._global_version + self._user_versions.get(user_id, 0)
+            entry = self._entries.get(user_id)
+        if entry is None or entry[0] != version or entry[1] < time.monotonic():
+            return version, None
+        return version, entry[2]
+
+    def store(self, user_id: int, version: int, perms: frozenset[str], ttl: float) -> None:
+        with self._lock:
+            self._entries[user_id] = (version, time.monotonic() + ttl, perms)
+
+    def bump(self, user_id: int | None) -> None:
+        with self._lock:
+            if user_id is None:
+                self._global_version += 1
+                self._entries.clear()
+            else:
+                self._user_versions[user_id] = self._user_versions.get(user_id, 0) + 1
+                self._entries.pop(user_id, None)
+
+
+class RedisPermissionBackend:
+    """Shared cache so every API worker sees the same versions; one round trip per lookup."""
+
+    def __init__(self, url: str, prefix: str = "perm") -> None:
+        self._redis = redis.Redis.from_url(url, socket_timeout=0.5)
+        self._prefix = prefix
+
+    def _version_key(self, user_id: int | None) -> str:
+        return f"{self._prefix}:v:{'all' if user_id is None else user_id}"
+
+    def _entry_key(self, user_id: int) -> str:
+        return f"{self._prefix}:s:{user_id}"
+
+    def lookup(self, user_id: int) -> tuple[int, frozenset[str] | None]:
+        global_version, user_version, raw = self._redis.mget(
+            self._version_key(None), self._version_key(user_id), self._entry_key(user_id)
+        )
+        version = int(global_version or 0) + int(user_version or 0)
+        if raw is None:
+            return version, None
+        entry = json.loads(raw)
+        if entry["version"] != version:
+            return version, None
+        return version, frozenset(entry["perms"])
+
+    def store(self, user_id: int, version: int, perms: frozenset[str], ttl: float) -> None:
+        entry = json.dumps({"version": version, "perms": sorted(perms)})
+        self._redis.set(self._entry_key(user_id), entry, px=max(1, int(ttl * 1000)))
+
+    def bump(self, user_id: int | None) -> None:
+        self._redis.incr(self._version_key(user_id))
+
+
+class PermissionCache:
+    def __init__(
+        self, backend: LocalPermissionBackend | RedisPermissionBackend, ttl: float
+    ) -> None:
+        self.backend = backend
+        self.ttl = ttl
+
+    def get(self, user_id: int, load: Callable[[], set[str]]) -> tuple[int, frozenset[str]]:
+        """Return (version, permissions), loading from the database on a miss."""
+        try:
+            version, perms = self.backend.lookup(user_id)
+        except Exception:
+            logger.warning("Permission cache lookup failed; reading from the database")
+            return 0, frozenset(load())
+        if perms is None:
+            perms = frozenset(load())
+            try:
+                self.backend.store(user_id, version, perms, self.ttl)
+            except Exception:
+                logger.warning("Permission cache store failed for user %s", user_id)
+        return version, perms
+
+    def version(self, user_id: int) -> int | None:
+        try:
+            return self.backend.lookup(user_id)[0]
+        except Exception:
+            return None
+
+    def invalidate_user(self, user_id: int) -> None:
+        self._bump(user_id)
+
+    def invalidate_all(self) -> None:
+        self._bump(None)
+
+    def _bump(self, user_id: int | None) -> None:
+        try:
+            self.backend.bump(user_id)
+        except Exception:
+            # Entries still expire after the TTL, which bounds how stale they can get.
+            logger.exception("Permission cache invalidation failed")
+
+
+def build_permission_cache() -> PermissionCache:
+    settings = get_settings()
+    if settings.permission_cache_backend == "redis":
+        backend = RedisPermissionBackend(settings.redis_url)
+    else:
+        backend = LocalPermissionBackend()
+    return PermissionCache(backend, ttl=settings.permission_cache_ttl_seconds)
+
+
+permission_cache = build_permission_cache()
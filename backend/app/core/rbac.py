@@ -1,11 +1,13 @@
 from collections.abc import Callable
 
-from fastapi import Depends, HTTPException, status
-from sqlalchemy import select
+from fastapi import Depends, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 
-from app.core.deps import get_current_user, get_db
-from app.db.models import Permission, RolePermission, UserNamespaceScope, UserRole
+from app.core.config import get_settings
+from app.core.deps import get_db, get_token_claims, load_current_user
+from app.core.namespace_policy import namespace_policies
+from app.core.permission_cache import load_user_permissions, permission_cache
 from app.db.models import User as UserModel
 
 
@@ -15,13 +17,54 @@ class PermissionDenied(HTTPException):
 
 
 def user_permission_set(db: Session, user_id: int) -> set[str]:
-    stmt = (
-        select(Permission.name)
-        .join(RolePermission, RolePermission.permission_id == Permission.id)
-        .join(UserRole, UserRole.role_id == RolePermission.role_id)
-        .where(UserRole.user_id == user_id)
-    )
-    return {row[0] for row in db.execute(stmt).all()}
+    _, perms = permission_cache.get(user_id, lambda: load_user_permissions(db, user_id))
+    return set(perms)
+
+
+def invalidate_permissions(user_id: int | None = None) -> None:
+    """Call after committing a change to a user's roles or namespace scopes, or to any role."""
+    if user_id is None:
+        permission_cache.invalidate_all()
+    else:
+        permission_cache.invalidate_user(user_id)
+    namespace_policies.invalidate(user_id)
+
+
+def access_token_claims(db: Session, user: UserModel) -> dict:
+    """Extra access-token claims; empty unless permission-bearing tokens are enabled."""
+    if not get_settings().access_token_embed_permissions:
+        return {}
+    version, perms = permission_cache.get(user.id, lambda: load_user_permissions(db, user.id))
+    return {"act": user.is_active, "perms": sorted(perms), "pv": version}
+
+
+def embedded_permissions(claims: dict) -> set[str] | None:
+    """Permissions carried by the token, or None if it has none or they are out of date."""
+    if "api_key_id" in claims:
+        # Resolved moments ago against the current version; never widen to the owner's roles.
+        return set(claims["perms"])
+    if "perms" not in claims or not claims.get("act"):
+        return None
+    if claims.get("pv") != permission_cache.version(int(claims["sub"])):
+        return None
+    return set(claims["perms"])
+
+
+def principal_permissions(db: Session, user: UserModel, claims: dict) -> set[str]:
+    """Permissions of the caller: an API key's own set, never widened to its owner's roles."""
+    embedded = embedded_permissions(claims)
+    if embedded is not None:
+        return embedded
+    return user_permission_set(db, user.id)
+
+
+def _granted_permissions(request: Request, claims: dict, db: Session) -> set[str]:
+    # Blocks on the permission cache; callers run it on the threadpool.
+    embedded = embedded_permissions(claims)
+    if embedded is not None:
+        return embedded
+    user = load_current_user(request, claims, db)
+    return user_permission_set(db, user.id)
 
 
 def _user_permission_set(db: Session, user_id: int) -> set[str]:
@@ -43,13 +86,13 @@ def ensure_any_permission(granted: set[str], required: tuple[str, ...] | list[st
 
 
 def require_perm(permission: str) -> Callable:
-    def _dep(
-        user: UserModel = Depends(get_current_user),
+    async def _dep(
+        request: Request,
+        claims: dict = Depends(get_token_claims),
         db: Session = Depends(get_db),
-    ) -> UserModel:
-        perms = user_permission_set(db, user.id)
-        ensure_any_permission(perms, (permission,))
-        return user
+    ) -> None:
+        granted = await run_in_threadpool(_granted_permissions, request, claims, db)
+        ensure_any_permission(granted, (permission,))
 
     return _dep
 
@@ -59,13 +102,13 @@ def require_any_perm(*permissions: str) -> Callable:
     if not normalized:
         raise ValueError("At least one permission must be provided")
 
-    def _dep(
-        user: UserModel = Depends(get_current_user),
+    async def _dep(
+        request: Request,
+        claims: dict = Depends(get_token_claims),
         db: Session = Depends(get_db),
-    ) -> UserModel:
-        perms = user_permission_set(db, user.id)
-        ensure_any_permission(perms, normalized)
-        return user
+    ) -> None:
+        granted = await run_in_threadpool(_granted_permissions, request, claims, db)
+        ensure_any_permission(granted, normalized)
 
     return _dep
 
@@ -77,21 +120,18 @@ def enforce_namespace_access(
     namespace: str,
     action: str,
 ) -> None:
-    scopes = db.scalars(
-        select(UserNamespaceScope).where(
-            UserNamespaceScope.user_id == user.id,
-            UserNamespaceScope.cluster_id == cluster_id,
-            UserNamespaceScope.namespace == namespace,
-        )
-    ).all()
-    if not scopes:
-        return
+    [error] = namespace_policies.check(db, user.id, [(cluster_id, namespace, action)])
+    if error:
+        raise PermissionDenied(error)
 
-    for scope in scopes:
-        denied = set(scope.denied_actions.get("actions", []))
-        if action in denied:
-            raise PermissionDenied("Namespace action denied")
 
-    if any(action in set(scope.allowed_actions.get("actions", [])) for scope in scopes):
-        return
-    raise PermissionDenied("Namespace action not allowed")
+def namespace_access_errors(
+    db: Session,
+    user: UserModel,
+    checks: list[tuple[int, str, str]],
+) -> list[str | None]:
+    """Evaluate many (cluster_id, namespace, action) checks against the compiled policy index.
+
+    Returns one entry per check: ``None`` when allowed, otherwise the denial reason.
+    """
+    return namespace_policies.check(db, user.id, checks)
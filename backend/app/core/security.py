@@ -1,3 +1,8 @@
+import asyncio
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import UTC, datetime, timedelta
 from uuid import uuid4
 
@@ -5,6 +10,7 @@ from jose import JWTError, jwt
 from passlib.context import CryptContext
 
 from app.core.config import get_settings
+from app.core.token_revocation import token_revocations
 
 pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
 
@@ -13,18 +19,107 @@ class TokenError(Exception):
     pass
 
 
+class HashPoolBusy(Exception):
+    pass
+
+
+HASH_LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+_BUCKET_LABELS = [str(bound) for bound in HASH_LATENCY_BUCKETS] + ["+Inf"]
+
+
+class PasswordHashPool:
+    """Runs argon2 on its own threads so hashing bursts cannot starve the request threadpool.
+
+    argon2 releases the GIL while hashing. At most ``workers`` hashes run at once and at most
+    ``max_queue`` more wait; anything beyond that is rejected with HashPoolBusy.
+    """
+
+    def __init__(self, workers: int, max_queue: int) -> None:
+        self.workers = workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="argon2")
+        self._slots = threading.BoundedSemaphore(workers + max_queue)
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.buckets = [0] * (len(HASH_LATENCY_BUCKETS) + 1)
+
+    def submit(self, fn: Callable, *args) -> Future:
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise HashPoolBusy("Password hashing is saturated")
+        with self._lock:
+            self.in_flight += 1
+        return self._executor.submit(self._timed, fn, *args)
+
+    def _timed(self, fn: Callable, *args):
+        started = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            self._finish(time.perf_counter() - started)
+
+    def _finish(self, seconds: float) -> None:
+        index = next(
+            (i for i, bound in enumerate(HASH_LATENCY_BUCKETS) if seconds <= bound),
+            len(HASH_LATENCY_BUCKETS),
+        )
+        with self._lock:
+            self.in_flight -= 1
+            self.completed += 1
+            self.total_seconds += seconds
+            self.max_seconds = max(self.max_seconds, seconds)
+            self.buckets[index] += 1
+        self._slots.release()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "max_queue": self.max_queue,
+                "in_flight": self.in_flight,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "avg_seconds": self.total_seconds / self.completed if self.completed else 0.0,
+                "max_seconds": self.max_seconds,
+                "latency_buckets": dict(zip(_BUCKET_LABELS, self.buckets, strict=True)),
+            }
+
+
+_settings = get_settings()
+hash_pool = PasswordHashPool(
+    workers=_settings.password_hash_workers,
+    max_queue=_settings.password_hash_max_queue,
+)
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return hash_pool.submit(pwd_context.verify, plain_password, hashed_password).result()
 
 
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+    return hash_pool.submit(pwd_context.hash, password).result()
 
 
-def _create_token(subject: str, token_type: str, expires_delta: timedelta) -> str:
+async def verify_and_update_password(
+    plain_password: str, hashed_password: str
+) -> tuple[bool, str | None]:
+    """Verify off the request thread; also returns a new hash if the stored one is outdated."""
+    future = hash_pool.submit(pwd_context.verify_and_update, plain_password, hashed_password)
+    return await asyncio.wrap_future(future)
+
+
+def _create_token(
+    subject: str, token_type: str, expires_delta: timedelta, claims: dict | None = None
+) -> str:
     settings = get_settings()
     now = datetime.now(UTC)
     payload = {
+        **(claims or {}),
         "sub": subject,
         "type": token_type,
         "iat": int(now.timestamp()),
@@ -34,9 +129,11 @@ def _create_token(subject: str, token_type: str, expires_delta: timedelta) -> st
     return jwt.encode(payload, settings.jwt_secret, algorithm=settings.jwt_algorithm)
 
 
-def create_access_token(subject: str) -> str:
+def create_access_token(subject: str, claims: dict | None = None) -> str:
     settings = get_settings()
-    return _create_token(subject, "access", timedelta(minutes=settings.access_token_minutes))
+    return _create_token(
+        subject, "access", timedelta(minutes=settings.access_token_minutes), claims
+    )
 
 
 def create_refresh_token(subject: str) -> str:
@@ -52,4 +149,11 @@ def decode_token(token: str, expected_type: str) -> dict:
         raise TokenError("Invalid token") from exc
     if payload.get("type") != expected_type:
         raise TokenError("Invalid token type")
+    if token_revocations.is_revoked(payload):
+        raise TokenError("Token has been revoked")
     return payload
+
+
+def revoke_token(claims: dict) -> None:
+    """Revoke one decoded token until it would have expired anyway."""
+    token_revocations.revoke(claims["jti"], claims["exp"])
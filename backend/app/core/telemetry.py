@@ -0,0 +1,162 @@
+import os
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+
+from prometheus_client import (
+    REGISTRY,
+    CollectorRegistry,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from prometheus_client.registry import Collector
+from sqlalchemy import Engine
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "orchestrator_http_request_duration_seconds",
+    "Time until the response starts, by route template",
+    ["method", "route", "status"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+HTTP_IN_FLIGHT = Gauge(
+    "orchestrator_http_requests_in_flight",
+    "Requests currently being served",
+    multiprocess_mode="livesum",
+)
+UPSTREAM_SECONDS = Histogram(
+    "orchestrator_upstream_request_duration_seconds",
+    "Latency of calls to Kubernetes API servers and Prometheus",
+    ["upstream", "cluster", "target", "outcome"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+
+
+@contextmanager
+def time_upstream(upstream: str, cluster: str = "", target: str = "") -> Iterator[None]:
+    started = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "ok"
+    finally:
+        UPSTREAM_SECONDS.labels(upstream, cluster, target, outcome).observe(
+            time.perf_counter() - started
+        )
+
+
+def instrument_api_client(cluster_id: int, api_client) -> None:
+    """Time every request a pooled kubernetes ApiClient sends, labelled by cluster and verb."""
+    # Every generated API call goes through the REST client, whatever the client version.
+    rest_client = api_client.rest_client
+    request = rest_client.request
+
+    def timed_request(method, url, *args, **kwargs):
+        with time_upstream("kubernetes", str(cluster_id), method):
+            return request(method, url, *args, **kwargs)
+
+    rest_client.request = timed_request
+
+
+class RuntimeCollector(Collector):
+    """Scrape-time metrics for DB connection pools, read replicas and the audit write queue."""
+
+    def __init__(
+        self,
+        engines: dict[str, Engine],
+        audit_stats: Callable[[], dict],
+        replica_stats: Callable[[], dict] | None = None,
+    ) -> None:
+        self._engines = engines
+        self._audit_stats = audit_stats
+        self._replica_stats = replica_stats
+
+    def collect(self):
+        size = GaugeMetricFamily(
+            "orchestrator_db_pool_size", "Configured pool size", labels=["engine"]
+        )
+        checked_out = GaugeMetricFamily(
+            "orchestrator_db_pool_checked_out", "Connections in use", labels=["engine"]
+        )
+        overflow = GaugeMetricFamily(
+            "orchestrator_db_pool_overflow", "Connections open beyond pool_size", labels=["engine"]
+        )
+        for name, engine in self._engines.items():
+            pool = engine.pool
+            if not hasattr(pool, "checkedout"):
+                continue
+            size.add_metric([name], pool.size())
+            checked_out.add_metric([name], pool.checkedout())
+            # QueuePool counts overflow from -pool_size until the pool is full.
+            overflow.add_metric([name], max(pool.overflow(), 0))
+        yield size
+        yield checked_out
+        yield overflow
+        if self._replica_stats is not None:
+            yield from self._collect_replicas(self._replica_stats())
+        audit = self._audit_stats()
+        yield GaugeMetricFamily(
+            "orchestrator_audit_queue_depth",
+            "Audit rows waiting for the background writer",
+            value=audit["queue_depth"],
+        )
+        yield CounterMetricFamily(
+            "orchestrator_audit_overflow_writes",
+            "Audit rows written inline by the request because the queue was full",
+            value=audit["overflow_writes"],
+        )
+        yield CounterMetricFamily(
+            "orchestrator_audit_dropped",
+            "Audit rows lost after the background writer exhausted its retries",
+            value=audit["dropped"],
+        )
+
+    @staticmethod
+    def _collect_replicas(stats: dict):
+        healthy = GaugeMetricFamily(
+            "orchestrator_db_replica_healthy",
+            "1 if the replica passed its last lag check",
+            labels=["replica"],
+        )
+        lag = GaugeMetricFamily(
+            "orchestrator_db_replica_lag_seconds",
+            "Replication lag at the last check; absent while replication is stopped",
+            labels=["replica"],
+        )
+        for replica in stats["replicas"]:
+            healthy.add_metric([replica["name"]], 1 if replica["healthy"] else 0)
+            if replica["lag_seconds"] is not None:
+                lag.add_metric([replica["name"]], replica["lag_seconds"])
+        yield healthy
+        yield lag
+        yield CounterMetricFamily(
+            "orchestrator_db_replica_reads",
+            "Read sessions routed to a replica",
+            value=stats["replica_reads"],
+        )
+        yield CounterMetricFamily(
+            "orchestrator_db_primary_fallbacks",
+            "Read sessions sent to the primary because no replica was healthy",
+            value=stats["primary_fallbacks"],
+        )
+
+
+_process_collectors: list[Collector] = []
+
+
+def register_collector(collector: Collector) -> None:
+    _process_collectors.append(collector)
+    REGISTRY.register(collector)
+
+
+def metrics_payload() -> bytes:
+    if "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+        return generate_latest(REGISTRY)
+    # Several worker processes: merge their files, plus this process's scrape-time gauges.
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    for collector in _process_collectors:
+        registry.register(collector)
+    return generate_latest(registry)
@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import math
+import threading
+import time
+
+import redis
+
+from app.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings; no false negatives, tunable false positives."""
+
+    def __init__(self, capacity: int, error_rate: float) -> None:
+        capacity = max(1, capacity)
+        self.size = max(64, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str) -> list[int]:
+        # Kirsch-Mitzenmacher double hashing: k positions from one 128-bit digest.
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return [(first + i * second) % self.size for i in range(self.hashes)]
+
+    def add(self, item: str) -> None:
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item)
+        )
+
+
+class LocalRevocationBackend:
+    """Per-process store; correct for a single worker only."""
+
+    def __init__(self) -> None:
+        self._generation = 0
+        self._jtis: dict[str, float] = {}
+        self._user_cutoffs: dict[int, float] = {}
+        self._lock = threading.Lock()
+
+    def generation(self) -> int:
+        with self._lock:
+            return self._generation
+
+    def revoke(self, jti: str, expires_at: float) -> None:
+        with self._lock:
+            self._jtis[jti] = expires_at
+            self._generation += 1
+
+    def revoke_user(self, user_id: int, issued_before: float) -> None:
+        with self._lock:
+            self._user_cutoffs[user_id] = max(issued_before, self._user_cutoffs.get(user_id, 0))
+            self._generation += 1
+
+    def is_revoked(self, jti: str) -> bool:
+        with self._lock:
+            return self._jtis.get(jti, 0) > time.time()
+
+    def snapshot(
+        self, now: float, cutoff_horizon: float
+    ) -> tuple[dict[str, float], dict[int, float]]:
+        """Live jti -> exp entries and user cutoffs; drops anything that can no longer match."""
+        with self._lock:
+            self._jtis = {jti: exp for jti, exp in self._jtis.items() if exp > now}
+            self._user_cutoffs = {
+                uid: cutoff for uid, cutoff in self._user_cutoffs.items() if cutoff > cutoff_horizon
+            }
+            return dict(self._jtis), dict(self._user_cutoffs)
+
+
+class RedisRevocationBackend:
+    """Shared store: a sorted set of jti scored by expiry, so pruning is one range delete."""
+
+    def __init__(self, url: str, prefix: str = "revoked") -> None:
+        self._redis = redis.Redis.from_url(url, socket_timeout=0.5, decode_responses=True)
+        self._jti_key = f"{prefix}:jti"
+        self._user_key = f"{prefix}:users"
+        self._generation_key = f"{prefix}:gen"
+
+    def generation(self) -> int:
+        return int(self._redis.get(self._generation_key) or 0)
+
+    def revoke(self, jti: str, expires_at: float) -> None:
+        pipe = self._redis.pipeline()
+        pipe.zadd(self._jti_key, {jti: expires_at})
+        pipe.incr(self._generation_key)
+        pipe.execute()
+
+    def revoke_user(self, user_id: int, issued_before: float) -> None:
+        pipe = self._redis.pipeline()
+        pipe.zadd(self._user_key, {str(user_id): issued_before}, gt=True)
+        pipe.incr(self._generation_key)
+        pipe.execute()
+
+    def is_revoked(self, jti: str) -> bool:
+        expires_at = self._redis.zscore(self._jti_key, jti)
+        return expires_at is not None and expires_at > time.time()
+
+    def snapshot(
+        self, now: float, cutoff_horizon: float
+    ) -> tuple[dict[str, float], dict[int, float]]:
+        pipe = self._redis.pipeline()
+        pipe.zremrangebyscore(self._jti_key, "-inf", now)
+        pipe.zremrangebyscore(self._user_key, "-inf", cutoff_horizon)
+        pipe.zrange(self._jti_key, 0, -1, withscores=True)
+        pipe.zrange(self._user_key, 0, -1, withscores=True)
+        _, _, jtis, cutoffs = pipe.execute()
+        return dict(jtis), {int(uid): cutoff for uid, cutoff in cutoffs}
+
+
+class TokenRevocations:
+    """Answers "is this token revoked?" from memory on the hot path.
+
+    Every revoked jti is added to a Bloom filter that is rebuilt from the authoritative backend
+    whenever its generation counter moves (checked at most every ``sync_seconds``) or an entry
+    expires. A filter miss means "not revoked" with no I/O; only a hit, which is either a revoked
+    token or a rare false positive, is confirmed against the backend. Per-user cutoffs ("every
+    token issued before T") are few and held exactly.
+    """
+
+    def __init__(
+        self,
+        backend: LocalRevocationBackend | RedisRevocationBackend,
+        *,
+        sync_seconds: float,
+        max_token_seconds: float,
+        capacity: int = 10_000,
+        error_rate: float = 0.001,
+    ) -> None:
+        self.backend = backend
+        self.sync_seconds = sync_seconds
+        self.max_token_seconds = max_token_seconds
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self._lock = threading.Lock()
+        self._filter = BloomFilter(capacity, error_rate)
+        self._user_cutoffs: dict[int, float] = {}
+        self._generation: int | None = None
+        self._next_sync = 0.0
+        self._next_expiry = math.inf
+
+    def revoke(self, jti: str, expires_at: float) -> None:
+        self.backend.revoke(jti, expires_at)
+        with self._lock:
+            self._filter.add(jti)
+            self._next_expiry = min(self._next_expiry, expires_at)
+
+    def revoke_user(self, user_id: int, issued_before: float | None = None) -> None:
+        # Rounded up to whole seconds, like ``iat``: every token issued in the revoking second is
+        # revoked too, so a re-login right after "log out everywhere" needs the next second.
+        issued_before = math.ceil(time.time() if issued_before is None else issued_before)
+        self.backend.revoke_user(user_id, issued_before)
+        with self._lock:
+            self._user_cutoffs[user_id] = max(issued_before, self._user_cutoffs.get(user_id, 0))
+
+    def is_revoked(self, claims: dict) -> bool:
+        self._maybe_sync()
+        cutoff = self._user_cutoffs.get(int(claims["sub"]))
+        if cutoff is not None and claims.get("iat", 0) < cutoff:
+            return True
+        jti = claims.get("jti")
+        if jti is None or jti not in self._filter:
+            return False
+        try:
+            return self.backend.is_revoked(jti)
+        except Exception:
+            logger.warning("Revocation store unavailable; rejecting token that matched the filter")
+            return True
+
+    def _maybe_sync(self) -> None:
+        now = time.time()
+        if now < self._next_sync:
+            return
+        with self._lock:
+            if now < self._next_sync:
+                return
+            self._next_sync = now + self.sync_seconds
+        try:
+            generation = self.backend.generation()
+            if generation == self._generation and now < self._next_expiry:
+                return
+            jtis, cutoffs = self.backend.snapshot(now, now - self.max_token_seconds)
+        except Exception:
+            logger.warning("Revocation sync failed; keeping the previous filter")
+            return
+        rebuilt = BloomFilter(max(self.capacity, 2 * len(jtis)), self.error_rate)
+        for jti in jtis:
+            rebuilt.add(jti)
+        with self._lock:
+            self._filter = rebuilt
+            self._user_cutoffs = cutoffs
+            self._generation = generation
+            self._next_expiry = min(jtis.values(), default=math.inf)
+
+
+def build_token_revocations() -> TokenRevocations:
+    settings = get_settings()
+    if settings.token_revocation_backend == "redis":
+        backend = RedisRevocationBackend(settings.redis_url)
+    else:
+        backend = LocalRevocationBackend()
+    return TokenRevocations(
+        backend,
+        sync_seconds=settings.token_revocation_sync_seconds,
+        max_token_seconds=max(
+            settings.access_token_minutes * 60, settings.refresh_token_days * 86400
+        ),
+        capacity=settings.token_revocation_bloom_capacity,
+    )
+
+
+token_revocations = build_token_revocations()
@@ -0,0 +1,127 @@
+import logging
+import re
+import time
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from prometheus_client import Histogram
+from sqlalchemy import Engine, event
+
+from app.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+DB_STATEMENTS = Histogram(
+    "orchestrator_db_statements_per_request",
+    "SQL statements issued while serving one request",
+    ["method", "route"],
+    buckets=(1, 2, 3, 5, 8, 13, 21, 34, 55, 89, 144, 233),
+)
+DB_SECONDS = Histogram(
+    "orchestrator_db_seconds_per_request",
+    "Time spent executing SQL while serving one request",
+    ["method", "route"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+DB_DUPLICATES = Histogram(
+    "orchestrator_db_duplicate_statements_per_request",
+    "Statements per request that repeat an earlier statement shape",
+    ["method", "route"],
+    buckets=(0, 1, 2, 5, 10, 20, 50, 100),
+)
+
+# Expanded IN lists ("IN (?, ?, ?)") would make every batch size its own shape.
+_PARAM_LIST = re.compile(r"\(\s*(?:%s|\?|:\w+)(?:\s*,\s*(?:%s|\?|:\w+))+\s*\)")
+
+
+def statement_shape(statement: str) -> str:
+    return _PARAM_LIST.sub("(?)", " ".join(statement.split()))
+
+
+@dataclass
+class QueryStats:
+    statements: int = 0
+    seconds: float = 0.0
+    shapes: Counter[str] = field(default_factory=Counter)
+
+    @property
+    def duplicates(self) -> int:
+        return sum(n - 1 for n in self.shapes.values() if n > 1)
+
+    def most_repeated(self) -> tuple[str, int] | None:
+        if not self.shapes:
+            return None
+        shape, n = self.shapes.most_common(1)[0]
+        return (shape, n) if n > 1 else None
+
+
+_current: ContextVar[QueryStats | None] = ContextVar("sql_query_stats", default=None)
+
+
+def current_stats() -> QueryStats | None:
+    return _current.get()
+
+
+@contextmanager
+def collect_queries() -> Iterator[QueryStats]:
+    """Count the SQL issued in this context, including threads and greenlets it spawns."""
+    stats = QueryStats()
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    if _current.get() is not None and context is not None:
+        context._query_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    stats = _current.get()
+    if stats is None:
+        return
+    started = getattr(context, "_query_started", None)
+    stats.statements += 1
+    if started is not None:
+        stats.seconds += time.perf_counter() - started
+    stats.shapes[statement_shape(statement)] += 1
+
+
+def instrument_engine(engine: Engine) -> None:
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def record_request(stats: QueryStats, method: str, route: str) -> None:
+    DB_STATEMENTS.labels(method, route).observe(stats.statements)
+    DB_SECONDS.labels(method, route).observe(stats.seconds)
+    DB_DUPLICATES.labels(method, route).observe(stats.duplicates)
+    if (
+        stats.statements > settings.sql_warn_statements
+        or stats.duplicates > settings.sql_warn_duplicates
+        or stats.seconds > settings.sql_warn_seconds
+    ):
+        repeated = stats.most_repeated()
+        logger.warning(
+            "%s %s issued %d SQL statements in %.1f ms with %d duplicates%s",
+            method,
+            route,
+            stats.statements,
+            stats.seconds * 1000,
+            stats.duplicates,
+            f"; most repeated x{repeated[1]}: {repeated[0][:200]}" if repeated else "",
+        )
+
+
+def stats_headers(stats: QueryStats) -> dict[str, str]:
+    return {
+        "X-DB-Statements": str(stats.statements),
+        "X-DB-Time-Ms": f"{stats.seconds * 1000:.1f}",
+        "X-DB-Duplicate-Statements": str(stats.duplicates),
+    }
@@ -100,10 +100,11 @@ class ResourceIntent(Base):
     __tablename__ = "resource_intents"
     __table_args__ = (
         Index("ix_intents_scope", "cluster_id", "namespace", "resource_type", "status"),
+        Index("ix_intents_type_id", "resource_type", "id"),
     )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
-    resource_type: Mapped[str] = mapped_column(String(80), index=True)
+    resource_type: Mapped[str] = mapped_column(String(80))
     mode: Mapped[str | None] = mapped_column(String(64), nullable=True)
     cluster_id: Mapped[int] = mapped_column(ForeignKey("clusters.id", ondelete="CASCADE"), index=True)
     namespace: Mapped[str] = mapped_column(String(128), index=True)
@@ -115,6 +116,7 @@ class ResourceIntent(Base):
 
 class ResourceRun(Base):
     __tablename__ = "resource_runs"
+    __table_args__ = (Index("ix_resource_runs_started_at", "started_at"),)
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     intent_id: Mapped[int] = mapped_column(ForeignKey("resource_intents.id", ondelete="CASCADE"), index=True)
@@ -128,6 +130,15 @@ class ResourceRun(Base):
 
 class ObservedResource(Base):
     __tablename__ = "observed_resources"
+    __table_args__ = (
+        UniqueConstraint(
+            "cluster_id",
+            "namespace",
+            "resource_type",
+            "resource_name",
+            name="uq_observed_resource_key",
+        ),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     cluster_id: Mapped[int] = mapped_column(ForeignKey("clusters.id", ondelete="CASCADE"), index=True)
@@ -135,6 +146,7 @@ class ObservedResource(Base):
     resource_type: Mapped[str] = mapped_column(String(80), index=True)
     resource_name: Mapped[str] = mapped_column(String(150), index=True)
     observed_json: Mapped[dict] = mapped_column(JSON)
+    content_hash: Mapped[str] = mapped_column(String(64), default="")
     observed_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
 
 
@@ -166,6 +178,10 @@ class AlertFiring(Base):
 
 class Incident(Base):
     __tablename__ = "incidents"
+    __table_args__ = (
+        Index("ix_incidents_created_at", "created_at"),
+        Index("ix_incidents_state_created", "state", "created_at"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     rule_id: Mapped[int] = mapped_column(ForeignKey("alert_rules.id", ondelete="SET NULL"), nullable=True)
@@ -216,7 +232,11 @@ class AIRequest(Base):
 
 class AuditLog(Base):
     __tablename__ = "audit_log"
-    __table_args__ = (Index("ix_audit_time", "ts"),)
+    __table_args__ = (
+        Index("ix_audit_ts_action", "ts", "action"),
+        Index("ix_audit_actor_ts", "actor_id", "ts"),
+        Index("ix_audit_resource", "resource_kind", "resource_id"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     actor_id: Mapped[int | None] = mapped_column(ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
@@ -243,6 +263,11 @@ class ApiKey(Base):
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     name: Mapped[str] = mapped_column(String(120))
+    prefix: Mapped[str | None] = mapped_column(String(16), unique=True, index=True, nullable=True)
     hashed_key: Mapped[str] = mapped_column(String(255))
+    user_id: Mapped[int | None] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"), index=True, nullable=True
+    )
+    permissions: Mapped[list[str]] = mapped_column(JSON, default=list)
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
@@ -0,0 +1,57 @@
+import base64
+import binascii
+import json
+from collections.abc import Callable, Sequence
+from datetime import UTC, datetime
+from typing import Any
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(*values: object) -> str:
+    """Opaque keyset cursor for the sort key of the last row on a page."""
+    raw = json.dumps([v.isoformat() if isinstance(v, datetime) else v for v in values])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> list:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+        raise InvalidCursor("Invalid cursor") from exc
+    if not isinstance(values, list) or len(values) != size:
+        raise InvalidCursor("Invalid cursor")
+    return values
+
+
+def naive_utc(value: datetime | None) -> datetime | None:
+    # Timestamp columns hold naive UTC; filters may arrive with an offset.
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(UTC).replace(tzinfo=None)
+
+
+def decode_id_cursor(cursor: str) -> int:
+    [row_id] = decode_cursor(cursor, 1)
+    if not isinstance(row_id, int):
+        raise InvalidCursor("Invalid cursor")
+    return row_id
+
+
+def decode_ts_id_cursor(cursor: str) -> tuple[datetime, int]:
+    ts, row_id = decode_cursor(cursor, 2)
+    try:
+        return datetime.fromisoformat(ts), int(row_id)
+    except (TypeError, ValueError) as exc:
+        raise InvalidCursor("Invalid cursor") from exc
+
+
+def split_page(
+    rows: Sequence[Any], limit: int, sort_key: Callable[[Any], tuple]
+) -> tuple[list[Any], str | None]:
+    """Trim a ``limit + 1`` fetch to one page plus the cursor for the next, if there is one."""
+    page = list(rows[:limit])
+    next_cursor = encode_cursor(*sort_key(page[-1])) if len(rows) > limit else None
+    return page, next_cursor
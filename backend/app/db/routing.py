@@ -0,0 +1,239 @@
+import hashlib
+import itertools
+import logging
+import threading
+import time
+from dataclasses import dataclass
+
+import redis
+from sqlalchemy import Engine, Select, text
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+
+class RoutingSession(Session):
+    """Session whose plain SELECTs go to ``info["replica"]`` when one was chosen for it.
+
+    Flushes, DML, text statements and ``SELECT ... FOR UPDATE`` use the primary bind, and
+    once the session has sent one of those it stays on the primary so it reads its own writes.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        replica = self.info.get("replica")
+        if replica is not None and not self.info.get("pinned"):
+            if (
+                not self._flushing
+                and isinstance(clause, Select)
+                and clause._for_update_arg is None
+            ):
+                return replica
+            self.info["pinned"] = True
+        return super().get_bind(mapper=mapper, clause=clause, **kw)
+
+
+@dataclass
+class ReplicaState:
+    name: str
+    engine: Engine
+    # The async engine's sync facade, which is what an AsyncSession's get_bind must return.
+    async_bind: Engine
+    healthy: bool = False
+    lag_seconds: float | None = None
+    checked_at: float = 0.0
+    error: str | None = None
+
+
+class ReplicaSet:
+    """Read replicas with a background lag monitor.
+
+    ``pick()`` returns a replica whose last check succeeded within the lag budget, round-robin,
+    or None so the caller falls back to the primary. Replicas start out unhealthy until the
+    monitor's first check; ``start()`` runs it at application startup.
+    """
+
+    def __init__(
+        self,
+        replicas: list[tuple[str, Engine, Engine]],
+        *,
+        max_lag_seconds: float,
+        check_seconds: float,
+    ) -> None:
+        self.max_lag_seconds = max_lag_seconds
+        self.check_seconds = check_seconds
+        self._replicas = [ReplicaState(*replica) for replica in replicas]
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+        self.replica_reads = 0
+        self.primary_fallbacks = 0
+
+    @property
+    def configured(self) -> bool:
+        return bool(self._replicas)
+
+    def pick(self) -> ReplicaState | None:
+        if not self._replicas:
+            return None
+        self._ensure_started()
+        healthy = [r for r in self._replicas if r.healthy]
+        with self._lock:
+            if not healthy:
+                self.primary_fallbacks += 1
+                return None
+            self.replica_reads += 1
+            return healthy[next(self._counter) % len(healthy)]
+
+    def start(self) -> None:
+        if self._replicas:
+            self._ensure_started()
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stopped.clear()
+                self._thread = threading.Thread(
+                    target=self._run, name="replica-monitor", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            self.check()
+            self._stopped.wait(self.check_seconds)
+
+    def stop(self) -> None:
+        self._stopped.set()
+
+    def check(self) -> None:
+        for replica in self._replicas:
+            try:
+                lag = self._lag(replica.engine)
+                error = None if lag is not None else "replication stopped"
+            except Exception as exc:
+                lag, error = None, str(exc)
+            healthy = lag is not None and lag <= self.max_lag_seconds
+            # Replicas start out of service, so also report one that fails its first check.
+            first_check = replica.checked_at == 0.0
+            if healthy != replica.healthy or (first_check and not healthy):
+                logger.warning(
+                    "Replica %s is now %s (lag=%s, error=%s)",
+                    replica.name,
+                    "in service" if healthy else "out of service",
+                    lag,
+                    error,
+                )
+            replica.lag_seconds, replica.error = lag, error
+            replica.checked_at = time.time()
+            replica.healthy = healthy
+
+    @staticmethod
+    def _lag(engine: Engine) -> float | None:
+        with engine.connect() as conn:
+            if engine.dialect.name != "mysql":
+                conn.execute(text("SELECT 1"))
+                return 0.0
+            try:
+                row = conn.execute(text("SHOW REPLICA STATUS")).mappings().first()
+            except Exception:
+                # MySQL before 8.0.22.
+                row = conn.execute(text("SHOW SLAVE STATUS")).mappings().first()
+            if row is None:
+                # Not replicating at all, e.g. pointed at the primary in development.
+                return 0.0
+            lag = row.get("Seconds_Behind_Source", row.get("Seconds_Behind_Master"))
+            return None if lag is None else float(lag)
+
+    def stats(self) -> dict:
+        return {
+            "replicas": [
+                {
+                    "name": r.name,
+                    "healthy": r.healthy,
+                    "lag_seconds": r.lag_seconds,
+                    "checked_at": r.checked_at,
+                    "error": r.error,
+                }
+                for r in self._replicas
+            ],
+            "max_lag_seconds": self.max_lag_seconds,
+            "replica_reads": self.replica_reads,
+            "primary_fallbacks": self.primary_fallbacks,
+        }
+
+
+class LocalWriterMarks:
+    """Per-process marks; correct for a single worker only."""
+
+    def __init__(self) -> None:
+        self._expires: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def mark(self, key: str, seconds: float) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._expires[key] = now + seconds
+            if len(self._expires) > 10_000:
+                self._expires = {k: exp for k, exp in self._expires.items() if exp > now}
+
+    def marked(self, key: str) -> bool:
+        with self._lock:
+            expires = self._expires.get(key)
+        return expires is not None and expires > time.monotonic()
+
+
+class RedisWriterMarks:
+    """Shared marks, so a read served by any API worker or pod sees a write made via another."""
+
+    def __init__(self, url: str, prefix: str = "rw") -> None:
+        self._redis = redis.Redis.from_url(url, socket_timeout=0.5)
+        self._prefix = prefix
+
+    def mark(self, key: str, seconds: float) -> None:
+        self._redis.set(f"{self._prefix}:{key}", 1, px=max(1, int(seconds * 1000)))
+
+    def marked(self, key: str) -> bool:
+        return bool(self._redis.exists(f"{self._prefix}:{key}"))
+
+
+class RecentWriters:
+    """Principals that sent a write recently, whose reads should stay on the primary.
+
+    Keyed by a digest of the Authorization header; the window should cover the replica lag
+    budget. Both calls may block on Redis, so async callers run them on the threadpool.
+    """
+
+    def __init__(
+        self, window_seconds: float, marks: LocalWriterMarks | RedisWriterMarks | None = None
+    ) -> None:
+        self.window_seconds = window_seconds
+        self.marks = marks if marks is not None else LocalWriterMarks()
+
+    @staticmethod
+    def key(authorization: str | None) -> str | None:
+        if not authorization:
+            return None
+        return hashlib.blake2b(authorization.encode(), digest_size=16).hexdigest()
+
+    def record(self, authorization: str | None) -> None:
+        key = self.key(authorization)
+        if key is None or self.window_seconds <= 0:
+            return
+        try:
+            self.marks.mark(key, self.window_seconds)
+        except Exception:
+            logger.warning("Could not record a recent write; later reads may hit a replica")
+
+    def recent(self, authorization: str | None) -> bool:
+        key = self.key(authorization)
+        if key is None or self.window_seconds <= 0:
+            return False
+        try:
+            return self.marks.marked(key)
+        except Exception:
+            # Unknown, so read from the primary rather than risk a stale replica.
+            logger.warning("Could not check for a recent write; reading from the primary")
+            return True
@@ -1,7 +1,7 @@
 from datetime import datetime
-from typing import Any
+from typing import Any, Literal
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 
 
 class TokenPair(BaseModel):
@@ -19,6 +19,10 @@ class RefreshRequest(BaseModel):
     refresh_token: str
 
 
+class LogoutRequest(BaseModel):
+    refresh_token: str | None = None
+
+
 class UserCreate(BaseModel):
     email: str
     username: str
@@ -34,10 +38,35 @@ class UserOut(BaseModel):
     model_config = {"from_attributes": True}
 
 
+class UserPage(BaseModel):
+    items: list[UserOut]
+    next_cursor: str | None = None
+
+
 class UserMe(UserOut):
     permissions: list[str] = Field(default_factory=list)
 
 
+class ApiKeyCreate(BaseModel):
+    name: str = Field(min_length=1, max_length=120)
+    permissions: list[str] = Field(min_length=1)
+
+
+class ApiKeyOut(BaseModel):
+    id: int
+    name: str
+    prefix: str | None
+    permissions: list[str]
+    is_active: bool
+    created_at: datetime
+
+    model_config = {"from_attributes": True}
+
+
+class ApiKeyCreated(ApiKeyOut):
+    key: str
+
+
 class PermissionOut(BaseModel):
     id: int
     name: str
@@ -90,10 +119,43 @@ class NamespacePolicyOut(BaseModel):
     model_config = {"from_attributes": True}
 
 
+class NamespaceAccessCheck(BaseModel):
+    cluster_id: int
+    namespace: str
+    action: str
+
+
+class NamespaceAccessCheckRequest(BaseModel):
+    checks: list[NamespaceAccessCheck] = Field(min_length=1, max_length=5000)
+
+
+class NamespaceAccessResult(NamespaceAccessCheck):
+    allowed: bool
+    reason: str | None = None
+
+
 class ScaleRequest(BaseModel):
     replicas: int = Field(ge=0, le=500)
 
 
+class BulkOperation(BaseModel):
+    cluster_id: int
+    action: Literal["scale", "rollout_restart", "delete_pod"]
+    namespace: str
+    name: str
+    replicas: int | None = Field(default=None, ge=0, le=500)
+
+    @model_validator(mode="after")
+    def _replicas_for_scale(self) -> "BulkOperation":
+        if self.action == "scale" and self.replicas is None:
+            raise ValueError("replicas is required for scale")
+        return self
+
+
+class BulkMutationRequest(BaseModel):
+    operations: list[BulkOperation] = Field(min_length=1)
+
+
 class ResourceIntentCreate(BaseModel):
     cluster_id: int
     namespace: str
@@ -113,6 +175,26 @@ class ResourceIntentOut(BaseModel):
     model_config = {"from_attributes": True}
 
 
+class ResourceIntentSummary(BaseModel):
+    """A listing row; ``spec_json`` is only loaded when the caller asks for it."""
+
+    id: int
+    resource_type: str
+    mode: str | None
+    cluster_id: int
+    namespace: str
+    status: str
+    created_at: datetime
+    spec_json: dict[str, Any] | None = None
+
+    model_config = {"from_attributes": True}
+
+
+class ResourceIntentPage(BaseModel):
+    items: list[ResourceIntentSummary]
+    next_cursor: str | None = None
+
+
 class ResourceRunOut(BaseModel):
     id: int
     intent_id: int
@@ -126,6 +208,23 @@ class ResourceRunOut(BaseModel):
     model_config = {"from_attributes": True}
 
 
+class IntentStatusOut(BaseModel):
+    intent_id: int
+    resource_type: str
+    cluster_id: int
+    namespace: str
+    resource_name: str
+    intent_status: str
+    latest_run: ResourceRunOut | None = None
+    observed_status: dict[str, Any] | None = None
+    observed_at: datetime | None = None
+
+
+class IntentStatusPage(BaseModel):
+    items: list[IntentStatusOut]
+    next_cursor: str | None = None
+
+
 class KafkaIntentCreate(ResourceIntentCreate):
     kafka_mode: str
     kafka_version: str
@@ -168,6 +267,11 @@ class AlertRuleOut(BaseModel):
     model_config = {"from_attributes": True}
 
 
+class AlertRulePage(BaseModel):
+    items: list[AlertRuleOut]
+    next_cursor: str | None = None
+
+
 class IncidentOut(BaseModel):
     id: int
     rule_id: int | None
@@ -177,3 +281,22 @@ class IncidentOut(BaseModel):
     ai_summary_ref: str | None
 
     model_config = {"from_attributes": True}
+
+
+class IncidentSummary(BaseModel):
+    """A listing row; ``evidence_json`` is only loaded when the caller asks for it."""
+
+    id: int
+    rule_id: int | None
+    severity: str
+    state: str
+    ai_summary_ref: str | None
+    created_at: datetime
+    evidence_json: dict[str, Any] | None = None
+
+    model_config = {"from_attributes": True}
+
+
+class IncidentPage(BaseModel):
+    items: list[IncidentSummary]
+    next_cursor: str | None = None
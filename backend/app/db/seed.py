@@ -1,5 +1,6 @@
 from sqlalchemy import select
 
+from app.core.rbac import invalidate_permissions
 from app.core.security import get_password_hash
 from app.db.models import Permission, Role, RolePermission, User, UserRole
 from app.db.session import SessionLocal
@@ -76,6 +77,7 @@ def main() -> None:
             if link is None:
                 db.add(UserRole(user_id=admin.id, role_id=admin_role.id))
                 db.commit()
+        invalidate_permissions()
         print("Seed complete. Admin user: admin / admin123!")
     finally:
         db.close()
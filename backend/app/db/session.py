@@ -1,9 +1,113 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
 from app.core.config import get_settings
+from app.db.instrumentation import instrument_engine
+from app.db.routing import (
+    LocalWriterMarks,
+    RecentWriters,
+    RedisWriterMarks,
+    ReplicaSet,
+    RoutingSession,
+)
 
 settings = get_settings()
 
-engine = create_engine(settings.db_url, pool_pre_ping=True)
+_ASYNC_DRIVERS = {"mysql": "mysql+aiomysql", "sqlite": "sqlite+aiosqlite"}
+
+
+def async_db_url(db_url: str) -> URL:
+    """The async counterpart of a sync URL (pymysql -> aiomysql, pysqlite -> aiosqlite)."""
+    url = make_url(db_url)
+    return url.set(drivername=_ASYNC_DRIVERS.get(url.get_backend_name(), url.drivername))
+
+
+def _engine_options(url: URL) -> dict:
+    options: dict = {"pool_pre_ping": True}
+    if url.get_backend_name() != "sqlite":
+        options.update(
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_timeout=settings.db_pool_timeout_seconds,
+            pool_recycle=settings.db_pool_recycle_seconds,
+        )
+    return options
+
+
+def _apply_statement_timeout(sync_engine) -> None:
+    timeout_ms = settings.db_statement_timeout_ms
+    if timeout_ms <= 0 or sync_engine.dialect.name != "mysql":
+        return
+
+    @event.listens_for(sync_engine, "connect")
+    def _set_timeout(dbapi_connection, _record) -> None:
+        # MySQL aborts read-only SELECTs that run longer than this.
+        cursor = dbapi_connection.cursor()
+        cursor.execute(f"SET SESSION max_execution_time = {int(timeout_ms)}")
+        cursor.close()
+
+
+def _prepare(sync_engine) -> None:
+    _apply_statement_timeout(sync_engine)
+    instrument_engine(sync_engine)
+
+
+_sync_url = make_url(settings.db_url)
+engine = create_engine(_sync_url, **_engine_options(_sync_url))
+_prepare(engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+_async_url = (
+    make_url(settings.async_db_url) if settings.async_db_url else async_db_url(settings.db_url)
+)
+async_engine = create_async_engine(_async_url, **_engine_options(_async_url))
+_prepare(async_engine.sync_engine)
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+
+
+# Optional read replicas (DB_REPLICA_URLS, comma-separated sync URLs). Each gets a sync and an
+# async engine; the monitor probes lag through the sync one.
+_replicas = []
+for _index, _url in enumerate(u.strip() for u in settings.db_replica_urls.split(",") if u.strip()):
+    _replica_url = make_url(_url)
+    _replica_sync = create_engine(_replica_url, **_engine_options(_replica_url))
+    _replica_async = create_async_engine(
+        async_db_url(_url), **_engine_options(async_db_url(_url))
+    )
+    _prepare(_replica_sync)
+    _prepare(_replica_async.sync_engine)
+    _name = f"replica{_index}@{_replica_url.host or _replica_url.database}"
+    _replicas.append((_name, _replica_sync, _replica_async.sync_engine))
+
+# Every engine with a connection pool, by the name its pool gauges are reported under.
+pooled_engines = {"primary": engine, "primary_async": async_engine.sync_engine}
+for _name, _replica_sync, _replica_async_bind in _replicas:
+    pooled_engines[_name] = _replica_sync
+    pooled_engines[f"{_name}_async"] = _replica_async_bind
+
+replicas = ReplicaSet(
+    _replicas,
+    max_lag_seconds=settings.db_replica_max_lag_seconds,
+    check_seconds=settings.db_replica_check_seconds,
+)
+recent_writers = RecentWriters(
+    settings.db_read_your_writes_seconds,
+    RedisWriterMarks(settings.redis_url)
+    if settings.read_your_writes_backend == "redis"
+    else LocalWriterMarks(),
+)
+
+ReadSessionLocal = sessionmaker(
+    class_=RoutingSession, autocommit=False, autoflush=False, bind=engine
+)
+AsyncReadSessionLocal = async_sessionmaker(
+    async_engine,
+    class_=AsyncSession,
+    sync_session_class=RoutingSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
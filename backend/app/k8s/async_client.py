@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import asyncio
+import ssl
+import threading
+import time
+from collections.abc import AsyncIterator
+
+import httpx
+from kubernetes.client import ApiClient, Configuration
+
+from app.core.config import get_settings
+from app.core.telemetry import time_upstream
+
+NAMESPACED_PATHS = {
+    "deployments": "/apis/apps/v1/namespaces/{namespace}/deployments",
+    "statefulsets": "/apis/apps/v1/namespaces/{namespace}/statefulsets",
+    "daemonsets": "/apis/apps/v1/namespaces/{namespace}/daemonsets",
+    "pods": "/api/v1/namespaces/{namespace}/pods",
+    "events": "/api/v1/namespaces/{namespace}/events",
+}
+
+CLUSTER_PATHS = {
+    "deployments": "/apis/apps/v1/deployments",
+    "statefulsets": "/apis/apps/v1/statefulsets",
+    "daemonsets": "/apis/apps/v1/daemonsets",
+    "pods": "/api/v1/pods",
+    "events": "/api/v1/events",
+}
+
+
+def _ssl_context(cfg: Configuration) -> ssl.SSLContext | bool:
+    if not cfg.verify_ssl:
+        return False
+    context = ssl.create_default_context(cafile=cfg.ssl_ca_cert)
+    if cfg.cert_file:
+        context.load_cert_chain(cfg.cert_file, cfg.key_file)
+    return context
+
+
+class AsyncKubeClient:
+    """Minimal httpx-based reader for the Kubernetes API, sharing the sync client's credentials."""
+
+    def __init__(
+        self,
+        configuration: Configuration,
+        timeout: float,
+        max_connections: int,
+        cluster_id: int | None = None,
+    ) -> None:
+        self.configuration = configuration
+        self.timeout = timeout
+        self.cluster_label = "" if cluster_id is None else str(cluster_id)
+        self._http = httpx.AsyncClient(
+            base_url=configuration.host,
+            verify=_ssl_context(configuration),
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=max_connections),
+        )
+
+    def _headers(self) -> dict[str, str]:
+        headers = {"Accept": "application/json"}
+        token = self.configuration.get_api_key_with_prefix("BearerToken", alias="authorization")
+        if token:
+            headers["Authorization"] = token
+        elif self.configuration.username:
+            headers["Authorization"] = self.configuration.get_basic_auth_token()
+        return headers
+
+    async def _get(self, path: str, params: dict | None, timeout: float | None) -> httpx.Response:
+        with time_upstream("kubernetes", self.cluster_label, "GET"):
+            response = await self._http.get(
+                path,
+                params={k: v for k, v in (params or {}).items() if v is not None},
+                headers=self._headers(),
+                timeout=timeout or self.timeout,
+            )
+            response.raise_for_status()
+        return response
+
+    async def get_json(
+        self, path: str, params: dict | None = None, timeout: float | None = None
+    ) -> dict:
+        return (await self._get(path, params, timeout)).json()
+
+    async def list_namespaced(
+        self, kind: str, namespace: str, params: dict | None = None, timeout: float | None = None
+    ) -> dict:
+        try:
+            path = NAMESPACED_PATHS[kind].format(namespace=namespace)
+        except KeyError as exc:
+            raise ValueError(f"Unsupported resource kind: {kind}") from exc
+        return await self.get_json(path, params, timeout)
+
+    async def list_all_namespaces(
+        self, kind: str, params: dict | None = None, timeout: float | None = None
+    ) -> dict:
+        try:
+            path = CLUSTER_PATHS[kind]
+        except KeyError as exc:
+            raise ValueError(f"Unsupported resource kind: {kind}") from exc
+        return await self.get_json(path, params, timeout)
+
+    async def read_pod_log(
+        self, namespace: str, name: str, params: dict | None = None, timeout: float | None = None
+    ) -> str:
+        path = f"/api/v1/namespaces/{namespace}/pods/{name}/log"
+        return (await self._get(path, params, timeout)).text
+
+    async def stream_pod_log(
+        self, namespace: str, name: str, params: dict, lines: bool = False
+    ) -> AsyncIterator[bytes | str]:
+        """Yield log chunks (or lines) as they arrive; closing the iterator closes the upstream.
+
+        The first item is always empty and arrives as soon as the API server has accepted the
+        request, so callers can report errors before a quiet followed log sends anything.
+        """
+        path = f"/api/v1/namespaces/{namespace}/pods/{name}/log"
+        # A followed log has no natural end, so only the connect phase gets a deadline.
+        timeout = httpx.Timeout(self.timeout, read=None if params.get("follow") else self.timeout)
+        async with self._http.stream(
+            "GET",
+            path,
+            params={k: v for k, v in params.items() if v is not None},
+            headers=self._headers(),
+            timeout=timeout,
+        ) as response:
+            response.raise_for_status()
+            yield "" if lines else b""
+            chunks = response.aiter_lines() if lines else response.aiter_raw()
+            async for chunk in chunks:
+                yield chunk
+
+    async def aclose(self) -> None:
+        await self._http.aclose()
+
+
+class AsyncClientRegistry:
+    """One AsyncKubeClient per pooled sync ApiClient, rebuilt when the pool hands out a new one.
+
+    Clients unused for ``idle_seconds`` are closed, like their sync counterparts.
+    """
+
+    def __init__(self, timeout: float, max_connections: int, idle_seconds: float) -> None:
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.idle_seconds = idle_seconds
+        self._entries: dict[int, tuple[ApiClient, AsyncKubeClient, float]] = {}
+        self._lock = threading.Lock()
+        self._closing: set[asyncio.Task] = set()
+
+    def get(self, cluster_id: int, api_client: ApiClient) -> AsyncKubeClient:
+        now = time.monotonic()
+        with self._lock:
+            stale = [
+                self._entries.pop(key)[1]
+                for key, (_, _, last_used) in list(self._entries.items())
+                if key != cluster_id and now - last_used > self.idle_seconds
+            ]
+            entry = self._entries.get(cluster_id)
+            if entry is not None and entry[0] is api_client:
+                client = entry[1]
+            else:
+                if entry is not None:
+                    stale.append(entry[1])
+                client = AsyncKubeClient(
+                    api_client.configuration, self.timeout, self.max_connections, cluster_id
+                )
+            self._entries[cluster_id] = (api_client, client, now)
+        for old in stale:
+            self._close(old)
+        return client
+
+    def _close(self, client: AsyncKubeClient) -> None:
+        # Keep a reference until the close finishes; the loop only holds tasks weakly.
+        task = asyncio.get_running_loop().create_task(client.aclose())
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+
+async def gather_with_timeout(*calls, timeout: float) -> list:
+    """Run independent calls concurrently; each result is either a value or the raised exception."""
+
+    async def _bounded(call):
+        return await asyncio.wait_for(call, timeout)
+
+    return await asyncio.gather(*(_bounded(call) for call in calls), return_exceptions=True)
+
+
+_settings = get_settings()
+async_clients = AsyncClientRegistry(
+    timeout=_settings.k8s_request_timeout_seconds,
+    max_connections=_settings.k8s_connection_pool_maxsize,
+    idle_seconds=_settings.k8s_client_idle_seconds,
+)
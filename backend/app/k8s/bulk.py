@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import threading
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import UTC, datetime
+
+from kubernetes.client import ApiClient
+
+from app.core.config import get_settings
+from app.db.schemas import BulkOperation
+from app.k8s.client import apps_v1, core_v1
+
+# Shared by every bulk request, so concurrent requests cannot multiply the thread count.
+_executor = ThreadPoolExecutor(
+    max_workers=max(1, get_settings().k8s_bulk_max_workers), thread_name_prefix="k8s-bulk"
+)
+
+# action -> (namespace policy / audit action, audited resource kind)
+BULK_ACTIONS = {
+    "scale": ("k8s.scale", "deployment"),
+    "rollout_restart": ("k8s.rollout_restart", "deployment"),
+    "delete_pod": ("k8s.delete_pod", "pod"),
+}
+
+
+def restart_patch() -> dict:
+    restarted_at = datetime.now(UTC).isoformat()
+    return {
+        "spec": {
+            "template": {
+                "metadata": {"annotations": {"kubectl.kubernetes.io/restartedAt": restarted_at}}
+            }
+        }
+    }
+
+
+def apply_operation(api_client: ApiClient, operation: BulkOperation) -> None:
+    # Responses are never inspected, so skip deserializing them into client models; the body
+    # still has to be drained for the connection to go back to the pool.
+    if operation.action == "scale":
+        response = apps_v1(api_client).patch_namespaced_deployment_scale(
+            name=operation.name,
+            namespace=operation.namespace,
+            body={"spec": {"replicas": operation.replicas}},
+            _preload_content=False,
+        )
+    elif operation.action == "rollout_restart":
+        response = apps_v1(api_client).patch_namespaced_deployment(
+            name=operation.name,
+            namespace=operation.namespace,
+            body=restart_patch(),
+            _preload_content=False,
+        )
+    elif operation.action == "delete_pod":
+        response = core_v1(api_client).delete_namespaced_pod(
+            name=operation.name,
+            namespace=operation.namespace,
+            grace_period_seconds=20,
+            _preload_content=False,
+        )
+    else:
+        raise ValueError(f"Unsupported bulk action: {operation.action}")
+    response.read()
+    response.release_conn()
+
+
+@dataclass
+class BulkItem:
+    index: int
+    operation: BulkOperation
+    status: str = "pending"
+    error: str | None = None
+
+
+def run_bulk(
+    batches: list[tuple[ApiClient, list[BulkItem]]],
+    concurrency: int,
+) -> None:
+    """Apply every batch against its cluster, ``concurrency`` patches at a time per cluster.
+
+    Each cluster gets up to ``concurrency`` lanes that take its items in turn; the lanes run on a
+    process-wide pool of K8S_BULK_MAX_WORKERS threads. Results are recorded on the items
+    themselves; a failing item never stops the others.
+    """
+
+    def _lane(api_client: ApiClient, items: Iterator[BulkItem], lock: threading.Lock) -> None:
+        while True:
+            with lock:
+                item = next(items, None)
+            if item is None:
+                return
+            try:
+                apply_operation(api_client, item.operation)
+                item.status = "success"
+            except Exception as exc:
+                item.status = "failed"
+                item.error = (str(exc) or type(exc).__name__)[:255]
+
+    futures = []
+    for api_client, items in batches:
+        queue, lock = iter(items), threading.Lock()
+        for _ in range(max(1, min(concurrency, len(items)))):
+            futures.append(_executor.submit(_lane, api_client, queue, lock))
+    for future in futures:
+        future.result()
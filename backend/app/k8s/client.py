@@ -1,14 +1,27 @@
 from __future__ import annotations
 
+import hashlib
+import json
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
 from kubernetes import client
 from kubernetes.client import ApiClient
 from kubernetes.config.kube_config import KubeConfigLoader
 
+from app.core.config import get_settings
+from app.core.crypto import SecretCrypto
+from app.core.telemetry import instrument_api_client
+from app.k8s.utils import parse_kubeconfig
+
 
 def api_client_from_kubeconfig(kubeconfig_dict: dict) -> ApiClient:
     cfg = client.Configuration()
     loader = KubeConfigLoader(config_dict=kubeconfig_dict)
     loader.load_and_set(cfg)
+    cfg.connection_pool_maxsize = get_settings().k8s_connection_pool_maxsize
     return ApiClient(configuration=cfg)
 
 
@@ -18,3 +31,156 @@ def core_v1(api_client: ApiClient) -> client.CoreV1Api:
 
 def apps_v1(api_client: ApiClient) -> client.AppsV1Api:
     return client.AppsV1Api(api_client)
+
+
+RESOURCE_LISTERS: dict[str, tuple[Callable[[ApiClient], object], str]] = {
+    "deployments": (apps_v1, "list_namespaced_deployment"),
+    "statefulsets": (apps_v1, "list_namespaced_stateful_set"),
+    "daemonsets": (apps_v1, "list_namespaced_daemon_set"),
+    "pods": (core_v1, "list_namespaced_pod"),
+    "events": (core_v1, "list_namespaced_event"),
+}
+
+
+def namespaced_lister(api_client: ApiClient, kind: str) -> Callable:
+    try:
+        api_factory, method = RESOURCE_LISTERS[kind]
+    except KeyError as exc:
+        raise ValueError(f"Unsupported resource kind: {kind}") from exc
+    return getattr(api_factory(api_client), method)
+
+
+def list_namespaced_raw(api_client: ApiClient, kind: str, namespace: str, **params) -> dict:
+    """List a namespaced resource as plain JSON, skipping client model deserialization."""
+    response = namespaced_lister(api_client, kind)(namespace, _preload_content=False, **params)
+    return json.loads(response.data)
+
+
+def kubeconfig_fingerprint(kubeconfig_ref: str) -> str:
+    return hashlib.sha256(kubeconfig_ref.encode()).hexdigest()
+
+
+@dataclass
+class _PooledClient:
+    fingerprint: str
+    api_client: ApiClient
+    last_used: float = field(default_factory=time.monotonic)
+
+
+class ClusterClientRegistry:
+    """Keeps one long-lived ApiClient per cluster.
+
+    Entries are keyed by cluster id and a fingerprint of the stored (encrypted) kubeconfig, so a
+    changed cluster row is detected without decrypting anything on the hot path.
+    """
+
+    def __init__(
+        self,
+        idle_seconds: float,
+        max_clients: int,
+        factory: Callable[[dict], ApiClient] = api_client_from_kubeconfig,
+        on_create: Callable[[int, ApiClient], None] | None = None,
+    ) -> None:
+        self.idle_seconds = idle_seconds
+        self.max_clients = max_clients
+        self._factory = factory
+        self._on_create = on_create
+        self._entries: dict[int, _PooledClient] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(
+        self,
+        cluster_id: int,
+        kubeconfig_ref: str,
+        load_kubeconfig: Callable[[], dict],
+    ) -> ApiClient:
+        fingerprint = kubeconfig_fingerprint(kubeconfig_ref)
+        now = time.monotonic()
+        with self._lock:
+            self._evict_idle(now)
+            entry = self._entries.get(cluster_id)
+            if entry is not None and entry.fingerprint == fingerprint:
+                entry.last_used = now
+                self.hits += 1
+                return entry.api_client
+            self.misses += 1
+
+        # Decrypt and build outside the lock; a concurrent miss for the same cluster just
+        # produces a client that loses the race below and is closed.
+        api_client = self._factory(load_kubeconfig())
+        if self._on_create is not None:
+            self._on_create(cluster_id, api_client)
+        with self._lock:
+            current = self._entries.get(cluster_id)
+            if current is not None and current.fingerprint == fingerprint:
+                _close(api_client)
+                current.last_used = now
+                return current.api_client
+            if current is not None:
+                self._drop(cluster_id)
+            self._entries[cluster_id] = _PooledClient(fingerprint, api_client)
+            while len(self._entries) > self.max_clients:
+                lru = min(self._entries, key=lambda key: self._entries[key].last_used)
+                self._drop(lru)
+            return api_client
+
+    def invalidate(self, cluster_id: int) -> None:
+        with self._lock:
+            if cluster_id in self._entries:
+                self._drop(cluster_id)
+
+    def clear(self) -> None:
+        with self._lock:
+            for cluster_id in list(self._entries):
+                self._drop(cluster_id)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_clients": self.max_clients,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "clusters": sorted(self._entries),
+            }
+
+    def _evict_idle(self, now: float) -> None:
+        expired = [
+            cluster_id
+            for cluster_id, entry in self._entries.items()
+            if now - entry.last_used > self.idle_seconds
+        ]
+        for cluster_id in expired:
+            self._drop(cluster_id)
+
+    def _drop(self, cluster_id: int) -> None:
+        entry = self._entries.pop(cluster_id)
+        self.evictions += 1
+        _close(entry.api_client)
+
+
+def _close(api_client: ApiClient) -> None:
+    try:
+        api_client.close()
+    except Exception:
+        pass
+
+
+_settings = get_settings()
+cluster_clients = ClusterClientRegistry(
+    idle_seconds=_settings.k8s_client_idle_seconds,
+    max_clients=_settings.k8s_client_pool_max,
+    on_create=instrument_api_client,
+)
+
+
+def cluster_api_client(cluster_id: int, kubeconfig_ref: str) -> ApiClient:
+    def _load() -> dict:
+        crypto = SecretCrypto(get_settings().fernet_key)
+        return parse_kubeconfig(crypto.decrypt(kubeconfig_ref))
+
+    return cluster_clients.get(cluster_id, kubeconfig_ref, _load)
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass
+class ClusterTarget:
+    cluster_id: int
+    name: str
+    client: Any
+
+
+def parse_label_selector(selector: str | None) -> dict[str, str]:
+    if not selector:
+        return {}
+    labels = {}
+    for part in selector.split(","):
+        key, sep, value = part.partition("=")
+        if not sep or not key.strip():
+            raise ValueError(f"Invalid cluster label selector: {part!r}")
+        labels[key.strip()] = value.strip()
+    return labels
+
+
+def matches_labels(labels: dict, selector: dict[str, str]) -> bool:
+    return all(str(labels.get(key)) == value for key, value in selector.items())
+
+
+async def fan_out(
+    targets: list[ClusterTarget],
+    call: Callable[[ClusterTarget], Awaitable[Any]],
+    concurrency: int,
+    deadline: float,
+) -> list[dict]:
+    """Run ``call`` against every cluster with bounded concurrency and a per-cluster deadline.
+
+    Never raises for a single cluster: each result carries its own status and latency so callers
+    can return partial answers.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def _one(target: ClusterTarget) -> dict:
+        async with semaphore:
+            started = time.perf_counter()
+            result: dict = {"cluster_id": target.cluster_id, "cluster": target.name}
+            try:
+                result["data"] = await asyncio.wait_for(call(target), deadline)
+                result["status"] = "ok"
+            except TimeoutError:
+                result["status"] = "timeout"
+            except Exception as exc:
+                result["status"] = "error"
+                result["error"] = (str(exc) or type(exc).__name__)[:255]
+            result["latency_ms"] = round((time.perf_counter() - started) * 1000, 1)
+            return result
+
+    return list(await asyncio.gather(*(_one(target) for target in targets)))
@@ -0,0 +1,300 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections.abc import Callable
+
+from kubernetes import watch
+from kubernetes.client import ApiClient
+from kubernetes.client.rest import ApiException
+
+from app.core.config import get_settings
+from app.k8s.client import list_namespaced_raw, namespaced_lister
+from app.k8s.watch import WatchEvent
+
+logger = logging.getLogger(__name__)
+
+EventHandler = Callable[[WatchEvent], None]
+
+
+def _object_name(obj: dict) -> str:
+    return obj.get("metadata", {}).get("name", "")
+
+
+def _object_version(obj: dict) -> str:
+    return obj.get("metadata", {}).get("resourceVersion", "")
+
+
+class ResourceInformer:
+    """List+watch mirror of one resource kind in one namespace of one cluster."""
+
+    def __init__(
+        self,
+        cluster_id: int,
+        namespace: str,
+        kind: str,
+        api_client: ApiClient,
+        watch_timeout_seconds: int,
+        list_timeout_seconds: float | None = None,
+    ) -> None:
+        self.cluster_id = cluster_id
+        self.namespace = namespace
+        self.kind = kind
+        self.api_client = api_client
+        self.watch_timeout_seconds = watch_timeout_seconds
+        self.list_timeout_seconds = list_timeout_seconds
+        self.resource_version = ""
+        self.last_read = time.monotonic()
+        self._objects: dict[str, dict] = {}
+        self._handlers: list[EventHandler] = []
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._watch: watch.Watch | None = None
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        self.relist()
+        self._thread = threading.Thread(
+            target=self._run,
+            name=f"informer-{self.cluster_id}-{self.namespace}-{self.kind}",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._watch is not None:
+            self._watch.stop()
+
+    @property
+    def running(self) -> bool:
+        return not self._stopped.is_set()
+
+    @property
+    def size(self) -> int:
+        return len(self._objects)
+
+    @property
+    def has_handlers(self) -> bool:
+        return bool(self._handlers)
+
+    def items(self) -> list[dict]:
+        self.last_read = time.monotonic()
+        with self._lock:
+            return list(self._objects.values())
+
+    def add_handler(self, handler: EventHandler) -> None:
+        with self._lock:
+            self._handlers.append(handler)
+
+    def remove_handler(self, handler: EventHandler) -> None:
+        with self._lock:
+            if handler in self._handlers:
+                self._handlers.remove(handler)
+
+    def relist(self) -> None:
+        body = list_namespaced_raw(
+            self.api_client,
+            self.kind,
+            self.namespace,
+            _request_timeout=self.list_timeout_seconds,
+        )
+        fresh = {_object_name(obj): obj for obj in body.get("items", [])}
+        resource_version = body.get("metadata", {}).get("resourceVersion", "")
+        with self._lock:
+            previous = self._objects
+            self._objects = fresh
+            self.resource_version = resource_version
+        for name, obj in fresh.items():
+            if name not in previous:
+                self._emit("ADDED", obj)
+            elif _object_version(previous[name]) != _object_version(obj):
+                self._emit("MODIFIED", obj)
+        for name, obj in previous.items():
+            if name not in fresh:
+                self._emit("DELETED", obj)
+
+    def apply(self, event_type: str, obj: dict) -> None:
+        name = _object_name(obj)
+        with self._lock:
+            if event_type == "DELETED":
+                self._objects.pop(name, None)
+            elif event_type in ("ADDED", "MODIFIED"):
+                self._objects[name] = obj
+            self.resource_version = _object_version(obj) or self.resource_version
+        if event_type != "BOOKMARK":
+            self._emit(event_type, obj)
+
+    def _emit(self, event_type: str, obj: dict) -> None:
+        if not self._handlers:
+            return
+        event = WatchEvent(
+            cluster_id=self.cluster_id,
+            namespace=self.namespace,
+            resource_type=self.kind,
+            resource_name=_object_name(obj),
+            payload=obj,
+            event_type=event_type,
+            resource_version=_object_version(obj),
+        )
+        for handler in list(self._handlers):
+            try:
+                handler(event)
+            except Exception:
+                logger.exception("Informer handler failed for %s/%s", self.namespace, self.kind)
+
+    def _run(self) -> None:
+        backoff = 1.0
+        while not self._stopped.is_set():
+            self._watch = watch.Watch()
+            try:
+                for event in self._watch.stream(
+                    namespaced_lister(self.api_client, self.kind),
+                    self.namespace,
+                    resource_version=self.resource_version,
+                    timeout_seconds=self.watch_timeout_seconds,
+                    allow_watch_bookmarks=True,
+                ):
+                    if self._stopped.is_set():
+                        break
+                    self.apply(event["type"], event["raw_object"])
+                backoff = 1.0
+            except ApiException as exc:
+                if self._stopped.is_set():
+                    break
+                if exc.status == 410:
+                    # resourceVersion too old: fall back to a fresh list before watching again.
+                    try:
+                        self.relist()
+                        continue
+                    except Exception:
+                        logger.warning(
+                            "Informer relist failed for %s/%s", self.namespace, self.kind
+                        )
+                self._stopped.wait(backoff)
+                backoff = min(backoff * 2, 30.0)
+            except Exception:
+                if self._stopped.is_set():
+                    break
+                logger.warning("Informer watch failed for %s/%s", self.namespace, self.kind)
+                self._stopped.wait(backoff)
+                backoff = min(backoff * 2, 30.0)
+
+
+class InformerCache:
+    """Starts informers lazily on first read and stops the ones nobody reads any more."""
+
+    def __init__(
+        self, idle_seconds: float, watch_timeout_seconds: int, list_timeout_seconds: float
+    ) -> None:
+        self.idle_seconds = idle_seconds
+        self.watch_timeout_seconds = watch_timeout_seconds
+        self.list_timeout_seconds = list_timeout_seconds
+        self._informers: dict[tuple[int, str, str], ResourceInformer] = {}
+        self._starting: dict[tuple[int, str, str], threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def get(
+        self,
+        cluster_id: int,
+        namespace: str,
+        kind: str,
+        api_client: ApiClient,
+    ) -> ResourceInformer:
+        key = (cluster_id, namespace, kind)
+        with self._lock:
+            self._evict_idle()
+            informer = self._informers.get(key)
+            if informer is not None and informer.api_client is api_client and informer.running:
+                return informer
+            start_lock = self._starting.setdefault(key, threading.Lock())
+
+        # Only one request performs the initial list for a key; the others wait for it. Both the
+        # list and the wait are bounded, so a hung API server cannot pin threadpool threads.
+        if not start_lock.acquire(timeout=self.list_timeout_seconds):
+            raise TimeoutError(f"Initial list of {namespace}/{kind} is still running")
+        try:
+            with self._lock:
+                current = self._informers.get(key)
+                if current is not None and current.api_client is api_client and current.running:
+                    return current
+            fresh = ResourceInformer(
+                cluster_id,
+                namespace,
+                kind,
+                api_client,
+                self.watch_timeout_seconds,
+                self.list_timeout_seconds,
+            )
+            fresh.start()
+            with self._lock:
+                stale = self._informers.get(key)
+                self._informers[key] = fresh
+            if stale is not None:
+                stale.stop()
+            return fresh
+        finally:
+            start_lock.release()
+
+    def peek(
+        self, cluster_id: int, namespace: str, kind: str, api_client: ApiClient
+    ) -> ResourceInformer | None:
+        """Return the informer only if it is already synced, without ever blocking on a list."""
+        with self._lock:
+            informer = self._informers.get((cluster_id, namespace, kind))
+        if informer is not None and informer.api_client is api_client and informer.running:
+            return informer
+        return None
+
+    def items(
+        self, cluster_id: int, namespace: str, kind: str, api_client: ApiClient
+    ) -> list[dict]:
+        return self.get(cluster_id, namespace, kind, api_client).items()
+
+    def invalidate(self, cluster_id: int) -> None:
+        with self._lock:
+            keys = [key for key in self._informers if key[0] == cluster_id]
+            stale = [self._informers.pop(key) for key in keys]
+            self._prune_start_locks()
+        for informer in stale:
+            informer.stop()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "informers": len(self._informers),
+                "items": [
+                    {
+                        "cluster_id": informer.cluster_id,
+                        "namespace": informer.namespace,
+                        "kind": informer.kind,
+                        "resource_version": informer.resource_version,
+                        "objects": informer.size,
+                    }
+                    for informer in self._informers.values()
+                ],
+            }
+
+    def _evict_idle(self) -> None:
+        now = time.monotonic()
+        for key, informer in list(self._informers.items()):
+            if not informer.has_handlers and now - informer.last_read > self.idle_seconds:
+                del self._informers[key]
+                informer.stop()
+        self._prune_start_locks()
+
+    def _prune_start_locks(self) -> None:
+        # Start locks of keys with no informer, e.g. evicted or failed to list, unless a start
+        # is running; otherwise every key ever read would keep one for the life of the process.
+        for key, start_lock in list(self._starting.items()):
+            if key not in self._informers and not start_lock.locked():
+                del self._starting[key]
+
+
+_settings = get_settings()
+informers = InformerCache(
+    idle_seconds=_settings.k8s_informer_idle_seconds,
+    watch_timeout_seconds=_settings.k8s_informer_watch_timeout_seconds,
+    list_timeout_seconds=_settings.k8s_request_timeout_seconds,
+)
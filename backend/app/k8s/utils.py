@@ -1,3 +1,4 @@
+import base64
 import json
 
 
@@ -6,3 +7,40 @@ def parse_kubeconfig(raw: str) -> dict:
         return json.loads(raw)
     except json.JSONDecodeError as exc:
         raise ValueError("kubeconfig must be valid JSON for this scaffold") from exc
+
+
+def parse_fields(fields: str | None) -> list[str]:
+    if not fields:
+        return []
+    return [f.strip() for f in fields.split(",") if f.strip()]
+
+
+def project_fields(obj: dict, fields: list[str]) -> dict:
+    """Pick dotted paths (e.g. ``status.phase``) out of a raw object into a flat dict."""
+    projected = {}
+    for path in fields:
+        value = obj
+        for part in path.split("."):
+            value = value.get(part) if isinstance(value, dict) else None
+            if value is None:
+                break
+        projected[path] = value
+    return projected
+
+
+def encode_cursor(tokens: dict[str, str]) -> str | None:
+    if not tokens:
+        return None
+    return base64.urlsafe_b64encode(json.dumps(tokens, separators=(",", ":")).encode()).decode()
+
+
+def decode_cursor(cursor: str | None) -> dict[str, str]:
+    if not cursor:
+        return {}
+    try:
+        tokens = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (ValueError, json.JSONDecodeError) as exc:
+        raise ValueError("Invalid cursor") from exc
+    if not isinstance(tokens, dict):
+        raise ValueError("Invalid cursor")
+    return {str(k): str(v) for k, v in tokens.items()}
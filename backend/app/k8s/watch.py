@@ -1,3 +1,7 @@
+from __future__ import annotations
+
+import asyncio
+import threading
 from dataclasses import dataclass
 
 
@@ -8,3 +12,50 @@ class WatchEvent:
     resource_type: str
     resource_name: str
     payload: dict
+    event_type: str = "MODIFIED"
+    resource_version: str = ""
+
+
+class WatchSubscription:
+    """Collects informer events for one subscriber and hands them out in batches.
+
+    Events arrive on informer threads and are drained on the event loop. Pending events are keyed
+    by object, so a burst of updates to one object collapses to its latest state. When more than
+    ``max_pending`` objects are waiting (a slow consumer) the backlog is dropped and the subscriber
+    is told to take a fresh snapshot instead.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, max_pending: int) -> None:
+        self.max_pending = max_pending
+        self._loop = loop
+        self._pending: dict[tuple[str, str], WatchEvent] = {}
+        self._overflowed = False
+        self._lock = threading.Lock()
+        self._ready = asyncio.Event()
+
+    def push(self, event: WatchEvent) -> None:
+        with self._lock:
+            if self._overflowed:
+                return
+            self._pending[(event.resource_type, event.resource_name)] = event
+            if len(self._pending) > self.max_pending:
+                self._pending.clear()
+                self._overflowed = True
+        self._loop.call_soon_threadsafe(self._ready.set)
+
+    async def wait(self, timeout: float) -> bool:
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout)
+            return True
+        except TimeoutError:
+            return False
+
+    def drain(self) -> tuple[list[WatchEvent], bool]:
+        """Return the pending events and whether a snapshot is needed instead."""
+        with self._lock:
+            events = list(self._pending.values())
+            overflowed = self._overflowed
+            self._pending = {}
+            self._overflowed = False
+            self._ready.clear()
+        return events, overflowed
@@ -1,4 +1,13 @@
-from fastapi import FastAPI
+import asyncio
+import logging
+import secrets
+import time
+
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, Response
+from prometheus_client import CONTENT_TYPE_LATEST
+from sqlalchemy import text
 
 from app.api import (
     admin,
@@ -15,16 +24,84 @@ from app.api import (
     rbac,
     spark,
 )
+from app.core.audit import audit_writer
+from app.core.celery_client import celery_app
+from app.core.config import get_settings
+from app.core.telemetry import (
+    HTTP_IN_FLIGHT,
+    HTTP_REQUEST_SECONDS,
+    RuntimeCollector,
+    metrics_payload,
+    register_collector,
+)
 from app.db.base import Base
-from app.db.session import engine
+from app.db.instrumentation import collect_queries, record_request, stats_headers
+from app.db.pagination import InvalidCursor
+from app.db.session import async_engine, engine, pooled_engines, recent_writers, replicas
 
+logger = logging.getLogger(__name__)
+settings = get_settings()
 app = FastAPI(title="K8s Data Platform Orchestrator API", version="0.1.0")
+register_collector(
+    RuntimeCollector(
+        pooled_engines,
+        audit_writer.stats,
+        replica_stats=replicas.stats if replicas.configured else None,
+    )
+)
 
 
 @app.on_event("startup")
 def startup() -> None:
     # Dev-friendly bootstrap. Production should use Alembic migrations.
     Base.metadata.create_all(bind=engine)
+    replicas.start()
+
+
+@app.on_event("shutdown")
+def shutdown() -> None:
+    # Write out audit rows still waiting in the buffer before the process exits.
+    audit_writer.close()
+    replicas.stop()
+
+
+async def remember_writers(request: Request, call_next):
+    # Reads right after a write by the same caller skip replicas that may not have it yet.
+    response = await call_next(request)
+    if request.method not in ("GET", "HEAD", "OPTIONS"):
+        await run_in_threadpool(recent_writers.record, request.headers.get("authorization"))
+    return response
+
+
+if replicas.configured:
+    app.middleware("http")(remember_writers)
+
+
+@app.middleware("http")
+async def observe_request(request: Request, call_next):
+    started = time.perf_counter()
+    status = 500
+    HTTP_IN_FLIGHT.inc()
+    try:
+        with collect_queries() as stats:
+            response = await call_next(request)
+        status = response.status_code
+    finally:
+        HTTP_IN_FLIGHT.dec()
+        # Label by route template so /clusters/1 and /clusters/2 share one series.
+        route = getattr(request.scope.get("route"), "path", "unmatched")
+        HTTP_REQUEST_SECONDS.labels(request.method, route, str(status)).observe(
+            time.perf_counter() - started
+        )
+    record_request(stats, request.method, route)
+    if settings.app_env == "dev":
+        response.headers.update(stats_headers(stats))
+    return response
+
+
+@app.exception_handler(InvalidCursor)
+async def invalid_cursor(_request: Request, _exc: InvalidCursor) -> JSONResponse:
+    return JSONResponse(status_code=400, content={"detail": "Invalid cursor"})
 
 
 @app.get("/health")
@@ -32,9 +109,42 @@ def health() -> dict:
     return {"status": "ok"}
 
 
+def _check_broker() -> None:
+    with celery_app.connection_for_write() as conn:
+        conn.ensure_connection(max_retries=1, timeout=settings.ready_timeout_seconds)
+
+
+async def _check_database() -> None:
+    async with async_engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
+
 @app.get("/ready")
-def ready() -> dict:
-    return {"status": "ready"}
+async def ready() -> JSONResponse:
+    checks = {"database": _check_database(), "broker": asyncio.to_thread(_check_broker)}
+    results = await asyncio.gather(
+        *(asyncio.wait_for(check, settings.ready_timeout_seconds) for check in checks.values()),
+        return_exceptions=True,
+    )
+    status = {}
+    for name, result in zip(checks, results, strict=True):
+        if isinstance(result, BaseException):
+            logger.warning("Readiness check %s failed: %r", name, result)
+        status[name] = "unavailable" if isinstance(result, BaseException) else "ok"
+    is_ready = all(value == "ok" for value in status.values())
+    return JSONResponse(
+        status_code=200 if is_ready else 503,
+        content={"status": "ready" if is_ready else "not ready", "checks": status},
+    )
+
+
+@app.get("/metrics", include_in_schema=False)
+def prometheus_metrics(request: Request) -> Response:
+    if settings.metrics_token and not secrets.compare_digest(
+        request.headers.get("authorization", ""), f"Bearer {settings.metrics_token}"
+    ):
+        raise HTTPException(status_code=401, detail="Invalid metrics token")
+    return Response(metrics_payload(), media_type=CONTENT_TYPE_LATEST)
 
 
 app.include_router(auth.router)
@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import ColumnElement, Select, and_, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from app.db.models import ObservedResource, ResourceIntent, ResourceRun
+from app.db.pagination import decode_id_cursor, naive_utc, split_page
+from app.db.schemas import (
+    IntentStatusOut,
+    IntentStatusPage,
+    ResourceIntentPage,
+    ResourceIntentSummary,
+    ResourceRunOut,
+)
+
+_SUMMARY_COLUMNS = (
+    ResourceIntent.id,
+    ResourceIntent.resource_type,
+    ResourceIntent.mode,
+    ResourceIntent.cluster_id,
+    ResourceIntent.namespace,
+    ResourceIntent.status,
+    ResourceIntent.created_at,
+)
+
+
+class IntentFilters:
+    def __init__(
+        self,
+        cluster_id: int | None = None,
+        namespace: str | None = None,
+        status: str | None = None,
+        since: datetime | None = None,
+        until: datetime | None = None,
+    ) -> None:
+        self.cluster_id = cluster_id
+        self.namespace = namespace
+        self.status = status
+        self.since = naive_utc(since)
+        self.until = naive_utc(until)
+
+    def apply(self, stmt: Select) -> Select:
+        if self.cluster_id is not None:
+            stmt = stmt.where(ResourceIntent.cluster_id == self.cluster_id)
+        if self.namespace:
+            stmt = stmt.where(ResourceIntent.namespace == self.namespace)
+        if self.status:
+            stmt = stmt.where(ResourceIntent.status == self.status)
+        if self.since is not None:
+            stmt = stmt.where(ResourceIntent.created_at >= self.since)
+        if self.until is not None:
+            stmt = stmt.where(ResourceIntent.created_at < self.until)
+        return stmt
+
+
+# Where each intent type keeps the name its observed resource is recorded under, and the
+# name the status endpoints fall back to when the spec has none.
+OBSERVED_NAME_PATHS = {
+    "sparkapplication": (("metadata", "name"), "spark-app"),
+    "kafka": (("name",), "kafka-cluster"),
+}
+
+
+def observed_name(resource_type: str) -> ColumnElement[str]:
+    path, default = OBSERVED_NAME_PATHS[resource_type]
+    return func.coalesce(ResourceIntent.spec_json[path].as_string(), default)
+
+
+async def list_intents(
+    db: AsyncSession,
+    resource_type: str,
+    filters: IntentFilters,
+    *,
+    limit: int,
+    cursor: str | None = None,
+    include_spec: bool = False,
+) -> ResourceIntentPage:
+    """One page of intents of a type, newest first, keyed on id.
+
+    Served by (resource_type, id), or by ix_intents_scope when cluster and namespace are given.
+    ``spec_json`` is left out of the SELECT unless ``include_spec`` is set.
+    """
+    columns = (*_SUMMARY_COLUMNS, ResourceIntent.spec_json) if include_spec else _SUMMARY_COLUMNS
+    stmt = filters.apply(select(*columns).where(ResourceIntent.resource_type == resource_type))
+    if cursor:
+        stmt = stmt.where(ResourceIntent.id < decode_id_cursor(cursor))
+    rows = (await db.execute(stmt.order_by(ResourceIntent.id.desc()).limit(limit + 1))).all()
+    page, next_cursor = split_page(rows, limit, lambda row: (row.id,))
+    return ResourceIntentPage(
+        items=[ResourceIntentSummary.model_validate(row) for row in page],
+        next_cursor=next_cursor,
+    )
+
+
+async def intent_statuses(
+    db: AsyncSession,
+    resource_type: str,
+    filters: IntentFilters,
+    *,
+    intent_ids: list[int] | None = None,
+    limit: int,
+    cursor: str | None = None,
+) -> IntentStatusPage:
+    """Intent status, latest run and observed snapshot for many intents in one statement.
+
+    The latest run is found per intent through the resource_runs.intent_id index, and the
+    observed row through its (cluster_id, namespace, resource_type, resource_name) unique key.
+    """
+    name = observed_name(resource_type).label("resource_name")
+    newer_run = aliased(ResourceRun)
+    latest_run_id = (
+        select(func.max(newer_run.id))
+        .where(newer_run.intent_id == ResourceIntent.id)
+        .correlate(ResourceIntent)
+        .scalar_subquery()
+    )
+    stmt = (
+        select(
+            ResourceIntent.id,
+            ResourceIntent.resource_type,
+            ResourceIntent.cluster_id,
+            ResourceIntent.namespace,
+            ResourceIntent.status,
+            name,
+            ResourceRun,
+            ObservedResource.observed_json,
+            ObservedResource.observed_at,
+        )
+        .select_from(ResourceIntent)
+        .outerjoin(ResourceRun, ResourceRun.id == latest_run_id)
+        .outerjoin(
+            ObservedResource,
+            and_(
+                ObservedResource.cluster_id == ResourceIntent.cluster_id,
+                ObservedResource.namespace == ResourceIntent.namespace,
+                ObservedResource.resource_type == ResourceIntent.resource_type,
+                ObservedResource.resource_name == name,
+            ),
+        )
+        .where(ResourceIntent.resource_type == resource_type)
+    )
+    stmt = filters.apply(stmt)
+    if intent_ids:
+        stmt = stmt.where(ResourceIntent.id.in_(intent_ids))
+    if cursor:
+        stmt = stmt.where(ResourceIntent.id < decode_id_cursor(cursor))
+    rows = (await db.execute(stmt.order_by(ResourceIntent.id.desc()).limit(limit + 1))).all()
+    page, next_cursor = split_page(rows, limit, lambda row: (row.id,))
+    return IntentStatusPage(
+        items=[
+            IntentStatusOut(
+                intent_id=row.id,
+                resource_type=row.resource_type,
+                cluster_id=row.cluster_id,
+                namespace=row.namespace,
+                resource_name=row.resource_name,
+                intent_status=row.status,
+                latest_run=(
+                    ResourceRunOut.model_validate(row.ResourceRun) if row.ResourceRun else None
+                ),
+                observed_status=row.observed_json,
+                observed_at=row.observed_at,
+            )
+            for row in page
+        ],
+        next_cursor=next_cursor,
+    )
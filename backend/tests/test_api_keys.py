@@ -0,0 +1,43 @@
+import pytest
+
+from app.core import rbac
+from app.core.api_keys import (
+    ApiKeyPrincipal,
+    _prefix_of,
+    generate_api_key,
+    hash_api_key,
+    is_api_key,
+)
+from app.core.rbac import (
+    PermissionDenied,
+    embedded_permissions,
+    ensure_any_permission,
+    principal_permissions,
+)
+
+
+def test_generated_key_carries_its_lookup_prefix() -> None:
+    key, prefix, hashed = generate_api_key()
+    assert is_api_key(key)
+    assert _prefix_of(key) == prefix
+    assert hashed == hash_api_key(key) != hash_api_key(key + "x")
+    assert _prefix_of("orch_short_secret") is None
+
+
+def test_api_key_claims_grant_only_the_bound_permissions() -> None:
+    principal = ApiKeyPrincipal(key_id=3, user_id=9, permissions=frozenset({"k8s.read"}), version=0)
+    claims = principal.claims()
+    assert claims["sub"] == "9"
+    # Even with a stale version the key never falls back to its owner's full role set.
+    assert embedded_permissions({**claims, "pv": 12345}) == {"k8s.read"}
+
+
+def test_narrow_api_key_is_denied_what_only_its_owner_holds(monkeypatch) -> None:
+    # The owner is an admin; the key was bound to k8s.write only.
+    monkeypatch.setattr(rbac, "user_permission_set", lambda db, user_id: {"admin.all"})
+    claims = ApiKeyPrincipal(3, 9, frozenset({"k8s.write"}), version=0).claims()
+    perms = principal_permissions(None, None, claims)
+
+    assert perms == {"k8s.write"}
+    with pytest.raises(PermissionDenied):
+        ensure_any_permission(perms, ("spark.deploy",))
@@ -0,0 +1,65 @@
+import threading
+
+from app.core.audit import AuditWriter
+
+
+class _FakeSession:
+    def __init__(self, sink: list[list[dict]], fail: list[int]) -> None:
+        self.sink = sink
+        self.fail = fail
+
+    def __enter__(self) -> "_FakeSession":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        return None
+
+    def execute(self, _stmt, rows: list[dict]) -> None:
+        if self.fail:
+            self.fail.pop()
+            raise RuntimeError("database unavailable")
+        self.sink.append(list(rows))
+
+    def commit(self) -> None:
+        return None
+
+
+def _writer(sink: list, fail: list | None = None, **kwargs) -> AuditWriter:
+    options = {"max_queue": 100, "batch_size": 10, "flush_seconds": 0.05, "retries": 2}
+    options.update(kwargs)
+    return AuditWriter(session_factory=lambda: _FakeSession(sink, fail or []), **options)
+
+
+def test_audit_writer_batches_rows_and_flushes_on_close() -> None:
+    batches: list[list[dict]] = []
+    writer = _writer(batches)
+    threads = [
+        threading.Thread(target=writer.submit, args=([{"action": f"a{i}"}],)) for i in range(25)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert writer.flush(timeout=5)
+    assert sum(len(batch) for batch in batches) == 25
+    assert len(batches) < 25
+
+    writer.close()
+    writer.submit([{"action": "late"}])
+    stats = writer.stats()
+    assert (stats["written"], stats["queue_depth"], stats["overflow_writes"]) == (26, 0, 1)
+
+
+def test_audit_writer_writes_inline_when_full_and_counts_drops() -> None:
+    batches: list[list[dict]] = []
+    writer = _writer(batches, max_queue=1, flush_seconds=10)
+    writer.submit([{"action": "queued"}])
+    writer.submit([{"action": "overflow"}])
+    assert batches == [[{"action": "overflow"}]]
+    writer.close()
+    assert batches[-1] == [{"action": "queued"}]
+
+    failing = _writer([], fail=[1, 1])
+    failing.submit([{"action": "lost"}])
+    failing.flush(timeout=5)
+    assert failing.stats()["dropped"] == 1
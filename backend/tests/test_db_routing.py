@@ -0,0 +1,92 @@
+from sqlalchemy import create_engine, select, text
+from sqlalchemy.orm import sessionmaker
+
+from app.db.base import Base
+from app.db.models import FeatureFlag
+from app.db.routing import RecentWriters, RedisWriterMarks, ReplicaSet, RoutingSession
+
+
+def _engine_with_flag(key: str):
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[FeatureFlag.__table__])
+    with engine.begin() as conn:
+        conn.execute(FeatureFlag.__table__.insert(), {"key": key, "enabled": True, "metadata": {}})
+    return engine
+
+
+def test_routing_session_reads_replica_until_first_write() -> None:
+    primary, replica = _engine_with_flag("primary"), _engine_with_flag("replica")
+    sessions = sessionmaker(class_=RoutingSession, bind=primary)
+
+    with sessions(info={"replica": replica}) as db:
+        assert db.scalars(select(FeatureFlag.key)).all() == ["replica"]
+        db.add(FeatureFlag(key="new", enabled=False, metadata={}))
+        db.flush()
+        # Pinned to the primary after the write, so the session sees its own row.
+        assert sorted(db.scalars(select(FeatureFlag.key))) == ["new", "primary"]
+        db.commit()
+
+    with sessions(info={"replica": None}) as db:
+        assert sorted(db.scalars(select(FeatureFlag.key))) == ["new", "primary"]
+    with sessions(info={"replica": replica}) as db:
+        assert db.execute(text("SELECT count(*) FROM feature_flags")).scalar() == 2
+
+
+def test_replica_set_falls_back_when_replicas_are_unhealthy() -> None:
+    replica = create_engine("sqlite://")
+    replicas = ReplicaSet([("r0", replica, replica)], max_lag_seconds=5, check_seconds=60)
+    replicas._ensure_started = lambda: None
+
+    assert replicas.pick() is None
+    replicas.check()
+    assert replicas.pick().name == "r0"
+    replicas._lag = lambda engine: 30.0
+    replicas.check()
+    assert replicas.pick() is None
+    assert replicas.stats()["replicas"][0]["lag_seconds"] == 30.0
+    assert (replicas.replica_reads, replicas.primary_fallbacks) == (1, 2)
+
+
+def test_recent_writers_window() -> None:
+    writers = RecentWriters(window_seconds=60)
+    writers.record("Bearer a")
+    assert writers.recent("Bearer a")
+    assert not writers.recent("Bearer b")
+    assert not writers.recent(None)
+
+
+class _FakeRedis:
+    def __init__(self) -> None:
+        self.keys: dict[str, object] = {}
+
+    def set(self, key: str, value: object, px: int) -> None:
+        self.keys[key] = value
+
+    def exists(self, key: str) -> int:
+        if key == "rw:down":
+            raise ConnectionError("redis down")
+        return int(key in self.keys)
+
+
+def test_recent_writers_share_marks_across_processes() -> None:
+    marks = RedisWriterMarks("redis://127.0.0.1:6379/0")
+    marks._redis = _FakeRedis()
+    # Two API workers, each with its own RecentWriters, backed by the same Redis.
+    writer, reader = RecentWriters(60, marks), RecentWriters(60, marks)
+    writer.record("Bearer a")
+    assert reader.recent("Bearer a")
+    assert not reader.recent("Bearer b")
+    reader.key = lambda authorization: "down"
+    assert reader.recent("Bearer c")
+
+
+def test_replica_set_logs_a_replica_that_fails_its_first_check(caplog) -> None:
+    replica = create_engine("sqlite://")
+    replicas = ReplicaSet([("r0", replica, replica)], max_lag_seconds=5, check_seconds=60)
+    replicas._lag = lambda engine: None
+
+    replicas.check()
+    assert "Replica r0 is now out of service" in caplog.text
+    caplog.clear()
+    replicas.check()
+    assert caplog.text == ""
@@ -0,0 +1,83 @@
+import asyncio
+from pathlib import Path
+
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
+
+from app.db.base import Base
+from app.db.models import ObservedResource, ResourceIntent, ResourceRun
+from app.services.intents import IntentFilters, intent_statuses
+
+_TABLES = [ResourceIntent.__table__, ResourceRun.__table__, ObservedResource.__table__]
+
+
+def _seed(path: Path) -> None:
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine, tables=_TABLES)
+    with Session(engine) as db:
+        named = ResourceIntent(
+            resource_type="sparkapplication",
+            cluster_id=1,
+            namespace="etl",
+            spec_json={"metadata": {"name": "nightly"}},
+            created_by=1,
+            status="applied",
+        )
+        unnamed = ResourceIntent(
+            resource_type="sparkapplication",
+            cluster_id=1,
+            namespace="etl",
+            spec_json={},
+            created_by=1,
+        )
+        db.add_all([named, unnamed])
+        db.flush()
+        db.add_all(
+            [
+                ResourceRun(intent_id=named.id, action="apply", result="failed"),
+                ResourceRun(intent_id=named.id, action="apply", result="success"),
+                ObservedResource(
+                    cluster_id=1,
+                    namespace="etl",
+                    resource_type="sparkapplication",
+                    resource_name="nightly",
+                    observed_json={"state": "RUNNING"},
+                ),
+                ObservedResource(
+                    cluster_id=1,
+                    namespace="etl",
+                    resource_type="sparkapplication",
+                    resource_name="spark-app",
+                    observed_json={"state": "PENDING"},
+                ),
+            ]
+        )
+        db.commit()
+    engine.dispose()
+
+
+def test_intent_statuses_joins_latest_run_and_observed_row(tmp_path: Path) -> None:
+    path = tmp_path / "intents.db"
+    _seed(path)
+
+    async def scenario():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+        try:
+            async with async_sessionmaker(engine)() as db:
+                return await intent_statuses(
+                    db, "sparkapplication", IntentFilters(namespace="etl"), limit=10
+                )
+        finally:
+            await engine.dispose()
+
+    unnamed, named = asyncio.run(scenario()).items
+
+    # The name comes from the spec's JSON path, and the newest run (highest id) wins.
+    assert named.resource_name == "nightly"
+    assert named.latest_run.result == "success"
+    assert named.observed_status == {"state": "RUNNING"}
+    # Without a name in the spec the intent falls back to the type's default name.
+    assert unnamed.resource_name == "spark-app"
+    assert unnamed.latest_run is None
+    assert unnamed.observed_status == {"state": "PENDING"}
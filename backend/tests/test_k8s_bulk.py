@@ -0,0 +1,63 @@
+import threading
+import time
+
+import pytest
+from pydantic import ValidationError
+
+from app.db.schemas import BulkOperation
+from app.k8s import bulk
+from app.k8s.bulk import BulkItem, run_bulk
+
+
+def test_scale_operation_requires_replicas() -> None:
+    with pytest.raises(ValidationError):
+        BulkOperation(cluster_id=1, action="scale", namespace="default", name="web")
+    op = BulkOperation(cluster_id=1, action="delete_pod", namespace="default", name="web-0")
+    assert op.replicas is None
+
+
+def test_run_bulk_records_a_result_per_item(monkeypatch: pytest.MonkeyPatch) -> None:
+    applied: list[tuple[str, str]] = []
+
+    def fake_apply(api_client: str, operation: BulkOperation) -> None:
+        if operation.name == "broken":
+            raise RuntimeError("boom")
+        applied.append((api_client, operation.name))
+
+    monkeypatch.setattr(bulk, "apply_operation", fake_apply)
+    ops = [
+        BulkOperation(cluster_id=c, action="rollout_restart", namespace="default", name=name)
+        for c, name in [(1, "a"), (1, "broken"), (2, "b")]
+    ]
+    items = [BulkItem(index, op) for index, op in enumerate(ops)]
+
+    run_bulk([("client-1", items[:2]), ("client-2", items[2:])], concurrency=4)
+
+    assert [item.status for item in items] == ["success", "failed", "success"]
+    assert items[1].error == "boom"
+    assert sorted(applied) == [("client-1", "a"), ("client-2", "b")]
+
+
+def test_run_bulk_caps_concurrency_per_cluster(monkeypatch: pytest.MonkeyPatch) -> None:
+    lock = threading.Lock()
+    running: dict[str, int] = {}
+    peak: dict[str, int] = {}
+
+    def fake_apply(api_client: str, operation: BulkOperation) -> None:
+        with lock:
+            running[api_client] = running.get(api_client, 0) + 1
+            peak[api_client] = max(peak.get(api_client, 0), running[api_client])
+        time.sleep(0.01)
+        with lock:
+            running[api_client] -= 1
+
+    monkeypatch.setattr(bulk, "apply_operation", fake_apply)
+    items = [
+        BulkItem(index, BulkOperation(cluster_id=1, action="delete_pod", namespace="a", name="p"))
+        for index in range(12)
+    ]
+
+    run_bulk([("client-1", items[:8]), ("client-2", items[8:])], concurrency=2)
+
+    assert {item.status for item in items} == {"success"}
+    assert peak == {"client-1": 2, "client-2": 2}
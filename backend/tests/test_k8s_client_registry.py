@@ -0,0 +1,58 @@
+from app.k8s.client import ClusterClientRegistry
+
+
+class _FakeApiClient:
+    def __init__(self, kubeconfig: dict) -> None:
+        self.kubeconfig = kubeconfig
+        self.closed = False
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def _registry(**kwargs) -> ClusterClientRegistry:
+    return ClusterClientRegistry(
+        idle_seconds=kwargs.get("idle_seconds", 60.0),
+        max_clients=kwargs.get("max_clients", 8),
+        factory=_FakeApiClient,
+    )
+
+
+def test_registry_reuses_client_for_unchanged_kubeconfig() -> None:
+    registry = _registry()
+    loads: list[int] = []
+
+    def load() -> dict:
+        loads.append(1)
+        return {"clusters": []}
+
+    first = registry.get(1, "enc-a", load)
+    second = registry.get(1, "enc-a", load)
+    assert first is second
+    assert len(loads) == 1
+    assert registry.stats()["hits"] == 1
+    assert registry.stats()["misses"] == 1
+
+
+def test_registry_rebuilds_client_when_kubeconfig_changes() -> None:
+    registry = _registry()
+    first = registry.get(1, "enc-a", dict)
+    second = registry.get(1, "enc-b", dict)
+    assert first is not second
+    assert first.closed
+    assert registry.stats()["size"] == 1
+
+
+def test_registry_evicts_idle_and_least_recently_used_clients() -> None:
+    registry = _registry(max_clients=2)
+    first = registry.get(1, "enc-1", dict)
+    registry.get(2, "enc-2", dict)
+    registry.get(3, "enc-3", dict)
+    assert first.closed
+    assert registry.stats()["clusters"] == [2, 3]
+
+    idle = _registry(idle_seconds=-1.0)
+    stale = idle.get(1, "enc-1", dict)
+    idle.get(2, "enc-2", dict)
+    assert stale.closed
+    assert idle.stats()["clusters"] == [2]
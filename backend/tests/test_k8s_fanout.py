@@ -0,0 +1,30 @@
+import asyncio
+
+import pytest
+
+from app.k8s.fanout import ClusterTarget, fan_out, matches_labels, parse_label_selector
+
+
+def test_cluster_label_selector_matching() -> None:
+    selector = parse_label_selector("env=prod, region=eu")
+    assert matches_labels({"env": "prod", "region": "eu", "tier": "gold"}, selector)
+    assert not matches_labels({"env": "dev", "region": "eu"}, selector)
+    with pytest.raises(ValueError):
+        parse_label_selector("env")
+
+
+def test_fan_out_returns_partial_results_with_status() -> None:
+    async def call(target: ClusterTarget) -> list[str]:
+        if target.name == "slow":
+            await asyncio.sleep(1)
+        if target.name == "broken":
+            raise RuntimeError("boom")
+        return [target.name]
+
+    targets = [ClusterTarget(i, name, None) for i, name in enumerate(["fast", "slow", "broken"])]
+    results = asyncio.run(fan_out(targets, call, concurrency=2, deadline=0.05))
+
+    assert [r["status"] for r in results] == ["ok", "timeout", "error"]
+    assert results[0]["data"] == ["fast"]
+    assert results[2]["error"] == "boom"
+    assert all("latency_ms" in r for r in results)
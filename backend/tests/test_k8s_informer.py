@@ -0,0 +1,114 @@
+import asyncio
+import threading
+from types import SimpleNamespace
+
+import pytest
+from kubernetes.client import Configuration
+
+from app.k8s import informer as informer_module
+from app.k8s.async_client import AsyncClientRegistry
+from app.k8s.informer import InformerCache, ResourceInformer
+from app.k8s.watch import WatchEvent
+
+
+def _pod(name: str, version: str) -> dict:
+    return {"metadata": {"name": name, "resourceVersion": version}}
+
+
+def test_informer_relist_and_watch_events_update_snapshot(monkeypatch) -> None:
+    monkeypatch.setattr(
+        informer_module,
+        "list_namespaced_raw",
+        lambda api_client, kind, namespace, **params: {
+            "metadata": {"resourceVersion": "10"},
+            "items": [_pod("a", "5"), _pod("b", "6")],
+        },
+    )
+    events: list[WatchEvent] = []
+    informer = ResourceInformer(1, "spark", "pods", api_client=object(), watch_timeout_seconds=5)
+    informer.add_handler(events.append)
+
+    informer.relist()
+    assert informer.resource_version == "10"
+    assert sorted(obj["metadata"]["name"] for obj in informer.items()) == ["a", "b"]
+
+    informer.apply("MODIFIED", _pod("a", "11"))
+    informer.apply("DELETED", _pod("b", "12"))
+    informer.apply("BOOKMARK", {"metadata": {"resourceVersion": "13"}})
+
+    assert [obj["metadata"]["name"] for obj in informer.items()] == ["a"]
+    assert informer.resource_version == "13"
+    assert [(e.event_type, e.resource_name) for e in events] == [
+        ("ADDED", "a"),
+        ("ADDED", "b"),
+        ("MODIFIED", "a"),
+        ("DELETED", "b"),
+    ]
+    assert events[-1].resource_version == "12"
+
+
+def test_cold_list_and_waiters_are_time_bounded(monkeypatch) -> None:
+    seen_timeouts = []
+    listing, release = threading.Event(), threading.Event()
+
+    def slow_list(api_client, kind, namespace, **params):
+        seen_timeouts.append(params["_request_timeout"])
+        listing.set()
+        release.wait(5)
+        return {"metadata": {"resourceVersion": "1"}, "items": []}
+
+    monkeypatch.setattr(informer_module, "list_namespaced_raw", slow_list)
+    monkeypatch.setattr(ResourceInformer, "_run", lambda self: None)
+    cache = InformerCache(idle_seconds=60, watch_timeout_seconds=5, list_timeout_seconds=0.2)
+    api_client = object()
+
+    first = threading.Thread(target=cache.get, args=(1, "spark", "pods", api_client))
+    first.start()
+    listing.wait(5)
+    # A second caller for the same key gives up instead of holding its thread indefinitely.
+    with pytest.raises(TimeoutError):
+        cache.get(1, "spark", "pods", api_client)
+    release.set()
+    first.join()
+    assert seen_timeouts == [0.2]
+
+
+def test_start_locks_are_dropped_with_their_informers(monkeypatch) -> None:
+    monkeypatch.setattr(
+        informer_module,
+        "list_namespaced_raw",
+        lambda api_client, kind, namespace, **params: {
+            "metadata": {"resourceVersion": "1"},
+            "items": [],
+        },
+    )
+    monkeypatch.setattr(ResourceInformer, "_run", lambda self: None)
+    cache = InformerCache(idle_seconds=60, watch_timeout_seconds=5, list_timeout_seconds=1)
+    api_client = object()
+    cache.get(1, "spark", "pods", api_client)
+    cache.get(2, "kafka", "pods", api_client)
+
+    cache.invalidate(1)
+    assert list(cache._starting) == [(2, "kafka", "pods")]
+    cache.idle_seconds = -1
+    cache.get(3, "spark", "pods", api_client)
+    assert list(cache._starting) == [(3, "spark", "pods")]
+
+
+def test_async_clients_close_replaced_and_idle_entries() -> None:
+    def _api_client() -> SimpleNamespace:
+        return SimpleNamespace(configuration=Configuration(host="http://127.0.0.1:1"))
+
+    async def scenario() -> None:
+        registry = AsyncClientRegistry(timeout=1, max_connections=2, idle_seconds=0)
+        old = registry.get(1, _api_client())
+        other = registry.get(2, _api_client())
+        replaced = registry.get(1, _api_client())
+        await asyncio.sleep(0)
+        await asyncio.gather(*registry._closing)
+        assert replaced is not old
+        assert old._http.is_closed and other._http.is_closed
+        assert not replaced._http.is_closed
+        assert set(registry._entries) == {1}
+
+    asyncio.run(scenario())
@@ -0,0 +1,22 @@
+import pytest
+
+from app.k8s.utils import decode_cursor, encode_cursor, parse_fields, project_fields
+
+
+def test_project_fields_picks_dotted_paths() -> None:
+    pod = {"metadata": {"name": "driver"}, "status": {"phase": "Running"}, "spec": {}}
+    fields = parse_fields("metadata.name, status.phase,spec.nodeName")
+    assert project_fields(pod, fields) == {
+        "metadata.name": "driver",
+        "status.phase": "Running",
+        "spec.nodeName": None,
+    }
+
+
+def test_cursor_roundtrip_and_rejects_garbage() -> None:
+    tokens = {"deployments": "abc", "daemonsets": "def"}
+    assert decode_cursor(encode_cursor(tokens)) == tokens
+    assert encode_cursor({}) is None
+    assert decode_cursor(None) == {}
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
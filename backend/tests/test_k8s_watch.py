@@ -0,0 +1,29 @@
+import asyncio
+
+from app.k8s.watch import WatchEvent, WatchSubscription
+
+
+def _event(name: str, version: str) -> WatchEvent:
+    return WatchEvent(1, "spark", "pods", name, {}, resource_version=version)
+
+
+def test_subscription_coalesces_per_object_and_overflows_to_snapshot() -> None:
+    async def scenario() -> None:
+        subscription = WatchSubscription(asyncio.get_running_loop(), max_pending=2)
+        assert not await subscription.wait(0.01)
+
+        for version in ("1", "2", "3"):
+            subscription.push(_event("a", version))
+        subscription.push(_event("b", "4"))
+        assert await subscription.wait(1)
+        events, overflowed = subscription.drain()
+        assert not overflowed
+        assert [(e.resource_name, e.resource_version) for e in events] == [("a", "3"), ("b", "4")]
+
+        for name in ("a", "b", "c", "d"):
+            subscription.push(_event(name, "5"))
+        events, overflowed = subscription.drain()
+        assert overflowed
+        assert events == []
+
+    asyncio.run(scenario())
@@ -0,0 +1,46 @@
+from types import SimpleNamespace
+
+from app.core.namespace_policy import action_bits, compile_scopes, evaluate
+
+
+def _scope(cluster_id: int, namespace: str, allowed: list[str], denied: list[str]):
+    return SimpleNamespace(
+        cluster_id=cluster_id,
+        namespace=namespace,
+        allowed_actions={"actions": allowed},
+        denied_actions={"actions": denied},
+    )
+
+
+def test_compiled_policy_matches_exact_prefix_and_wildcard_scopes() -> None:
+    clusters = compile_scopes(
+        [
+            _scope(1, "spark-prod", ["k8s.read", "spark.deploy"], []),
+            _scope(1, "team-*", ["k8s.read", "k8s.scale"], ["k8s.delete_pod"]),
+            _scope(2, "*", ["*"], ["k8s.delete_pod"]),
+        ]
+    )
+
+    assert evaluate(clusters.get(1), "spark-prod", "spark.deploy") is None
+    assert evaluate(clusters.get(1), "spark-prod", "k8s.scale") == "Namespace action not allowed"
+    assert evaluate(clusters.get(1), "team-a", "k8s.scale") is None
+    assert evaluate(clusters.get(1), "team-a", "k8s.delete_pod") == "Namespace action denied"
+    # No scope covers the namespace: open by default, as before.
+    assert evaluate(clusters.get(1), "default", "k8s.delete_pod") is None
+    assert evaluate(clusters.get(3), "default", "k8s.delete_pod") is None
+    assert evaluate(clusters.get(2), "anything", "kafka.deploy") is None
+    assert evaluate(clusters.get(2), "anything", "k8s.delete_pod") == "Namespace action denied"
+
+
+def test_unknown_actions_match_only_wildcards_and_are_not_registered() -> None:
+    clusters = compile_scopes(
+        [_scope(1, "spark-prod", ["k8s.read"], []), _scope(1, "team-*", ["*"], [])]
+    )
+    registered = len(action_bits._bits)
+
+    for i in range(1000):
+        denied = evaluate(clusters.get(1), "spark-prod", f"junk-{i}")
+        assert denied == "Namespace action not allowed"
+        assert evaluate(clusters.get(1), "team-a", f"junk-{i}") is None
+
+    assert len(action_bits._bits) == registered
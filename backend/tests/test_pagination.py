@@ -0,0 +1,39 @@
+from datetime import datetime
+
+import pytest
+
+from app.db.pagination import (
+    InvalidCursor,
+    decode_cursor,
+    decode_id_cursor,
+    decode_ts_id_cursor,
+    encode_cursor,
+    split_page,
+)
+
+
+def test_cursor_roundtrip_and_rejects_garbage() -> None:
+    ts = datetime(2026, 10, 18, 12, 30, 5, 123456)
+    cursor = encode_cursor(ts, 42)
+    assert "=" not in cursor
+    assert decode_cursor(cursor, 2) == [ts.isoformat(), 42]
+    for bad in ("not-a-cursor!", encode_cursor(1), encode_cursor({"a": 1}, 2)[:-3]):
+        with pytest.raises(InvalidCursor):
+            decode_cursor(bad, 2)
+
+
+def test_typed_cursors_and_split_page() -> None:
+    ts = datetime(2026, 10, 18, 9, 0)
+    assert decode_ts_id_cursor(encode_cursor(ts, 7)) == (ts, 7)
+    assert decode_id_cursor(encode_cursor(12)) == 12
+    for bad in (encode_cursor("12"), encode_cursor(1, 2)):
+        with pytest.raises(InvalidCursor):
+            decode_id_cursor(bad)
+    with pytest.raises(InvalidCursor):
+        decode_ts_id_cursor(encode_cursor("yesterday", 1))
+
+    rows = [(5,), (4,), (3,)]
+    page, next_cursor = split_page(rows, 2, lambda row: row)
+    assert page == [(5,), (4,)]
+    assert decode_id_cursor(next_cursor) == 4
+    assert split_page(rows, 3, lambda row: row) == (rows, None)
@@ -0,0 +1,34 @@
+from app.core.permission_cache import LocalPermissionBackend, PermissionCache
+
+
+def test_permission_cache_hits_until_invalidated() -> None:
+    loads: list[int] = []
+
+    def load() -> set[str]:
+        loads.append(1)
+        return {"k8s.read"}
+
+    cache = PermissionCache(LocalPermissionBackend(), ttl=60)
+    version, perms = cache.get(7, load)
+    assert perms == {"k8s.read"}
+    assert cache.get(7, load) == (version, perms)
+    assert len(loads) == 1
+
+    cache.invalidate_user(7)
+    assert cache.version(7) == version + 1
+    cache.get(7, load)
+    assert len(loads) == 2
+
+    cache.get(8, load)
+    cache.invalidate_all()
+    cache.get(7, load)
+    cache.get(8, load)
+    assert len(loads) == 5
+
+
+def test_permission_cache_entries_expire() -> None:
+    cache = PermissionCache(LocalPermissionBackend(), ttl=0)
+    calls: list[int] = []
+    cache.get(1, lambda: calls.append(1) or set())
+    cache.get(1, lambda: calls.append(1) or set())
+    assert len(calls) == 2
@@ -1,7 +1,89 @@
-from app.core.security import create_access_token, decode_token
+import threading
+import time
+
+import pytest
+
+from app.core.permission_cache import permission_cache
+from app.core.rbac import embedded_permissions
+from app.core.security import (
+    HashPoolBusy,
+    PasswordHashPool,
+    TokenError,
+    create_access_token,
+    create_refresh_token,
+    decode_token,
+    revoke_token,
+)
+from app.core.token_revocation import (
+    BloomFilter,
+    LocalRevocationBackend,
+    TokenRevocations,
+    token_revocations,
+)
 
 
 def test_access_token_roundtrip() -> None:
     token = create_access_token("123")
     claims = decode_token(token, expected_type="access")
     assert claims["sub"] == "123"
+
+
+def test_embedded_permissions_are_used_only_while_the_version_matches() -> None:
+    version = permission_cache.version(321)
+    token = create_access_token("321", {"act": True, "perms": ["k8s.read"], "pv": version})
+    claims = decode_token(token, expected_type="access")
+    assert embedded_permissions(claims) == {"k8s.read"}
+    assert embedded_permissions({**claims, "act": False}) is None
+
+    permission_cache.invalidate_user(321)
+    assert embedded_permissions(claims) is None
+
+
+def test_hash_pool_rejects_work_beyond_its_queue() -> None:
+    pool = PasswordHashPool(workers=1, max_queue=1)
+    gate = threading.Event()
+    running = [pool.submit(gate.wait, 5), pool.submit(gate.wait, 5)]
+    with pytest.raises(HashPoolBusy):
+        pool.submit(gate.wait, 5)
+
+    gate.set()
+    assert [future.result(timeout=5) for future in running] == [True, True]
+    assert pool.submit(lambda: "ok").result(timeout=5) == "ok"
+    stats = pool.stats()
+    assert (stats["completed"], stats["rejected"], stats["in_flight"]) == (3, 1, 0)
+    assert sum(stats["latency_buckets"].values()) == 3
+
+
+def test_revoked_tokens_are_rejected() -> None:
+    access_token = create_access_token("55")
+    refresh_token = create_refresh_token("55")
+    revoke_token(decode_token(access_token, expected_type="access"))
+    with pytest.raises(TokenError):
+        decode_token(access_token, expected_type="access")
+    assert decode_token(refresh_token, expected_type="refresh")["sub"] == "55"
+
+    iat = decode_token(refresh_token, expected_type="refresh")["iat"]
+    token_revocations.revoke_user(55, issued_before=iat)
+    assert decode_token(refresh_token, expected_type="refresh")["sub"] == "55"
+    # Cutoffs round up to whole seconds, so a token issued earlier in the revoking second goes too.
+    token_revocations.revoke_user(55, issued_before=iat + 0.1)
+    with pytest.raises(TokenError):
+        decode_token(refresh_token, expected_type="refresh")
+
+
+def test_revocation_filter_confirms_hits_and_prunes_expired_entries() -> None:
+    backend = LocalRevocationBackend()
+    revocations = TokenRevocations(backend, sync_seconds=0, max_token_seconds=60, capacity=100)
+    now = time.time()
+    revocations.revoke("live", now + 60)
+    revocations.revoke("stale", now - 1)
+    assert revocations.is_revoked({"sub": "1", "jti": "live"})
+    assert not revocations.is_revoked({"sub": "1", "jti": "stale"})
+    assert not revocations.is_revoked({"sub": "1", "jti": "other"})
+    assert backend.snapshot(now, now - 60)[0] == {"live": now + 60}
+
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    for i in range(1000):
+        bloom.add(f"jti-{i}")
+    assert all(f"jti-{i}" in bloom for i in range(1000))
+    assert sum(f"miss-{i}" in bloom for i in range(10_000)) < 300
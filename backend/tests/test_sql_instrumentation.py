@@ -0,0 +1,26 @@
+from sqlalchemy import create_engine, text
+
+from app.db.instrumentation import collect_queries, instrument_engine, statement_shape
+
+
+def test_collects_statement_counts_and_duplicate_shapes() -> None:
+    engine = create_engine("sqlite://")
+    instrument_engine(engine)
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))  # outside any collection
+        with collect_queries() as stats:
+            for i in range(3):
+                conn.execute(text("SELECT :i"), {"i": i})
+            conn.execute(text("SELECT 2"))
+
+    assert stats.statements == 4
+    assert stats.duplicates == 2
+    assert stats.most_repeated() == ("SELECT ?", 3)
+    assert stats.seconds > 0
+
+
+def test_statement_shape_collapses_expanded_in_lists() -> None:
+    one = statement_shape("SELECT * FROM t WHERE id IN (?, ?)\n  AND x = ?")
+    two = statement_shape("SELECT * FROM t WHERE id IN (?, ?, ?, ?) AND x = ?")
+    assert one == two == "SELECT * FROM t WHERE id IN (?) AND x = ?"
+    assert statement_shape("SELECT f(%s)") == "SELECT f(%s)"
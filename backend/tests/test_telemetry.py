@@ -0,0 +1,74 @@
+import pytest
+from kubernetes.client import ApiClient
+from prometheus_client import CollectorRegistry, generate_latest
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import QueuePool
+
+from app.core.telemetry import (
+    UPSTREAM_SECONDS,
+    RuntimeCollector,
+    instrument_api_client,
+    time_upstream,
+)
+from app.db.routing import ReplicaSet
+
+
+def test_runtime_collector_reports_pool_and_audit_queue() -> None:
+    engine = create_engine("sqlite://", poolclass=QueuePool, pool_size=2, max_overflow=5)
+    registry = CollectorRegistry()
+    audit = {"queue_depth": 7, "overflow_writes": 3, "dropped": 1}
+    registry.register(RuntimeCollector({"primary": engine}, lambda: audit))
+
+    conns = [engine.connect() for _ in range(3)]
+    conns[0].execute(text("SELECT 1"))
+    assert registry.get_sample_value("orchestrator_db_pool_size", {"engine": "primary"}) == 2
+    assert registry.get_sample_value("orchestrator_db_pool_checked_out", {"engine": "primary"}) == 3
+    assert registry.get_sample_value("orchestrator_db_pool_overflow", {"engine": "primary"}) == 1
+    assert registry.get_sample_value("orchestrator_audit_queue_depth") == 7
+    assert registry.get_sample_value("orchestrator_audit_overflow_writes_total") == 3
+    assert registry.get_sample_value("orchestrator_audit_dropped_total") == 1
+    for conn in conns:
+        conn.close()
+    assert b'orchestrator_db_pool_checked_out{engine="primary"} 0.0' in generate_latest(registry)
+
+
+def test_time_upstream_labels_outcome() -> None:
+    with time_upstream("kubernetes", "42", "GET"):
+        pass
+    with pytest.raises(RuntimeError), time_upstream("kubernetes", "42", "GET"):
+        raise RuntimeError("boom")
+
+    assert UPSTREAM_SECONDS.labels("kubernetes", "42", "GET", "ok")._sum.get() > 0
+    assert UPSTREAM_SECONDS.labels("kubernetes", "42", "GET", "error")._sum.get() > 0
+
+
+def test_instrument_api_client_times_rest_calls() -> None:
+    api_client = ApiClient()
+    api_client.rest_client.request = lambda method, url, *args, **kwargs: "response"
+    instrument_api_client(77, api_client)
+
+    assert api_client.rest_client.request("GET", "http://cluster/api") == "response"
+    assert UPSTREAM_SECONDS.labels("kubernetes", "77", "GET", "ok")._sum.get() > 0
+
+
+def test_runtime_collector_reports_replica_health() -> None:
+    replica = create_engine("sqlite://")
+    replicas = ReplicaSet([("r0", replica, replica)], max_lag_seconds=5, check_seconds=60)
+    replicas._ensure_started = lambda: None
+    replicas._lag = lambda engine: 12.5
+    replicas.check()
+    replicas.pick()
+    registry = CollectorRegistry()
+    registry.register(
+        RuntimeCollector(
+            {},
+            lambda: {"queue_depth": 0, "overflow_writes": 0, "dropped": 0},
+            replica_stats=replicas.stats,
+        )
+    )
+
+    assert registry.get_sample_value("orchestrator_db_replica_healthy", {"replica": "r0"}) == 0
+    lag = registry.get_sample_value("orchestrator_db_replica_lag_seconds", {"replica": "r0"})
+    assert lag == 12.5
+    assert registry.get_sample_value("orchestrator_db_primary_fallbacks_total") == 1
+    assert registry.get_sample_value("orchestrator_db_replica_reads_total") == 0
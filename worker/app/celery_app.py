@@ -1,5 +1,9 @@
 from celery import Celery
 
+from app import (
+    instrumentation,  # noqa: F401  (per-task SQL statistics via task signals)
+    telemetry,  # noqa: F401  (task metrics and the /metrics listener via signals)
+)
 from app.config import get_settings
 
 settings = get_settings()
@@ -21,6 +25,7 @@ celery_app.conf.update(
     task_default_retry_delay=5,
     task_routes={
         "app.jobs.orchestration.*": {"queue": "orchestration"},
+        "app.jobs.nodes.*": {"queue": "orchestration"},
         "app.jobs.alerts.*": {"queue": "alerts"},
         "app.jobs.ai.*": {"queue": "ai"},
     },
@@ -28,7 +33,12 @@ celery_app.conf.update(
         "evaluate-alert-rules": {
             "task": "app.jobs.alerts.evaluate_alert_rules",
             "schedule": 60.0,
-        }
+        },
+        "enforce-retention": {
+            "task": "app.jobs.retention.enforce_retention",
+            "schedule": settings.retention_interval_seconds,
+            "options": {"expires": settings.retention_interval_seconds},
+        },
     },
 )
 
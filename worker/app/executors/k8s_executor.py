@@ -1,3 +1,33 @@
+import json
+
+from cryptography.fernet import Fernet
+from kubernetes import client
+from kubernetes.config.kube_config import KubeConfigLoader
+from sqlalchemy import text
+
+from app.config import get_settings
+from app.db import engine
+from app.telemetry import instrument_api_client
+
+
+def load_cluster_api_client(cluster_id: int) -> client.ApiClient:
+    with engine.begin() as conn:
+        kubeconfig_ref = conn.execute(
+            text("SELECT kubeconfig_ref FROM clusters WHERE id=:cluster_id"),
+            {"cluster_id": cluster_id},
+        ).scalar()
+    if kubeconfig_ref is None:
+        raise LookupError(f"Cluster {cluster_id} not found")
+
+    fernet = Fernet(get_settings().fernet_key.encode())
+    kubeconfig = json.loads(fernet.decrypt(kubeconfig_ref.encode()).decode())
+    cfg = client.Configuration()
+    KubeConfigLoader(config_dict=kubeconfig).load_and_set(cfg)
+    api_client = client.ApiClient(configuration=cfg)
+    instrument_api_client(cluster_id, api_client)
+    return api_client
+
+
 class K8sExecutor:
     def apply_manifest(self, manifest: dict) -> dict:
         # Placeholder for server-side apply and readiness checks.
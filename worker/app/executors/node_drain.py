@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+
+from kubernetes import client
+from kubernetes.client.rest import ApiException
+
+MIRROR_POD_ANNOTATION = "kubernetes.io/config.mirror"
+
+
+@dataclass
+class DrainOptions:
+    parallelism: int = 10
+    timeout_seconds: float = 600.0
+    grace_period_seconds: int | None = None
+    initial_backoff_seconds: float = 1.0
+    max_backoff_seconds: float = 30.0
+    # Pods with no controller are gone for good once evicted; like kubectl, refuse unless forced.
+    force: bool = False
+    poll_seconds: float = 2.0
+
+
+@dataclass
+class DrainProgress:
+    total: int = 0
+    evicted: int = 0
+    failed: int = 0
+    skipped: int = 0
+    errors: dict[str, str] = field(default_factory=dict)
+
+    @property
+    def pending(self) -> int:
+        return self.total - self.evicted - self.failed
+
+    def summary(self) -> str:
+        return (
+            f"evicted={self.evicted} failed={self.failed} pending={self.pending} "
+            f"skipped={self.skipped} total={self.total}"
+        )
+
+
+def _is_unmanaged(pod: client.V1Pod) -> bool:
+    return not pod.metadata.owner_references
+
+
+def _is_evictable(pod: client.V1Pod) -> bool:
+    metadata = pod.metadata
+    if MIRROR_POD_ANNOTATION in (metadata.annotations or {}):
+        return False
+    if any(ref.kind == "DaemonSet" for ref in metadata.owner_references or []):
+        return False
+    return pod.status is None or pod.status.phase not in ("Succeeded", "Failed")
+
+
+class NodeDrainer:
+    """Cordon a node and evict its pods concurrently, retrying PodDisruptionBudget rejections.
+
+    A pod counts as evicted once it is gone from the API server, not when the eviction is
+    accepted; one still terminating at the deadline counts as failed.
+    """
+
+    def __init__(
+        self,
+        core_api: client.CoreV1Api,
+        options: DrainOptions,
+        on_progress: Callable[[DrainProgress], None] | None = None,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.core_api = core_api
+        self.options = options
+        self.on_progress = on_progress
+        self._sleep = sleep
+        self._lock = threading.Lock()
+
+    def cordon(self, node_name: str) -> None:
+        self.core_api.patch_node(name=node_name, body={"spec": {"unschedulable": True}})
+
+    def pods_on_node(self, node_name: str) -> tuple[list[client.V1Pod], int]:
+        pods = self.core_api.list_pod_for_all_namespaces(
+            field_selector=f"spec.nodeName={node_name}"
+        ).items
+        evictable = [pod for pod in pods if _is_evictable(pod)]
+        return evictable, len(pods) - len(evictable)
+
+    def drain(self, node_name: str) -> DrainProgress:
+        self.cordon(node_name)
+        pods, skipped = self.pods_on_node(node_name)
+        progress = DrainProgress(total=len(pods), skipped=skipped)
+        self._report(progress)
+        deadline = time.monotonic() + self.options.timeout_seconds
+
+        with ThreadPoolExecutor(max_workers=max(1, self.options.parallelism)) as pool:
+            for pod in pods:
+                if _is_unmanaged(pod) and not self.options.force:
+                    self._record(progress, pod, "unmanaged pod; drain with force to delete it")
+                    continue
+                pool.submit(self._evict_one, pod, deadline, progress)
+        return progress
+
+    def _evict_one(self, pod: client.V1Pod, deadline: float, progress: DrainProgress) -> None:
+        body = client.V1Eviction(
+            metadata=client.V1ObjectMeta(name=pod.metadata.name, namespace=pod.metadata.namespace),
+            delete_options=client.V1DeleteOptions(
+                grace_period_seconds=self.options.grace_period_seconds
+            ),
+        )
+        backoff = self.options.initial_backoff_seconds
+        error = None
+        while True:
+            try:
+                self.core_api.create_namespaced_pod_eviction(
+                    name=pod.metadata.name, namespace=pod.metadata.namespace, body=body
+                )
+                break
+            except ApiException as exc:
+                if exc.status == 404:
+                    break
+                # 429 means a PodDisruptionBudget currently forbids this eviction; wait and retry.
+                if exc.status == 429 and time.monotonic() + backoff < deadline:
+                    self._sleep(backoff)
+                    backoff = min(backoff * 2, self.options.max_backoff_seconds)
+                    continue
+                error = f"{exc.status}: {exc.reason}"
+                break
+            except Exception as exc:
+                error = str(exc) or type(exc).__name__
+                break
+
+        if error is None:
+            error = self._wait_until_gone(pod, deadline)
+        self._record(progress, pod, error)
+
+    def _wait_until_gone(self, pod: client.V1Pod, deadline: float) -> str | None:
+        while True:
+            try:
+                current = self.core_api.read_namespaced_pod(
+                    name=pod.metadata.name, namespace=pod.metadata.namespace
+                )
+            except ApiException as exc:
+                if exc.status == 404:
+                    return None
+                return f"{exc.status}: {exc.reason}"
+            except Exception as exc:
+                return str(exc) or type(exc).__name__
+            # A controller may already have recreated a pod with the same name elsewhere.
+            if pod.metadata.uid and current.metadata.uid != pod.metadata.uid:
+                return None
+            if time.monotonic() + self.options.poll_seconds >= deadline:
+                return "evicted but still terminating at the drain timeout"
+            self._sleep(self.options.poll_seconds)
+
+    def _record(self, progress: DrainProgress, pod: client.V1Pod, error: str | None) -> None:
+        with self._lock:
+            if error is None:
+                progress.evicted += 1
+            else:
+                progress.failed += 1
+                progress.errors[f"{pod.metadata.namespace}/{pod.metadata.name}"] = error
+        self._report(progress)
+
+    def _report(self, progress: DrainProgress) -> None:
+        if self.on_progress is None:
+            return
+        with self._lock:
+            snapshot = replace(progress, errors=dict(progress.errors))
+        # Outside the lock: the callback writes to the database and must not stall evictions.
+        self.on_progress(snapshot)
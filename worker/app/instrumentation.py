@@ -0,0 +1,118 @@
+import logging
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar, Token
+from dataclasses import dataclass, field
+
+from celery.signals import task_postrun, task_prerun
+from prometheus_client import Histogram
+from sqlalchemy import Engine, event
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+TASK_DB_STATEMENTS = Histogram(
+    "orchestrator_worker_db_statements_per_task",
+    "SQL statements issued by one Celery task run",
+    ["task"],
+    buckets=(1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 5000),
+)
+TASK_DB_SECONDS = Histogram(
+    "orchestrator_worker_db_seconds_per_task",
+    "Time spent executing SQL in one Celery task run",
+    ["task"],
+    buckets=(0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0),
+)
+TASK_DB_DUPLICATES = Histogram(
+    "orchestrator_worker_db_duplicate_statements_per_task",
+    "Statements per task run that repeat an earlier statement shape",
+    ["task"],
+    buckets=(0, 1, 5, 10, 50, 100, 500, 1000),
+)
+
+# Expanded IN lists and multi-row VALUES would make every batch size its own shape.
+_PARAM_LIST = re.compile(r"\(\s*(?:%s|\?|:\w+)(?:\s*,\s*(?:%s|\?|:\w+))+\s*\)")
+
+
+def statement_shape(statement: str) -> str:
+    return _PARAM_LIST.sub("(?)", " ".join(statement.split()))
+
+
+@dataclass
+class QueryStats:
+    statements: int = 0
+    seconds: float = 0.0
+    shapes: Counter[str] = field(default_factory=Counter)
+
+    @property
+    def duplicates(self) -> int:
+        return sum(n - 1 for n in self.shapes.values() if n > 1)
+
+    def most_repeated(self) -> tuple[str, int] | None:
+        if not self.shapes:
+            return None
+        shape, n = self.shapes.most_common(1)[0]
+        return (shape, n) if n > 1 else None
+
+
+_current: ContextVar[QueryStats | None] = ContextVar("sql_query_stats", default=None)
+_tokens: dict[str, Token] = {}
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    if _current.get() is not None and context is not None:
+        context._query_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    stats = _current.get()
+    if stats is None:
+        return
+    started = getattr(context, "_query_started", None)
+    stats.statements += 1
+    if started is not None:
+        stats.seconds += time.perf_counter() - started
+    stats.shapes[statement_shape(statement)] += 1
+
+
+def instrument_engine(engine: Engine) -> None:
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+@task_prerun.connect
+def _start_task(task_id=None, **_kwargs) -> None:
+    _tokens[task_id] = _current.set(QueryStats())
+
+
+@task_postrun.connect
+def _finish_task(task_id=None, task=None, **_kwargs) -> None:
+    stats = _current.get()
+    token = _tokens.pop(task_id, None)
+    if token is not None:
+        _current.reset(token)
+    if stats is not None and task is not None:
+        record_task(stats, task.name)
+
+
+def record_task(stats: QueryStats, task_name: str) -> None:
+    TASK_DB_STATEMENTS.labels(task_name).observe(stats.statements)
+    TASK_DB_SECONDS.labels(task_name).observe(stats.seconds)
+    TASK_DB_DUPLICATES.labels(task_name).observe(stats.duplicates)
+    if (
+        stats.statements > settings.sql_warn_statements
+        or stats.duplicates > settings.sql_warn_duplicates
+        or stats.seconds > settings.sql_warn_seconds
+    ):
+        repeated = stats.most_repeated()
+        logger.warning(
+            "Task %s issued %d SQL statements in %.1f ms with %d duplicates%s",
+            task_name,
+            stats.statements,
+            stats.seconds * 1000,
+            stats.duplicates,
+            f"; most repeated x{repeated[1]}: {repeated[0][:200]}" if repeated else "",
+        )
@@ -10,6 +10,7 @@ from sqlalchemy import text
 from app.config import get_settings
 from app.db import engine
 from app.jobs.notifications import send_email, send_slack, send_webhook
+from app.telemetry import time_upstream
 
 
 @shared_task(bind=True, autoretry_for=(Exception,), retry_backoff=True, retry_kwargs={"max_retries": 3})
@@ -30,12 +31,13 @@ def evaluate_alert_rules(self) -> dict:
 
     for rule in rules:
         try:
-            response = httpx.get(
-                f"{settings.prometheus_base_url.rstrip('/')}/api/v1/query",
-                params={"query": rule["promql"]},
-                timeout=10,
-            )
-            response.raise_for_status()
+            with time_upstream("prometheus", target="/api/v1/query"):
+                response = httpx.get(
+                    f"{settings.prometheus_base_url.rstrip('/')}/api/v1/query",
+                    params={"query": rule["promql"]},
+                    timeout=10,
+                )
+                response.raise_for_status()
             payload = response.json()
             value = 0.0
             data = payload.get("data", {}).get("result", [])
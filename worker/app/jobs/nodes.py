@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import threading
+import time
+from datetime import datetime
+
+from celery import shared_task
+from kubernetes import client
+from sqlalchemy import text
+
+from app.config import get_settings
+from app.db import engine
+from app.executors.k8s_executor import load_cluster_api_client
+from app.executors.node_drain import DrainOptions, DrainProgress, NodeDrainer
+
+
+def _update_run(run_id: int, **values) -> None:
+    assignments = ", ".join(f"{column}=:{column}" for column in values)
+    with engine.begin() as conn:
+        conn.execute(
+            text(f"UPDATE resource_runs SET {assignments} WHERE id=:run_id"),
+            {"run_id": run_id, **values},
+        )
+
+
+def _set_intent_status(intent_id: int, status: str) -> None:
+    with engine.begin() as conn:
+        conn.execute(
+            text("UPDATE resource_intents SET status=:status WHERE id=:intent_id"),
+            {"intent_id": intent_id, "status": status},
+        )
+
+
+@shared_task(bind=True, acks_late=True)
+def drain_node(
+    self,
+    cluster_id: int,
+    node_name: str,
+    intent_id: int,
+    run_id: int,
+    parallelism: int | None = None,
+    force: bool = False,
+) -> dict:
+    settings = get_settings()
+    options = DrainOptions(
+        parallelism=parallelism or settings.drain_parallelism,
+        timeout_seconds=settings.drain_timeout_seconds,
+        grace_period_seconds=settings.drain_grace_period_seconds,
+        force=force,
+    )
+    _update_run(run_id, result="running", started_at=datetime.utcnow())
+    _set_intent_status(intent_id, "running")
+
+    last_write = 0.0
+    write_lock = threading.Lock()
+
+    def on_progress(progress: DrainProgress) -> None:
+        # Throttled: a busy node finishes many evictions per second. Called from several
+        # eviction threads; the final summary is written after the drain returns anyway.
+        nonlocal last_write
+        with write_lock:
+            now = time.monotonic()
+            if now - last_write < 1.0 and progress.pending != 0:
+                return
+            last_write = now
+        _update_run(run_id, logs_ref=progress.summary()[:255])
+
+    try:
+        core_api = client.CoreV1Api(load_cluster_api_client(cluster_id))
+        progress = NodeDrainer(core_api, options, on_progress=on_progress).drain(node_name)
+    except Exception as exc:
+        _update_run(run_id, result="failed", ended_at=datetime.utcnow(), logs_ref=str(exc)[:255])
+        _set_intent_status(intent_id, "failed")
+        raise
+
+    result = "success" if progress.failed == 0 else "failed"
+    _update_run(
+        run_id, result=result, ended_at=datetime.utcnow(), logs_ref=progress.summary()[:255]
+    )
+    _set_intent_status(intent_id, "applied" if result == "success" else "failed")
+    return {
+        "cluster_id": cluster_id,
+        "node": node_name,
+        "run_id": run_id,
+        "status": result,
+        "evicted": progress.evicted,
+        "failed": progress.failed,
+        "skipped": progress.skipped,
+        "errors": progress.errors,
+    }
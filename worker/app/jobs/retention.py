@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+
+from celery import shared_task
+from sqlalchemy import text
+
+from app.config import get_settings
+from app.db import engine
+from app.schedulers.retention import NdjsonArchive, RetentionEngine, RetentionPolicy
+
+# Only incidents someone has resolved; open and acknowledged ones are kept however old.
+INCIDENT_RETENTION_WHERE = "state = 'resolved'"
+
+
+def retention_policies() -> list[RetentionPolicy]:
+    settings = get_settings()
+    return [
+        RetentionPolicy("audit_log", "ts", settings.retention_audit_log_days),
+        RetentionPolicy("alert_firings", "fired_at", settings.retention_alert_firings_days),
+        RetentionPolicy(
+            "incidents",
+            "created_at",
+            settings.retention_incidents_days,
+            where=INCIDENT_RETENTION_WHERE,
+            children=(("incident_timeline", "incident_id"),),
+        ),
+        RetentionPolicy("resource_runs", "started_at", settings.retention_resource_runs_days),
+        RetentionPolicy("ai_requests", "ts", settings.retention_ai_requests_days),
+    ]
+
+
+@contextmanager
+def _single_run():
+    """Yield False when another retention run holds the MySQL named lock."""
+    if engine.dialect.name != "mysql":
+        yield True
+        return
+    with engine.connect() as conn:
+        acquired = conn.execute(text("SELECT GET_LOCK('orchestrator.retention', 0)")).scalar()
+        try:
+            yield bool(acquired)
+        finally:
+            if acquired:
+                conn.execute(text("SELECT RELEASE_LOCK('orchestrator.retention')"))
+
+
+@shared_task(bind=True, acks_late=True)
+def enforce_retention(self) -> dict:
+    settings = get_settings()
+    with _single_run() as acquired:
+        if not acquired:
+            return {"status": "skipped", "reason": "another retention run is in progress"}
+        retention = RetentionEngine(
+            engine,
+            NdjsonArchive(settings.retention_archive_dir) if settings.retention_archive else None,
+            batch_size=settings.retention_batch_size,
+            max_batches=settings.retention_max_batches,
+            pause_seconds=settings.retention_pause_seconds,
+        )
+        return {"status": "ok", "tables": retention.run(retention_policies())}
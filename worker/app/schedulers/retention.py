@@ -0,0 +1,261 @@
+from __future__ import annotations
+
+import gzip
+import json
+import logging
+import os
+import re
+import time
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+from sqlalchemy import Engine, text
+
+logger = logging.getLogger(__name__)
+
+PARTITION_NAME = re.compile(r"^p(\d{4})(\d{2})$")
+
+
+@dataclass(frozen=True)
+class RetentionPolicy:
+    """How long rows of one table are kept, keyed on its timestamp column."""
+
+    table: str
+    ts_column: str
+    days: int
+    where: str | None = None
+    # (child table, foreign key column): rows owned by an expired parent. They are archived and
+    # deleted in the same batch instead of vanishing through ON DELETE CASCADE.
+    children: tuple[tuple[str, str], ...] = ()
+
+
+@dataclass
+class RetentionResult:
+    table: str
+    cutoff: str
+    archived: int = 0
+    deleted: int = 0
+    batches: int = 0
+    dropped_partitions: list[str] = field(default_factory=list)
+    files: list[str] = field(default_factory=list)
+    complete: bool = True
+
+
+def _json_default(value):
+    if isinstance(value, datetime | date):
+        return value.isoformat()
+    if isinstance(value, bytes):
+        return value.decode(errors="replace")
+    return str(value)
+
+
+class NdjsonArchive:
+    """Writes each batch to a gzip NDJSON file under ``root/<table>/<yyyy-mm-dd>/``.
+
+    Files are written to a temporary name, fsynced and renamed, so a file that exists is
+    complete; a batch rerun after a crash rewrites the same file name.
+    """
+
+    def __init__(self, root: str | Path) -> None:
+        self.root = Path(root)
+
+    def write(self, table: str, rows: list[dict], first_id: int, last_id: int) -> str:
+        directory = self.root / table / datetime.utcnow().strftime("%Y-%m-%d")
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"{table}-{first_id}-{last_id}.ndjson.gz"
+        tmp = path.with_suffix(".tmp")
+        with gzip.open(tmp, "wt", encoding="utf-8") as handle:
+            for row in rows:
+                handle.write(json.dumps(row, default=_json_default, separators=(",", ":")))
+                handle.write("\n")
+        with open(tmp, "rb") as handle:
+            os.fsync(handle.fileno())
+        tmp.replace(path)
+        return str(path)
+
+
+class RetentionEngine:
+    """Archives and deletes expired rows in small (ts, id)-ordered batches.
+
+    Each batch is one short transaction that deletes at most ``batch_size`` rows by primary key,
+    so row locks are held briefly and replication lag stays low. On MySQL tables partitioned by
+    month (migration 0005), whole expired partitions are archived and then dropped instead,
+    which frees their index pages at once, and upcoming months get their partitions ahead of time.
+    """
+
+    def __init__(
+        self,
+        engine: Engine,
+        archive: NdjsonArchive | None,
+        *,
+        batch_size: int = 5000,
+        max_batches: int = 200,
+        pause_seconds: float = 0.0,
+        partitions_ahead: int = 2,
+    ) -> None:
+        self.engine = engine
+        self.archive = archive
+        self.batch_size = batch_size
+        self.max_batches = max_batches
+        self.pause_seconds = pause_seconds
+        self.partitions_ahead = partitions_ahead
+
+    def run(self, policies: list[RetentionPolicy], now: datetime | None = None) -> list[dict]:
+        now = now or datetime.utcnow()
+        results = []
+        for policy in policies:
+            if policy.days <= 0:
+                continue
+            result = self.apply(policy, now - timedelta(days=policy.days))
+            results.append(vars(result))
+        return results
+
+    def apply(self, policy: RetentionPolicy, cutoff: datetime) -> RetentionResult:
+        result = RetentionResult(table=policy.table, cutoff=cutoff.isoformat())
+        partitions = self._partitions(policy.table)
+        if partitions:
+            self._ensure_future_partitions(policy.table, partitions)
+            if policy.where is None and not policy.children:
+                self._drop_expired_partitions(policy, partitions, cutoff, result)
+
+        while result.batches < self.max_batches:
+            rows = self._expired_batch(policy, cutoff)
+            if not rows:
+                return result
+            self._archive_and_delete(policy, rows, result)
+            if self.pause_seconds:
+                time.sleep(self.pause_seconds)
+        result.complete = False
+        return result
+
+    def _expired_batch(
+        self, policy: RetentionPolicy, upper: datetime, after: tuple | None = None
+    ) -> list[dict]:
+        ts = policy.ts_column
+        clauses = [f"{ts} < :upper"]
+        params: dict = {"upper": upper, "limit": self.batch_size}
+        if policy.where:
+            clauses.append(f"({policy.where})")
+        if after is not None:
+            clauses.append(f"({ts} > :after_ts OR ({ts} = :after_ts AND id > :after_id))")
+            params.update(after_ts=after[0], after_id=after[1])
+        query = (
+            f"SELECT * FROM {policy.table} WHERE {' AND '.join(clauses)} "
+            f"ORDER BY {ts}, id LIMIT :limit"
+        )
+        with self.engine.connect() as conn:
+            return [dict(row) for row in conn.execute(text(query), params).mappings()]
+
+    def _archive_rows(self, table: str, rows: list[dict], result: RetentionResult) -> None:
+        if self.archive is None or not rows:
+            return
+        ids = [row["id"] for row in rows]
+        result.files.append(self.archive.write(table, rows, min(ids), max(ids)))
+
+    def _archive_and_delete(
+        self, policy: RetentionPolicy, rows: list[dict], result: RetentionResult
+    ) -> None:
+        ids = [row["id"] for row in rows]
+        params = {f"id{i}": row_id for i, row_id in enumerate(ids)}
+        placeholders = ", ".join(f":{name}" for name in params)
+        for child, column in policy.children:
+            with self.engine.connect() as conn:
+                child_rows = conn.execute(
+                    text(f"SELECT * FROM {child} WHERE {column} IN ({placeholders}) ORDER BY id"),
+                    params,
+                ).mappings()
+                self._archive_rows(child, [dict(row) for row in child_rows], result)
+        self._archive_rows(policy.table, rows, result)
+        with self.engine.begin() as conn:
+            for child, column in policy.children:
+                conn.execute(
+                    text(f"DELETE FROM {child} WHERE {column} IN ({placeholders})"), params
+                )
+            deleted = conn.execute(
+                text(f"DELETE FROM {policy.table} WHERE id IN ({placeholders})"), params
+            ).rowcount
+        result.archived += len(rows) if self.archive is not None else 0
+        result.deleted += deleted
+        result.batches += 1
+
+    # MySQL monthly partitions -------------------------------------------------------------
+
+    def _partitions(self, table: str) -> list[str]:
+        if self.engine.dialect.name != "mysql":
+            return []
+        with self.engine.connect() as conn:
+            return list(
+                conn.execute(
+                    text(
+                        """
+                        SELECT PARTITION_NAME FROM information_schema.PARTITIONS
+                        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table
+                          AND PARTITION_NAME IS NOT NULL
+                        ORDER BY PARTITION_ORDINAL_POSITION
+                        """
+                    ),
+                    {"table": table},
+                ).scalars()
+            )
+
+    @staticmethod
+    def _month_after(year: int, month: int) -> date:
+        return date(year + month // 12, month % 12 + 1, 1)
+
+    def _drop_expired_partitions(
+        self,
+        policy: RetentionPolicy,
+        partitions: list[str],
+        cutoff: datetime,
+        result: RetentionResult,
+    ) -> None:
+        for name in partitions:
+            match = PARTITION_NAME.match(name)
+            if match is None:
+                continue
+            end = datetime.combine(
+                self._month_after(int(match[1]), int(match[2])), datetime.min.time()
+            )
+            if end > cutoff:
+                continue
+            # Archive the whole month read-only, then drop it without deleting row by row.
+            after = None
+            while rows := self._expired_batch(policy, end, after):
+                self._archive_rows(policy.table, rows, result)
+                result.archived += len(rows) if self.archive is not None else 0
+                after = (rows[-1][policy.ts_column], rows[-1]["id"])
+            with self.engine.begin() as conn:
+                conn.execute(text(f"ALTER TABLE {policy.table} DROP PARTITION {name}"))
+            result.dropped_partitions.append(name)
+            logger.info("Dropped expired partition %s.%s", policy.table, name)
+
+    def _ensure_future_partitions(self, table: str, partitions: list[str]) -> None:
+        if "pmax" not in partitions:
+            return
+        matches = (PARTITION_NAME.match(name) for name in partitions)
+        existing = [(int(m[1]), int(m[2])) for m in matches if m is not None]
+        latest = max(existing, default=(0, 0))
+        today = datetime.utcnow().date()
+        year, month = today.year, today.month
+        wanted = []
+        for _ in range(self.partitions_ahead + 1):
+            # REORGANIZE can only split pmax, so only months after the newest one can be added.
+            if (year, month) > latest:
+                wanted.append((year, month))
+            following = self._month_after(year, month)
+            year, month = following.year, following.month
+        if not wanted:
+            return
+        definitions = ", ".join(
+            f"PARTITION p{y:04d}{m:02d} VALUES LESS THAN "
+            f"(TO_DAYS('{self._month_after(y, m).isoformat()}'))"
+            for y, m in wanted
+        )
+        with self.engine.begin() as conn:
+            conn.execute(
+                text(
+                    f"ALTER TABLE {table} REORGANIZE PARTITION pmax INTO "
+                    f"({definitions}, PARTITION pmax VALUES LESS THAN MAXVALUE)"
+                )
+            )
@@ -0,0 +1,157 @@
+import logging
+import os
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+import redis
+from celery.signals import (
+    task_failure,
+    task_postrun,
+    task_prerun,
+    task_retry,
+    worker_init,
+    worker_process_shutdown,
+)
+from prometheus_client import (
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    multiprocess,
+    start_http_server,
+)
+from prometheus_client.core import GaugeMetricFamily
+from prometheus_client.registry import Collector
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+TASK_SECONDS = Histogram(
+    "orchestrator_worker_task_duration_seconds",
+    "Celery task run time by task name and final state",
+    ["task", "state"],
+    buckets=(0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0, 3600.0),
+)
+TASK_RETRIES = Counter(
+    "orchestrator_worker_task_retries_total", "Celery task retries by task name", ["task"]
+)
+TASK_FAILURES = Counter(
+    "orchestrator_worker_task_failures_total",
+    "Celery task runs that raised, by task name",
+    ["task"],
+)
+UPSTREAM_SECONDS = Histogram(
+    "orchestrator_upstream_request_duration_seconds",
+    "Latency of calls to Kubernetes API servers and Prometheus",
+    ["upstream", "cluster", "target", "outcome"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+
+_started: dict[str, float] = {}
+
+
+@contextmanager
+def time_upstream(upstream: str, cluster: str = "", target: str = "") -> Iterator[None]:
+    started = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "ok"
+    finally:
+        UPSTREAM_SECONDS.labels(upstream, cluster, target, outcome).observe(
+            time.perf_counter() - started
+        )
+
+
+def instrument_api_client(cluster_id: int, api_client) -> None:
+    """Time every request a kubernetes ApiClient sends, labelled by cluster and verb."""
+    # Every generated API call goes through the REST client, whatever the client version.
+    rest_client = api_client.rest_client
+    request = rest_client.request
+
+    def timed_request(method, url, *args, **kwargs):
+        with time_upstream("kubernetes", str(cluster_id), method):
+            return request(method, url, *args, **kwargs)
+
+    rest_client.request = timed_request
+
+
+@task_prerun.connect
+def _task_started(task_id=None, **_kwargs) -> None:
+    _started[task_id] = time.perf_counter()
+
+
+@task_postrun.connect
+def _task_finished(task_id=None, task=None, state=None, **_kwargs) -> None:
+    started = _started.pop(task_id, None)
+    if started is not None and task is not None:
+        TASK_SECONDS.labels(task.name, state or "UNKNOWN").observe(time.perf_counter() - started)
+
+
+@task_retry.connect
+def _task_retried(sender=None, **_kwargs) -> None:
+    TASK_RETRIES.labels(getattr(sender, "name", "unknown")).inc()
+
+
+@task_failure.connect
+def _task_failed(sender=None, **_kwargs) -> None:
+    TASK_FAILURES.labels(getattr(sender, "name", "unknown")).inc()
+
+
+class QueueDepthCollector(Collector):
+    """Pending messages per Celery queue, read from the Redis broker at scrape time."""
+
+    def __init__(self, broker_url: str, queues: list[str]) -> None:
+        self.queues = queues
+        self._redis = (
+            redis.Redis.from_url(broker_url, socket_timeout=1.0, socket_connect_timeout=1.0)
+            if broker_url.startswith(("redis://", "rediss://"))
+            else None
+        )
+
+    def collect(self):
+        depth = GaugeMetricFamily(
+            "orchestrator_worker_queue_depth",
+            "Messages waiting in a Celery queue",
+            labels=["queue"],
+        )
+        if self._redis is not None:
+            try:
+                with self._redis.pipeline(transaction=False) as pipe:
+                    for queue in self.queues:
+                        pipe.llen(queue)
+                    lengths = pipe.execute()
+            except redis.RedisError as exc:
+                logger.warning("Could not read Celery queue depth from the broker: %s", exc)
+            else:
+                for queue, length in zip(self.queues, lengths, strict=True):
+                    depth.add_metric([queue], length)
+        yield depth
+
+
+@worker_init.connect
+def _start_metrics_server(sender=None, **_kwargs) -> None:
+    if settings.metrics_port <= 0 or sender is None:
+        return
+    conf = sender.app.conf
+    queues = sorted(
+        {conf.task_default_queue}
+        | {route["queue"] for route in (conf.task_routes or {}).values() if "queue" in route}
+    )
+    registry = REGISTRY
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        # Prefork pool: task metrics are recorded in the child processes.
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    registry.register(QueueDepthCollector(settings.celery_broker_url, queues))
+    start_http_server(settings.metrics_port, registry=registry)
+    logger.info("Serving worker metrics on :%d", settings.metrics_port)
+
+
+@worker_process_shutdown.connect
+def _mark_process_dead(pid=None, **_kwargs) -> None:
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        multiprocess.mark_process_dead(pid or os.getpid())
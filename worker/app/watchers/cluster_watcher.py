@@ -1,16 +1,426 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import threading
+import time
 from dataclasses import dataclass
+from datetime import datetime
+
+from kubernetes import client, watch
+from kubernetes.client.rest import ApiException
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from app.config import get_settings
+from app.db import engine as default_engine
+from app.executors.k8s_executor import load_cluster_api_client
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class WatchedResource:
+    resource_type: str
+    group: str
+    version: str
+    plural: str
+
+
+WATCHED_RESOURCES = (
+    WatchedResource("sparkapplication", "sparkoperator.k8s.io", "v1beta2", "sparkapplications"),
+    WatchedResource("kafka", "kafka.strimzi.io", "v1beta2", "kafkas"),
+)
+
+# Fields that change on every write without changing what the object says.
+_VOLATILE_METADATA = ("resourceVersion", "managedFields", "generation")
+
+ResourceKey = tuple[str, str, str]
 
 
 @dataclass
 class ClusterWatcherConfig:
     cluster_id: int
     poll_seconds: int = 30
+    batch_size: int = 500
+    flush_seconds: float = 2.0
+    watch_timeout_seconds: int = 300
+
+    @classmethod
+    def from_settings(cls, cluster_id: int) -> ClusterWatcherConfig:
+        settings = get_settings()
+        return cls(
+            cluster_id=cluster_id,
+            batch_size=settings.watcher_batch_size,
+            flush_seconds=settings.watcher_flush_seconds,
+            watch_timeout_seconds=settings.watcher_timeout_seconds,
+        )
+
+
+def observed_row(resource_type: str, obj: dict) -> dict:
+    metadata = {k: v for k, v in obj.get("metadata", {}).items() if k not in _VOLATILE_METADATA}
+    observed = {**obj, "metadata": metadata}
+    content = json.dumps(observed, sort_keys=True, separators=(",", ":"), default=str)
+    return {
+        "namespace": metadata.get("namespace", ""),
+        "resource_type": resource_type,
+        "resource_name": metadata.get("name", ""),
+        "observed_json": content,
+        "content_hash": hashlib.sha256(content.encode()).hexdigest(),
+    }
+
+
+def _key(row: dict) -> ResourceKey:
+    return (row["namespace"], row["resource_type"], row["resource_name"])
+
+
+class ObservedResourceStore:
+    """Writes observed_resources for one cluster, skipping rows whose content hash is unchanged."""
+
+    def __init__(
+        self, cluster_id: int, engine: Engine = default_engine, batch_size: int = 500
+    ) -> None:
+        self.cluster_id = cluster_id
+        self.engine = engine
+        self.batch_size = batch_size
+        self._hashes: dict[ResourceKey, str] | None = None
+        self._lock = threading.Lock()
+
+    def _known_hashes(self) -> dict[ResourceKey, str]:
+        if self._hashes is None:
+            with self.engine.begin() as conn:
+                rows = conn.execute(
+                    text(
+                        """
+                        SELECT namespace, resource_type, resource_name, content_hash
+                        FROM observed_resources
+                        WHERE cluster_id=:cluster_id
+                        """
+                    ),
+                    {"cluster_id": self.cluster_id},
+                ).all()
+            self._hashes = {(r[0], r[1], r[2]): r[3] for r in rows}
+        return self._hashes
+
+    def _upsert_sql(self) -> str:
+        insert = """
+            INSERT INTO observed_resources
+                (cluster_id, namespace, resource_type, resource_name,
+                 observed_json, content_hash, observed_at)
+            VALUES
+                (:cluster_id, :namespace, :resource_type, :resource_name,
+                 :observed_json, :content_hash, :observed_at)
+        """
+        if self.engine.dialect.name == "mysql":
+            return insert + """
+            ON DUPLICATE KEY UPDATE
+                observed_json=VALUES(observed_json),
+                content_hash=VALUES(content_hash),
+                observed_at=VALUES(observed_at)
+            """
+        return insert + """
+            ON CONFLICT (cluster_id, namespace, resource_type, resource_name) DO UPDATE SET
+                observed_json=excluded.observed_json,
+                content_hash=excluded.content_hash,
+                observed_at=excluded.observed_at
+        """
+
+    def upsert(self, rows: list[dict]) -> int:
+        with self._lock:
+            known = self._known_hashes()
+            latest = {_key(row): row for row in rows}
+            changed = [
+                row for key, row in latest.items() if known.get(key) != row["content_hash"]
+            ]
+            if not changed:
+                return 0
+            observed_at = datetime.utcnow()
+            params = [
+                {**row, "cluster_id": self.cluster_id, "observed_at": observed_at}
+                for row in changed
+            ]
+            sql = text(self._upsert_sql())
+            for start in range(0, len(params), self.batch_size):
+                with self.engine.begin() as conn:
+                    conn.execute(sql, params[start : start + self.batch_size])
+            for row in changed:
+                known[_key(row)] = row["content_hash"]
+            return len(changed)
+
+    def delete(self, keys: list[ResourceKey]) -> int:
+        with self._lock:
+            known = self._known_hashes()
+            present = [key for key in dict.fromkeys(keys) if key in known]
+            if not present:
+                return 0
+            params = [
+                {
+                    "cluster_id": self.cluster_id,
+                    "namespace": namespace,
+                    "resource_type": resource_type,
+                    "resource_name": resource_name,
+                }
+                for namespace, resource_type, resource_name in present
+            ]
+            sql = text(
+                """
+                DELETE FROM observed_resources
+                WHERE cluster_id=:cluster_id AND namespace=:namespace
+                  AND resource_type=:resource_type AND resource_name=:resource_name
+                """
+            )
+            for start in range(0, len(params), self.batch_size):
+                with self.engine.begin() as conn:
+                    conn.execute(sql, params[start : start + self.batch_size])
+            for key in present:
+                known.pop(key, None)
+            return len(present)
+
+    def replace(self, resource_type: str, rows: list[dict]) -> dict:
+        """Make the stored rows of one resource type match a full listing."""
+        written = self.upsert(rows)
+        listed = {_key(row) for row in rows}
+        with self._lock:
+            stale = [k for k in self._known_hashes() if k[1] == resource_type and k not in listed]
+        deleted = self.delete(stale)
+        return {"written": written, "deleted": deleted, "unchanged": len(listed) - written}
+
+
+class PendingChanges:
+    """Watch events not yet written, coalesced per object.
+
+    The watch thread flushes when a batch fills up and a timer thread flushes whatever is left,
+    so a burst followed by silence is still written within ``flush_seconds``.
+    """
+
+    def __init__(self, store: ObservedResourceStore) -> None:
+        self.store = store
+        self._rows: dict[ResourceKey, dict | None] = {}
+        self._lock = threading.Lock()
+        # Serializes flushes so two writes for one object cannot land out of order.
+        self._flush_lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def put(self, key: ResourceKey, row: dict | None) -> None:
+        with self._lock:
+            self._rows[key] = row
+
+    def flush(self) -> None:
+        with self._flush_lock:
+            with self._lock:
+                rows, self._rows = self._rows, {}
+            if not rows:
+                return
+            try:
+                upserts = [row for row in rows.values() if row is not None]
+                deletes = [key for key, row in rows.items() if row is None]
+                if upserts:
+                    self.store.upsert(upserts)
+                if deletes:
+                    self.store.delete(deletes)
+            except Exception:
+                with self._lock:
+                    # Keep the unwritten changes, unless a newer event replaced them meanwhile.
+                    self._rows = {**rows, **self._rows}
+                raise
 
 
 class ClusterWatcher:
-    def __init__(self, config: ClusterWatcherConfig) -> None:
+    def __init__(
+        self,
+        config: ClusterWatcherConfig,
+        api_client: client.ApiClient | None = None,
+        store: ObservedResourceStore | None = None,
+    ) -> None:
         self.config = config
+        self.store = store or ObservedResourceStore(config.cluster_id, batch_size=config.batch_size)
+        self.resource_versions: dict[str, str] = {}
+        self._api_client = api_client
+        self._stopped = threading.Event()
+        self._watches: list[watch.Watch] = []
+
+    def _custom_api(self) -> client.CustomObjectsApi:
+        if self._api_client is None:
+            self._api_client = load_cluster_api_client(self.config.cluster_id)
+        return client.CustomObjectsApi(self._api_client)
+
+    def sync(self, resource: WatchedResource) -> dict:
+        body = self._custom_api().list_cluster_custom_object(
+            resource.group, resource.version, resource.plural
+        )
+        self.resource_versions[resource.resource_type] = body.get("metadata", {}).get(
+            "resourceVersion", ""
+        )
+        rows = [observed_row(resource.resource_type, obj) for obj in body.get("items", [])]
+        return self.store.replace(resource.resource_type, rows)
 
     def run_once(self) -> dict:
-        # Placeholder for informer-based synchronization.
-        return {"cluster_id": self.config.cluster_id, "status": "noop"}
+        totals = {"written": 0, "deleted": 0, "unchanged": 0}
+        for resource in WATCHED_RESOURCES:
+            try:
+                result = self.sync(resource)
+            except ApiException as exc:
+                if exc.status == 404:
+                    # CRD not installed on this cluster.
+                    continue
+                raise
+            for key, value in result.items():
+                totals[key] += value
+        return {"cluster_id": self.config.cluster_id, "status": "synced", **totals}
+
+    def run(self) -> None:
+        """Full sync, then one watch loop per resource type until stop() is called."""
+        while not self._stopped.is_set():
+            try:
+                self.run_once()
+                break
+            except Exception:
+                logger.exception("Initial sync failed for cluster %s", self.config.cluster_id)
+                self._stopped.wait(self.config.poll_seconds)
+
+        threads = [
+            threading.Thread(
+                target=self._watch_loop,
+                args=(resource,),
+                name=f"watch-{self.config.cluster_id}-{resource.resource_type}",
+                daemon=True,
+            )
+            for resource in WATCHED_RESOURCES
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        for w in list(self._watches):
+            w.stop()
+
+    def _flush_on_timer(self, pending: PendingChanges, done: threading.Event) -> None:
+        while not done.wait(self.config.flush_seconds):
+            try:
+                pending.flush()
+            except Exception:
+                logger.exception("Timed flush failed for cluster %s", self.config.cluster_id)
+
+    def _watch_loop(self, resource: WatchedResource) -> None:
+        pending = PendingChanges(self.store)
+        done = threading.Event()
+        threading.Thread(
+            target=self._flush_on_timer,
+            args=(pending, done),
+            name=f"flush-{self.config.cluster_id}-{resource.resource_type}",
+            daemon=True,
+        ).start()
+        try:
+            self._watch_events(resource, pending)
+        finally:
+            done.set()
+            pending.flush()
+
+    def _watch_events(self, resource: WatchedResource, pending: PendingChanges) -> None:
+        while not self._stopped.is_set():
+            w = watch.Watch()
+            self._watches.append(w)
+            try:
+                for event in w.stream(
+                    self._custom_api().list_cluster_custom_object,
+                    resource.group,
+                    resource.version,
+                    resource.plural,
+                    resource_version=self.resource_versions.get(resource.resource_type, ""),
+                    timeout_seconds=self.config.watch_timeout_seconds,
+                    allow_watch_bookmarks=True,
+                ):
+                    obj = event["raw_object"]
+                    version = obj.get("metadata", {}).get("resourceVersion")
+                    if version:
+                        self.resource_versions[resource.resource_type] = version
+                    if event["type"] in ("ADDED", "MODIFIED"):
+                        row = observed_row(resource.resource_type, obj)
+                        pending.put(_key(row), row)
+                    elif event["type"] == "DELETED":
+                        row = observed_row(resource.resource_type, obj)
+                        pending.put(_key(row), None)
+                    if len(pending) >= self.config.batch_size:
+                        pending.flush()
+                    if self._stopped.is_set():
+                        break
+                pending.flush()
+            except ApiException as exc:
+                pending.flush()
+                if exc.status == 410:
+                    # Our resourceVersion expired; a fresh list gives a new starting point.
+                    self._resync(resource)
+                else:
+                    logger.warning("Watch failed for %s: %s", resource.plural, exc)
+                    self._stopped.wait(self.config.poll_seconds)
+            except Exception:
+                pending.flush()
+                logger.exception("Watch failed for %s", resource.plural)
+                self._stopped.wait(self.config.poll_seconds)
+            finally:
+                self._watches.remove(w)
+
+    def _resync(self, resource: WatchedResource) -> None:
+        try:
+            self.sync(resource)
+        except Exception:
+            logger.exception("Resync failed for %s", resource.plural)
+            self._stopped.wait(self.config.poll_seconds)
+
+
+def _registered_cluster_ids() -> set[int]:
+    with default_engine.begin() as conn:
+        return {int(r[0]) for r in conn.execute(text("SELECT id FROM clusters")).all()}
+
+
+def watch_clusters(cluster_ids: list[int] | None = None) -> None:
+    """Watch the given clusters, or every registered one.
+
+    Without explicit ids the cluster table is re-read every WATCHER_DISCOVERY_SECONDS, so
+    clusters registered or removed after startup gain or lose their watcher.
+    """
+    discover = cluster_ids is None
+    running: dict[int, tuple[ClusterWatcher, threading.Thread]] = {}
+    try:
+        while True:
+            try:
+                wanted = _registered_cluster_ids() if discover else set(cluster_ids or [])
+            except Exception:
+                logger.exception("Could not read the cluster list")
+                wanted = set(running)
+            for cluster_id in sorted(wanted - running.keys()):
+                watcher = ClusterWatcher(ClusterWatcherConfig.from_settings(cluster_id))
+                thread = threading.Thread(
+                    target=watcher.run, name=f"cluster-watcher-{cluster_id}", daemon=True
+                )
+                thread.start()
+                running[cluster_id] = (watcher, thread)
+                logger.info("Watching cluster %s", cluster_id)
+            for cluster_id in sorted(running.keys() - wanted):
+                watcher, _ = running.pop(cluster_id)
+                watcher.stop()
+                logger.info("Stopped watching removed cluster %s", cluster_id)
+            if not discover:
+                for _, thread in running.values():
+                    thread.join()
+                return
+            time.sleep(get_settings().watcher_discovery_seconds)
+    except KeyboardInterrupt:
+        for watcher, _ in running.values():
+            watcher.stop()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Sync observed Spark/Kafka state into MySQL")
+    parser.add_argument("--cluster-id", type=int, action="append", dest="cluster_ids")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    watch_clusters(args.cluster_ids)
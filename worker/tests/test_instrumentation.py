@@ -0,0 +1,38 @@
+from celery.signals import task_postrun, task_prerun
+from sqlalchemy import create_engine, text
+
+from app import instrumentation
+from app.instrumentation import TASK_DB_STATEMENTS, instrument_engine
+
+
+class _Task:
+    name = "app.jobs.test.sample"
+
+
+def test_task_signals_scope_sql_stats_to_one_task_run(monkeypatch) -> None:
+    engine = create_engine("sqlite://")
+    instrument_engine(engine)
+    recorded = []
+    monkeypatch.setattr(
+        instrumentation, "record_task", lambda stats, name: recorded.append((name, stats))
+    )
+    task = _Task()
+
+    task_prerun.send(sender=task, task_id="t1", task=task)
+    with engine.connect() as conn:
+        for i in range(5):
+            conn.execute(text("SELECT :i"), {"i": i})
+    task_postrun.send(sender=task, task_id="t1", task=task)
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+
+    [(name, stats)] = recorded
+    assert name == "app.jobs.test.sample"
+    assert (stats.statements, stats.duplicates) == (5, 4)
+    assert instrumentation._current.get() is None
+
+
+def test_record_task_observes_histograms() -> None:
+    stats = instrumentation.QueryStats(statements=3, seconds=0.01)
+    instrumentation.record_task(stats, "app.jobs.test.observed")
+    assert TASK_DB_STATEMENTS.labels("app.jobs.test.observed")._sum.get() == 3
@@ -0,0 +1,102 @@
+from kubernetes import client
+from kubernetes.client.rest import ApiException
+
+from app.executors.node_drain import DrainOptions, NodeDrainer
+
+
+def _pod(name: str, owner_kind: str | None = "ReplicaSet") -> client.V1Pod:
+    owners = None
+    if owner_kind:
+        owners = [
+            client.V1OwnerReference(api_version="apps/v1", kind=owner_kind, name="x", uid="u")
+        ]
+    return client.V1Pod(
+        metadata=client.V1ObjectMeta(
+            name=name, namespace="spark", uid=f"uid-{name}", owner_references=owners
+        ),
+        status=client.V1PodStatus(phase="Running"),
+    )
+
+
+class _FakeCoreApi:
+    def __init__(
+        self, pods: list[client.V1Pod], pdb_rejections: int = 0, terminating: int = 0
+    ) -> None:
+        self.pods = pods
+        self.pdb_rejections = pdb_rejections
+        # Reads that still find an evicted pod before it is gone.
+        self.terminating = terminating
+        self.cordoned: list[str] = []
+        self.evicted: list[str] = []
+
+    def patch_node(self, name: str, body: dict) -> None:
+        self.cordoned.append(name)
+
+    def list_pod_for_all_namespaces(self, field_selector: str) -> client.V1PodList:
+        return client.V1PodList(items=self.pods)
+
+    def create_namespaced_pod_eviction(self, name: str, namespace: str, body) -> None:
+        if name == "blocked" and self.pdb_rejections:
+            self.pdb_rejections -= 1
+            raise ApiException(status=429, reason="Too Many Requests")
+        if name == "broken":
+            raise ApiException(status=500, reason="Internal Server Error")
+        self.evicted.append(name)
+
+    def read_namespaced_pod(self, name: str, namespace: str) -> client.V1Pod:
+        if self.terminating:
+            self.terminating -= 1
+            return next(pod for pod in self.pods if pod.metadata.name == name)
+        raise ApiException(status=404, reason="Not Found")
+
+
+def test_drain_cordons_skips_daemonsets_and_retries_pdb_rejections() -> None:
+    api = _FakeCoreApi(
+        [_pod("driver"), _pod("blocked"), _pod("agent", owner_kind="DaemonSet"), _pod("broken")],
+        pdb_rejections=2,
+    )
+    sleeps: list[float] = []
+    reports: list[str] = []
+    drainer = NodeDrainer(
+        api,
+        DrainOptions(parallelism=4, initial_backoff_seconds=0.5),
+        on_progress=lambda progress: reports.append(progress.summary()),
+        sleep=sleeps.append,
+    )
+
+    progress = drainer.drain("node-1")
+
+    assert api.cordoned == ["node-1"]
+    assert sorted(api.evicted) == ["blocked", "driver"]
+    assert sleeps == [0.5, 1.0]
+    assert (progress.total, progress.evicted, progress.failed, progress.skipped) == (3, 2, 1, 1)
+    assert progress.errors == {"spark/broken": "500: Internal Server Error"}
+    assert reports[-1] == "evicted=2 failed=1 pending=0 skipped=1 total=3"
+
+
+def test_drain_waits_for_pods_to_go_and_refuses_unmanaged_pods() -> None:
+    api = _FakeCoreApi([_pod("driver"), _pod("bare", owner_kind=None)], terminating=2)
+    sleeps: list[float] = []
+    drainer = NodeDrainer(api, DrainOptions(poll_seconds=3.0), sleep=sleeps.append)
+
+    progress = drainer.drain("node-1")
+
+    assert api.evicted == ["driver"]
+    assert sleeps == [3.0, 3.0]
+    assert (progress.evicted, progress.failed) == (1, 1)
+    assert "unmanaged" in progress.errors["spark/bare"]
+
+    forced = NodeDrainer(_FakeCoreApi([_pod("bare", owner_kind=None)]), DrainOptions(force=True))
+    assert forced.drain("node-1").evicted == 1
+
+
+def test_drain_fails_pods_still_terminating_at_the_deadline() -> None:
+    api = _FakeCoreApi([_pod("driver")], terminating=1_000)
+    drainer = NodeDrainer(
+        api, DrainOptions(timeout_seconds=5.0, poll_seconds=10.0), sleep=lambda _: None
+    )
+
+    progress = drainer.drain("node-1")
+
+    assert (progress.evicted, progress.failed) == (0, 1)
+    assert progress.errors == {"spark/driver": "evicted but still terminating at the drain timeout"}
@@ -0,0 +1,90 @@
+import gzip
+import json
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, text
+
+from app.jobs.retention import INCIDENT_RETENTION_WHERE
+from app.schedulers.retention import NdjsonArchive, RetentionEngine, RetentionPolicy
+
+NOW = datetime(2026, 10, 18, 12, 0, 0)
+_STATES = ("open", "acknowledged", "resolved", "resolved")
+
+
+def _engine():
+    engine = create_engine("sqlite://")
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "CREATE TABLE incidents (id INTEGER PRIMARY KEY, state VARCHAR(32), "
+                "created_at DATETIME NOT NULL)"
+            )
+        )
+        conn.execute(
+            text(
+                "CREATE TABLE incident_timeline (id INTEGER PRIMARY KEY, incident_id INTEGER, "
+                "event_type VARCHAR(64))"
+            )
+        )
+        conn.execute(
+            text("INSERT INTO incidents (id, state, created_at) VALUES (:id, :state, :ts)"),
+            [
+                {"id": i, "state": _STATES[i % 4], "ts": NOW - timedelta(days=i)}
+                for i in range(1, 41)
+            ],
+        )
+        conn.execute(
+            text("INSERT INTO incident_timeline (incident_id, event_type) VALUES (:id, 'note')"),
+            [{"id": i} for i in range(1, 41)],
+        )
+    return engine
+
+
+def _archived(paths: list[str]) -> list[dict]:
+    rows = []
+    for path in paths:
+        with gzip.open(path, "rt", encoding="utf-8") as handle:
+            rows.extend(json.loads(line) for line in handle)
+    return rows
+
+
+def test_retention_archives_then_deletes_expired_rows_in_batches(tmp_path) -> None:
+    engine = _engine()
+    policy = RetentionPolicy(
+        "incidents",
+        "created_at",
+        days=10,
+        where=INCIDENT_RETENTION_WHERE,
+        children=(("incident_timeline", "incident_id"),),
+    )
+    retention = RetentionEngine(engine, NdjsonArchive(tmp_path), batch_size=5)
+    [result] = retention.run([policy], now=NOW)
+
+    # Open and acknowledged incidents are still being worked and are kept however old.
+    expired = [i for i in range(11, 41) if _STATES[i % 4] == "resolved"]
+    assert (result["deleted"], result["archived"], result["batches"]) == (15, 15, 3)
+    assert result["complete"]
+    archived = _archived(result["files"])
+    assert sorted(r["id"] for r in archived if "state" in r) == expired
+    assert sorted(r["incident_id"] for r in archived if "event_type" in r) == expired
+
+    with engine.connect() as conn:
+        kept = conn.execute(text("SELECT id FROM incidents ORDER BY id")).scalars().all()
+        timeline = conn.execute(text("SELECT COUNT(*) FROM incident_timeline")).scalar()
+    assert kept == [i for i in range(1, 41) if i <= 10 or i not in expired]
+    assert timeline == len(kept)
+
+
+def test_retention_stops_after_max_batches_and_skips_disabled_tables() -> None:
+    engine = _engine()
+    retention = RetentionEngine(engine, None, batch_size=5, max_batches=2)
+    results = retention.run(
+        [
+            RetentionPolicy("incidents", "created_at", days=1),
+            RetentionPolicy("incident_timeline", "created_at", days=0),
+        ],
+        now=NOW,
+    )
+    assert [(r["table"], r["deleted"], r["archived"], r["complete"]) for r in results] == [
+        ("incidents", 10, 0, False)
+    ]
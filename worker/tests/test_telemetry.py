@@ -0,0 +1,22 @@
+from celery.signals import task_postrun, task_prerun, task_retry
+
+from app.telemetry import TASK_RETRIES, TASK_SECONDS, QueueDepthCollector
+
+
+class _Task:
+    name = "app.jobs.test.timed"
+
+
+def test_task_signals_record_duration_and_retries() -> None:
+    task = _Task()
+    task_prerun.send(sender=task, task_id="t1", task=task)
+    task_postrun.send(sender=task, task_id="t1", task=task, state="SUCCESS")
+    task_retry.send(sender=task, request=None, reason="transient")
+
+    assert TASK_SECONDS.labels("app.jobs.test.timed", "SUCCESS")._sum.get() > 0
+    assert TASK_RETRIES.labels("app.jobs.test.timed")._value.get() == 1
+
+
+def test_queue_depth_skips_non_redis_brokers() -> None:
+    [family] = QueueDepthCollector("memory://", ["celery"]).collect()
+    assert family.samples == []
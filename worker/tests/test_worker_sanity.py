@@ -1,7 +1,126 @@
-from app.watchers.cluster_watcher import ClusterWatcher, ClusterWatcherConfig
+import threading
+import time
 
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import StaticPool
+
+from app.watchers.cluster_watcher import (
+    WATCHED_RESOURCES,
+    ClusterWatcher,
+    ClusterWatcherConfig,
+    ObservedResourceStore,
+    observed_row,
+)
+
+
+def _engine():
+    # One shared connection, so rows written by watcher threads land in the same database.
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                """
+                CREATE TABLE observed_resources (
+                    id INTEGER PRIMARY KEY,
+                    cluster_id INTEGER NOT NULL,
+                    namespace VARCHAR(128) NOT NULL,
+                    resource_type VARCHAR(80) NOT NULL,
+                    resource_name VARCHAR(150) NOT NULL,
+                    observed_json JSON NOT NULL,
+                    content_hash VARCHAR(64) NOT NULL DEFAULT '',
+                    observed_at DATETIME NOT NULL,
+                    CONSTRAINT uq_observed_resource_key
+                        UNIQUE (cluster_id, namespace, resource_type, resource_name)
+                )
+                """
+            )
+        )
+    return engine
+
+
+def _spark(name: str, state: str, version: str = "1") -> dict:
+    return {
+        "metadata": {"name": name, "namespace": "spark", "resourceVersion": version},
+        "status": {"applicationState": {"state": state}},
+    }
+
+
+class _FakeCustomObjects:
+    def __init__(self, listings: dict[str, list[dict]]) -> None:
+        self.listings = listings
+
+    def list_cluster_custom_object(self, group: str, version: str, plural: str) -> dict:
+        return {"metadata": {"resourceVersion": "42"}, "items": self.listings.get(plural, [])}
+
+
+def test_observed_row_hash_ignores_resource_version() -> None:
+    first = observed_row("sparkapplication", _spark("etl", "RUNNING", version="1"))
+    second = observed_row("sparkapplication", _spark("etl", "RUNNING", version="2"))
+    third = observed_row("sparkapplication", _spark("etl", "COMPLETED", version="3"))
+    assert first["content_hash"] == second["content_hash"]
+    assert first["content_hash"] != third["content_hash"]
+
+
+def test_store_skips_unchanged_rows_and_removes_missing_ones() -> None:
+    engine = _engine()
+    store = ObservedResourceStore(1, engine=engine, batch_size=2)
+    rows = [observed_row("sparkapplication", _spark(f"app-{i}", "RUNNING")) for i in range(5)]
+
+    assert store.replace("sparkapplication", rows) == {"written": 5, "deleted": 0, "unchanged": 0}
+    assert store.upsert(rows) == 0
+
+    changed = rows[:3] + [observed_row("sparkapplication", _spark("app-3", "FAILED"))]
+    result = store.replace("sparkapplication", changed)
+    assert result == {"written": 1, "deleted": 1, "unchanged": 3}
+
+    with engine.begin() as conn:
+        names = conn.execute(
+            text("SELECT resource_name FROM observed_resources ORDER BY resource_name")
+        ).scalars().all()
+    assert names == ["app-0", "app-1", "app-2", "app-3"]
+
+
+def test_cluster_watcher_run_once_syncs_listed_resources() -> None:
+    engine = _engine()
+    watcher = ClusterWatcher(
+        ClusterWatcherConfig(cluster_id=1),
+        store=ObservedResourceStore(1, engine=engine),
+    )
+    fake = _FakeCustomObjects({"sparkapplications": [_spark("etl", "RUNNING")]})
+    watcher._custom_api = lambda: fake  # type: ignore[method-assign]
 
-def test_cluster_watcher_noop() -> None:
-    watcher = ClusterWatcher(ClusterWatcherConfig(cluster_id=1))
     result = watcher.run_once()
-    assert result["status"] == "noop"
+    assert result["status"] == "synced"
+    assert result["written"] == 1
+    assert watcher.resource_versions == {"sparkapplication": "42", "kafka": "42"}
+
+
+def test_watch_loop_flushes_pending_rows_without_further_events() -> None:
+    engine = _engine()
+    watcher = ClusterWatcher(
+        ClusterWatcherConfig(cluster_id=1, batch_size=100, flush_seconds=0.05),
+        store=ObservedResourceStore(1, engine=engine),
+    )
+    quiet = threading.Event()
+
+    def watch_events(resource, pending) -> None:
+        row = observed_row(resource.resource_type, _spark("etl", "RUNNING"))
+        pending.put((row["namespace"], row["resource_type"], row["resource_name"]), row)
+        quiet.wait(5)
+
+    watcher._watch_events = watch_events  # type: ignore[method-assign]
+    thread = threading.Thread(target=watcher._watch_loop, args=(WATCHED_RESOURCES[0],))
+    thread.start()
+    try:
+        deadline = time.monotonic() + 2
+        count = 0
+        while count == 0 and time.monotonic() < deadline:
+            time.sleep(0.02)
+            with engine.begin() as conn:
+                count = conn.execute(text("SELECT COUNT(*) FROM observed_resources")).scalar()
+        assert count == 1
+    finally:
+        quiet.set()
+        thread.join()